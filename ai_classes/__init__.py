@@ -0,0 +1,21 @@
+from importlib import import_module
+
+# Players are imported on first access, so importing one player doesn't import
+# the others with their dependencies, like multiprocessing of ParallelMCTSPlayer
+_EXPORTS = {'ComputerPlayer': '.computer_player',
+            'MinimaxPlayer': '.minimax_player',
+            'GomokuPlayer': '.gomoku_player',
+            'MCTSPlayer': '.mcts_player',
+            'ParallelMCTSPlayer': '.parallel_player',
+            'RandomPlayer': '.random_player',
+            'DatabasePlayer': '.database_player',
+            'ThreatSolver': '.threat_solver'}
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(' '.join(['module', __name__, 'has no attribute', name]))
+    value = getattr(import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
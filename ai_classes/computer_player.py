@@ -0,0 +1,70 @@
+from typing import List, Tuple
+
+from game_classes.bit_board import BitBoard
+from game_classes.board import Board
+from game_classes.game import Game
+from game_classes.player import Player
+from game_classes.sparse_board import MAX_LISTED_SIZE
+
+
+class ComputerPlayer(Player):
+    """
+    Base class for a player, that chooses moves itself
+        :param name: name for a new player
+
+    :prop name: player's name
+    :prop mark: mark assigned to the player
+
+    :method choose_move: returns name of the cell for the next move of the player
+    :method copy_board: returns BitBoard with the same position for search
+    :method empty_cells: returns names of all empty cells of the board
+    :method other_mark: returns mark of the opponent
+    """
+
+    def choose_move(self, game: Game) -> Tuple[int, int]:
+        """
+        Chooses the next move of the player in the game. The board must be
+            left in the same state, as it was given
+        :param game: game, where it's turn of the player now
+        :return: name of the cell to mark
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def copy_board(board: Board) -> BitBoard:
+        """
+        Returns a BitBoard with the same position. Search makes and takes back
+            moves on the copy, so the game board stays untouched and cells
+            don't log every tried move
+        :param board: board of the game
+        :return: new BitBoard
+        """
+        copy = BitBoard(board.size, board.condition)
+        for name, mark in board.marked_cells():
+            copy.put_mark(name, mark)
+        return copy
+
+    @staticmethod
+    def empty_cells(board: Board) -> List[Tuple[int, int]]:
+        """
+        Returns names of all empty cells of the board. On a board too big to list
+            its cells, like an unbounded sparse board, returns empty cells next to
+            marks, or the middle cell of the empty board
+        :param board: board of the game
+        :return: list of cell names
+        """
+        if board.size > MAX_LISTED_SIZE:
+            candidates = sorted(board.track_candidates(1))
+            return candidates or [(board.size // 2, board.size // 2)]
+        return [name for name in board.cells if board.get_mark(name) == ' ']
+
+    @staticmethod
+    def other_mark(game: Game, mark: str) -> str:
+        """
+        Returns mark of the opponent
+        :param game: game of the player
+        :param mark: mark of the player
+        :return: mark of the other player
+        """
+        marks = [player.mark for player in game.players]
+        return marks[1 - marks.index(mark)]
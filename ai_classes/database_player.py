@@ -0,0 +1,44 @@
+import logging
+from typing import Tuple
+
+from ai_classes.minimax_player import MinimaxPlayer
+from ai_classes.solved_database import RESULT_NAMES, open_database
+from game_classes.game import Game
+
+
+class DatabasePlayer(MinimaxPlayer):
+    """
+    Computer player with perfect play, that takes moves from the solved position
+        database of the board (see retrograde_solver), so a move is a few lookups
+        in a memory-mapped file and nothing is solved at start. Boards without
+        a database are searched like by MinimaxPlayer
+        :param name: name for a new player
+        :param directory: folder with databases
+
+    :prop name: player's name
+    :prop mark: mark assigned to the player
+    :prop nodes: number of positions searched by the last choose_move, 0 for database moves
+
+    :method choose_move: returns the best move for the player in the game
+    """
+
+    def __init__(self, name: str = 'Computer', directory: str = 'solved') -> None:
+        super().__init__(name)
+        self.directory = directory
+
+    def choose_move(self, game: Game) -> Tuple[int, int]:
+        """
+        Chooses the fastest win, a draw, or the slowest loss
+        :param game: game, where it's turn of the player now
+        :return: name of the cell to mark
+        """
+        board = game.board
+        database = open_database(board.size, board.condition, self.directory)
+        best = None if database is None else database.best_move(board)
+        if best is None:
+            return super().choose_move(game)
+        self.nodes = 0
+        cell_name, result, distance = best
+        logging.debug(' '.join([self.name, 'chose', str(cell_name), 'from database:', RESULT_NAMES[result],
+                                'in', str(distance), 'moves']))
+        return cell_name
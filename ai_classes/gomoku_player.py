@@ -0,0 +1,378 @@
+import logging
+import math
+import time
+from typing import Dict, List, Optional, Tuple
+
+from ai_classes.computer_player import ComputerPlayer
+from ai_classes.threat_solver import ThreatSolver
+from game_classes.bit_board import BitBoard
+from game_classes.board import Board
+from game_classes.game import Game
+from game_classes.sparse_board import MAX_LISTED_SIZE
+
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+class GomokuPlayer(ComputerPlayer):
+    """
+    Computer player for big boards ("Big game", 10x10 with 5 in a row).
+        Iterative deepening negamax with alpha-beta pruning, transposition table,
+        killer and history move ordering and a time budget per move: when time
+        runs out, the best move of the last finished depth is played.
+
+        Evaluation is kept incrementally: for every window of condition cells in
+        a line the numbers of both players' marks are stored, a move updates only
+        the windows through its cell. A window with condition - 1 marks of one
+        player and none of the other is a four: the player wins with the next move,
+        so the opponent can only block it.
+
+        Before the search a part of the time is given to ThreatSolver: when it proves
+        a win by a sequence of fours, its first move is played at once
+        :param name: name for a new player
+        :param time_limit: seconds for one move
+        :param max_depth: max depth of the search in plies
+        :param max_moves: max number of the best ordered moves, searched in every node
+        :param radius: only empty cells not further than radius from marks are tried
+        :param table_size: max number of transposition table entries
+        :param vcf_share: share of time_limit for the threat solver, 0 to skip it
+
+    :prop name: player's name
+    :prop mark: mark assigned to the player
+    :prop nodes: number of positions searched by the last choose_move
+    :prop depth: last fully searched depth of the last choose_move
+    :prop nodes_per_second: search speed of the last choose_move
+
+    :method choose_move: returns the best move found in the time budget
+    """
+
+    def __init__(self, name: str = 'Computer', time_limit: float = 0.1, max_depth: int = 20,
+                 max_moves: int = 12, radius: int = 2, table_size: int = 1 << 20, vcf_share: float = 0.25) -> None:
+        super().__init__(name)
+        self.time_limit = time_limit
+        self.max_depth = max_depth
+        self.max_moves = max_moves
+        self.radius = radius
+        self.table_size = table_size
+        self.vcf_share = vcf_share
+        self.threat_solver = ThreatSolver('vcf', time_limit=time_limit * vcf_share)
+        self.nodes = 0
+        self.depth = 0
+        self.nodes_per_second = 0.0
+        self.__table: Dict[int, Tuple[int, int, int, Optional[int]]] = dict()
+        self.__geometry: Tuple[int, int] = (0, 0)
+
+    def choose_move(self, game: Game) -> Tuple[int, int]:
+        """
+        Chooses the move by iterative deepening until time is over
+        :param game: game, where it's turn of the player now
+        :return: name of the cell to mark
+        """
+        start = time.perf_counter()
+        self._load(game.board, self.mark, self.other_mark(game, self.mark))
+        if self.board.filled_cells == 0:
+            center = self.board.size // 2
+            return center, center
+        if self.vcf_share > 0:
+            self.threat_solver.time_limit = self.time_limit * self.vcf_share
+            line = self.threat_solver.solve(self.board, self.mark, self.other_mark(game, self.mark))
+            if line:
+                logging.debug(' '.join([self.name, 'plays winning line', str(line)]))
+                return line[0]
+
+        self.nodes = 0
+        self.depth = 0
+        self.deadline = start + self.time_limit
+        self.stopped = False
+        self.killers = [[None, None] for _ in range(self.max_depth + 2)]
+        best_move = self._ordered_moves(0, 0, None)[0]
+        for depth in range(1, self.max_depth + 1):
+            value, move = self._search_root(depth, best_move)
+            if self.stopped:
+                break
+            best_move = move
+            self.depth = depth
+            if abs(value) >= self.win_value - self.max_depth - 1:  # forced result is found
+                break
+        elapsed = time.perf_counter() - start
+        self.nodes_per_second = self.nodes / elapsed if elapsed > 0 else 0.0
+        logging.debug(' '.join([self.name, 'chose', str(self.names[best_move]), 'at depth', str(self.depth),
+                                'after', str(self.nodes), 'nodes,', str(round(self.nodes_per_second)),
+                                'nodes/sec']))
+        return self.names[best_move]
+
+    def _load(self, board: Board, mark: str, other: str) -> None:
+        """
+        Prepares the search state for the position on the board. Moves are searched
+            on a BitBoard copy of the position. Side 0 is the player, side 1 is the opponent
+        :param board: board of the game
+        :param mark: mark of the player
+        :param other: mark of the opponent
+        :return: None
+        """
+        size, condition = board.size, board.condition
+        if size > MAX_LISTED_SIZE:
+            logging.error(' '.join(['Attempt to search board', str(size), 'x', str(size)]))
+            raise ValueError('GomokuPlayer needs a board not bigger than MAX_LISTED_SIZE')
+        if self.__geometry != (size, condition):
+            self._build_geometry(size, condition)
+            self.__table.clear()
+            self.history = [[0] * size ** 2, [0] * size ** 2]
+            self.board = BitBoard(size, condition)
+        else:
+            self.board.reset()  # the copy of the previous move is cleared, not created again
+        self.history = [[value // 2 for value in history] for history in self.history]
+        self.marks = (mark, other)
+        self.cells = [-1] * size ** 2
+        self.counts = ([0] * len(self.windows), [0] * len(self.windows))
+        self.fours = (set(), set())
+        self.score = 0
+        self.weights = [0] + [10 ** (stones - 1) for stones in range(1, condition + 1)]
+        self.win_value = 10 ** (condition + 3)
+        self.candidates = self.board.track_candidates(self.radius)
+        for name, mark in board.marked_cells():
+            if mark in self.marks:
+                self._make(self.indexes[name], self.marks.index(mark))
+
+    def _build_geometry(self, size: int, condition: int) -> None:
+        """
+        Prepares cell names and windows of condition cells in every direction
+            for the board of given size
+        :param size: size of the board
+        :param condition: win condition of the board
+        :return: None
+        """
+        self.__geometry = (size, condition)
+        self.names = [(index_1, index_2) for index_1 in range(size) for index_2 in range(size)]
+        self.indexes = {name: index for index, name in enumerate(self.names)}
+        self.windows: List[Tuple[int, ...]] = []
+        self.cell_windows: List[List[int]] = [[] for _ in self.names]
+        for index_1, index_2 in self.names:
+            for step_1, step_2 in Board.DIRECTIONS:
+                end_1 = index_1 + step_1 * (condition - 1)
+                end_2 = index_2 + step_2 * (condition - 1)
+                if 0 <= end_1 < size and 0 <= end_2 < size:
+                    window = tuple((index_1 + step_1 * step) * size + index_2 + step_2 * step
+                                   for step in range(condition))
+                    for index in window:
+                        self.cell_windows[index].append(len(self.windows))
+                    self.windows.append(window)
+
+    def _make(self, index: int, side: int) -> None:
+        """
+        Makes a move on the board and updates windows, score and fours
+        :param index: index of the cell
+        :param side: 0 for the player, 1 for the opponent
+        :return: None
+        """
+        self.board.put_mark(self.names[index], self.marks[side])
+        self.cells[index] = side
+        own, opp = self.counts[side], self.counts[1 - side]
+        own_fours, opp_fours = self.fours[side], self.fours[1 - side]
+        weights = self.weights
+        four = len(weights) - 2
+        delta = 0
+        for window in self.cell_windows[index]:
+            stones = own[window]
+            if opp[window] == 0:
+                delta += weights[stones + 1] - weights[stones]
+                if stones + 1 == four:
+                    own_fours.add(window)
+                elif stones == four:
+                    own_fours.discard(window)
+            elif stones == 0:
+                delta += weights[opp[window]]
+                if opp[window] == four:
+                    opp_fours.discard(window)
+            own[window] = stones + 1
+        self.score += delta if side == 0 else -delta
+
+    def _unmake(self, index: int, side: int) -> None:
+        """
+        Takes back the move, made by _make
+        :param index: index of the cell
+        :param side: 0 for the player, 1 for the opponent
+        :return: None
+        """
+        self.board.remove_mark(self.names[index])
+        self.cells[index] = -1
+        own, opp = self.counts[side], self.counts[1 - side]
+        own_fours, opp_fours = self.fours[side], self.fours[1 - side]
+        weights = self.weights
+        four = len(weights) - 2
+        delta = 0
+        for window in self.cell_windows[index]:
+            stones = own[window] - 1
+            own[window] = stones
+            if opp[window] == 0:
+                delta += weights[stones + 1] - weights[stones]
+                if stones + 1 == four:
+                    own_fours.discard(window)
+                elif stones == four:
+                    own_fours.add(window)
+            elif stones == 0:
+                delta += weights[opp[window]]
+                if opp[window] == four:
+                    opp_fours.add(window)
+        self.score -= delta if side == 0 else -delta
+
+    def _ordered_moves(self, side: int, ply: int, first: Optional[int]) -> List[int]:
+        """
+        Returns moves to search, the most promising first: the given move,
+            killer moves, then moves by history and by windows they extend or block.
+            If the opponent has a four, only blocking moves are returned
+        :param side: side to move
+        :param ply: distance from the root
+        :param first: move to search first, usually from transposition table
+        :return: list of cell indexes
+        """
+        cells = self.cells
+        opp_fours = self.fours[1 - side]
+        if opp_fours:
+            return self._four_cells(1 - side)
+        own, opp = self.counts[side], self.counts[1 - side]
+        weights = self.weights
+        history = self.history[side]
+        scored = []
+        for name in self.candidates:
+            index = self.indexes[name]
+            value = history[index]
+            for window in self.cell_windows[index]:
+                if opp[window] == 0:
+                    value += weights[own[window] + 1]
+                if own[window] == 0:
+                    value += weights[opp[window] + 1]
+            scored.append((value, index))
+        if not scored:
+            return [index for index in range(len(cells)) if cells[index] < 0]
+        scored.sort(reverse=True)
+        moves = [index for _, index in scored[:self.max_moves]]
+        for index in reversed([first] + self.killers[ply]):
+            if index is not None and self.names[index] in self.candidates:
+                if index in moves:
+                    moves.remove(index)
+                moves.insert(0, index)
+        return moves
+
+    def _four_cells(self, side: int) -> List[int]:
+        """
+        Returns empty cells, that complete fours of the side
+        :param side: 0 for the player, 1 for the opponent
+        :return: list of cell indexes
+        """
+        return sorted({index for window in self.fours[side] for index in self.windows[window]
+                       if self.cells[index] < 0})
+
+    def _search_root(self, depth: int, first: int) -> Tuple[int, int]:
+        """
+        Searches all root moves to the given depth
+        :param depth: depth in plies
+        :param first: move to search first, the best one of the previous depth
+        :return: value and index of the best move
+        """
+        if self.fours[0]:
+            return self.win_value, self._four_cells(0)[0]
+        alpha, beta = -math.inf, math.inf
+        best_move = first
+        for index in self._ordered_moves(0, 0, first):
+            self._make(index, 0)
+            value = -self._negamax(depth - 1, -beta, -alpha, 1, 1)
+            self._unmake(index, 0)
+            if self.stopped:
+                break
+            if value > alpha:
+                alpha = value
+                best_move = index
+        return alpha, best_move
+
+    def _negamax(self, depth: int, alpha: float, beta: float, side: int, ply: int) -> float:
+        """
+        Negamax search with alpha-beta pruning
+        :param depth: remaining depth in plies
+        :param alpha: lower bound of interesting values
+        :param beta: upper bound of interesting values
+        :param side: side to move
+        :param ply: distance from the root
+        :return: value of the position for the side to move
+        """
+        self.nodes += 1
+        if not self.nodes & 511 and time.perf_counter() > self.deadline:
+            self.stopped = True
+        if self.stopped:
+            return 0
+        if self.fours[side]:  # wins with the next move
+            return self.win_value - ply
+        if self.board.filled_cells == len(self.cells):
+            return 0
+        if depth <= 0:
+            return self.score if side == 0 else -self.score
+
+        key = self.board.zobrist
+        entry = self.__table.get(key)
+        first = None
+        if entry is not None:
+            entry_depth, flag, value, first = entry
+            if entry_depth >= depth:
+                value = self._from_table(value, ply)
+                if flag == EXACT:
+                    return value
+                if flag == LOWER:
+                    alpha = max(alpha, value)
+                else:
+                    beta = min(beta, value)
+                if alpha >= beta:
+                    return value
+
+        alpha_start = alpha
+        best, best_move = -math.inf, None
+        for index in self._ordered_moves(side, ply, first):
+            self._make(index, side)
+            value = -self._negamax(depth - 1, -beta, -alpha, 1 - side, ply + 1)
+            self._unmake(index, side)
+            if self.stopped:
+                return 0
+            if value > best:
+                best, best_move = value, index
+            if value > alpha:
+                alpha = value
+            if alpha >= beta:
+                if index != self.killers[ply][0]:
+                    self.killers[ply] = [index, self.killers[ply][0]]
+                self.history[side][index] += depth * depth
+                break
+
+        if len(self.__table) >= self.table_size:
+            self.__table.clear()
+        if best <= alpha_start:
+            flag = UPPER
+        elif best >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.__table[key] = (depth, flag, self._to_table(best, ply), best_move)
+        return best
+
+    def _to_table(self, value: float, ply: int) -> float:
+        """
+        Makes win and loss values independent of the distance from the root
+        :param value: value of the position
+        :param ply: distance from the root
+        :return: value for transposition table
+        """
+        if value >= self.win_value - self.max_depth - 1:
+            return value + ply
+        if value <= -self.win_value + self.max_depth + 1:
+            return value - ply
+        return value
+
+    def _from_table(self, value: float, ply: int) -> float:
+        """
+        Turns value from transposition table back to the distance from the root
+        :param value: value from transposition table
+        :param ply: distance from the root
+        :return: value of the position
+        """
+        if value >= self.win_value - self.max_depth - 1:
+            return value - ply
+        if value <= -self.win_value + self.max_depth + 1:
+            return value + ply
+        return value
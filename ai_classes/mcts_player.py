@@ -0,0 +1,285 @@
+import logging
+import math
+import random
+import time
+from typing import Dict, List, Optional, Tuple
+
+from ai_classes.computer_player import ComputerPlayer
+from game_classes.board import Board
+from game_classes.game import Game
+from game_classes.sparse_board import MAX_LISTED_SIZE
+
+EMPTY, OWN, OTHER, BORDER = 0, 1, 2, 3
+
+
+class Node:
+    """
+    Node of the search tree
+        :param move: index of the cell, marked by the move into the node, None for the root
+        :param side: side, that made the move into the node
+        :param parent: parent node
+
+    :prop children: {cell index: Node} for tried moves
+    :prop untried: cell indexes of moves, that have no nodes yet
+    :prop visits: number of playouts through the node
+    :prop wins: sum of playout results for the side, that made the move into the node:
+            1 for a win, 0.5 for a draw
+    :prop result: known result of the game after the move for the side, that made it, or None
+    """
+    __slots__ = ('move', 'side', 'parent', 'children', 'untried', 'visits', 'wins', 'result')
+
+    def __init__(self, move: Optional[int], side: int, parent: Optional['Node']) -> None:
+        self.move = move
+        self.side = side
+        self.parent = parent
+        self.children: Dict[int, Node] = dict()
+        self.untried: Optional[List[int]] = None
+        self.visits = 0
+        self.wins = 0.0
+        self.result: Optional[float] = None
+
+
+class MCTSPlayer(ComputerPlayer):
+    """
+    Computer player, that chooses moves by Monte Carlo tree search with UCT selection.
+        Works for boards of any size and condition. Playouts are random games on
+        a bytearray copy of the position with a border of sentinel cells, so a win check
+        walks four directions without bounds checks and nothing is logged or allocated
+        per move. The tree is kept between moves: when the game went on by moves,
+        that are in the tree, their subtree becomes the new root
+        :param name: name for a new player
+        :param playouts: number of playouts for a move, used if time_limit is None
+        :param time_limit: seconds for a move
+        :param exploration: UCT exploration constant
+        :param radius: new tree nodes are made only for empty cells not further than
+            radius from marks, None for all empty cells
+        :param seed: seed for random playouts
+
+    :prop name: player's name
+    :prop mark: mark assigned to the player
+    :prop playouts_done: number of playouts of the last choose_move
+    :prop playouts_per_second: playout speed of the last choose_move
+
+    :method choose_move: returns the most visited move after the search
+    :method search: runs playouts from the current position and returns the root node
+    """
+
+    def __init__(self, name: str = 'Computer', playouts: int = 10000, time_limit: Optional[float] = None,
+                 exploration: float = math.sqrt(2), radius: Optional[int] = 2, seed: Optional[int] = None) -> None:
+        super().__init__(name)
+        self.playouts = playouts
+        self.time_limit = time_limit
+        self.exploration = exploration
+        self.radius = radius
+        self.random = random.Random(seed)
+        self.playouts_done = 0
+        self.playouts_per_second = 0.0
+        self.__root: Optional[Node] = None
+        self.__root_moves: List[Tuple[int, int]] = []
+        self.__geometry: Tuple[int, int] = (0, 0)
+
+    def choose_move(self, game: Game) -> Tuple[int, int]:
+        """
+        Searches the position and returns the most visited move, or a random
+            empty cell, if no move was searched
+        :param game: game, where it's turn of the player now
+        :return: name of the cell to mark
+        """
+        root = self.search(game)
+        if not root.children:
+            cell_name = self.random.choice(self.empty_cells(game.board))
+            logging.debug(' '.join([self.name, 'chose random', str(cell_name), 'without searched moves']))
+            return cell_name
+        best = max(root.children.values(), key=lambda child: child.visits)
+        logging.debug(' '.join([self.name, 'chose', str(self.names[best.move]), 'after',
+                                str(self.playouts_done), 'playouts,', str(round(self.playouts_per_second)),
+                                'playouts/sec, win rate', str(round(best.wins / max(best.visits, 1), 3))]))
+        return self.names[best.move]
+
+    def search(self, game: Game) -> Node:
+        """
+        Runs playouts from the current position of the game within the budget
+        :param game: game, where it's turn of the player now
+        :return: root node of the search tree
+        """
+        start = time.perf_counter()
+        board = game.board
+        self._load(board, self.mark)
+        root = self._reuse_root(game)
+        cells = self.cells
+        self.playouts_done = 0
+        deadline = None if self.time_limit is None else start + self.time_limit
+        while True:
+            # the first playout is always made, so the root has a child after the search
+            if deadline is None:
+                if self.playouts_done >= max(self.playouts, 1):
+                    break
+            elif self.playouts_done and not self.playouts_done & 15 and time.perf_counter() > deadline:
+                break
+            node = root
+            path = []
+            # selection
+            while node.result is None and not node.untried and node.children:
+                node = self._select(node)
+                cells[node.move] = node.side
+                path.append(node.move)
+            # expansion
+            if node.result is None:
+                if node.untried is None:
+                    node.untried = self._moves(cells)
+                if node.untried:
+                    move = node.untried.pop(self.random.randrange(len(node.untried)))
+                    side = OTHER if node.side == OWN else OWN
+                    child = Node(move, side, node)
+                    node.children[move] = child
+                    cells[move] = side
+                    path.append(move)
+                    if self._wins(cells, move, side):
+                        child.result = 1.0
+                    elif len(path) + self.filled == self.size ** 2:
+                        child.result = 0.5
+                    node = child
+            # simulation
+            if node.result is not None:
+                result = node.result
+            else:
+                result = self._playout(cells, node.side)
+            for move in path:
+                cells[move] = EMPTY
+            # backpropagation, result is for the side, that made the move into node
+            while node is not None:
+                node.visits += 1
+                node.wins += result
+                result = 1.0 - result
+                node = node.parent
+            self.playouts_done += 1
+        elapsed = time.perf_counter() - start
+        self.playouts_per_second = self.playouts_done / elapsed if elapsed > 0 else 0.0
+        return root
+
+    def _load(self, board: Board, mark: str) -> None:
+        """
+        Copies the position into a bytearray with a border of sentinel cells
+        :param board: board of the game
+        :param mark: mark of the player
+        :return: None
+        """
+        size, condition = board.size, board.condition
+        if size > MAX_LISTED_SIZE:
+            logging.error(' '.join(['Attempt to search board', str(size), 'x', str(size)]))
+            raise ValueError('MCTSPlayer needs a board not bigger than MAX_LISTED_SIZE')
+        if self.__geometry != (size, condition):
+            self.__geometry = (size, condition)
+            self.size = size
+            self.condition = condition
+            self.width = size + 2
+            self.steps = (1, self.width, self.width + 1, self.width - 1)
+            radius = self.radius or 0
+            self.offsets = [step_1 * self.width + step_2 for step_1 in range(-radius, radius + 1)
+                            for step_2 in range(-radius, radius + 1)]
+            self.names: Dict[int, Tuple[int, int]] = {(index_1 + 1) * self.width + index_2 + 1: (index_1, index_2)
+                                                      for index_1 in range(size) for index_2 in range(size)}
+            self.indexes = {name: index for index, name in self.names.items()}
+            self.__root = None
+        cells = bytearray([BORDER]) * self.width ** 2
+        self.filled = 0
+        for index in self.names:
+            cells[index] = EMPTY
+        for name, cell_mark in board.marked_cells():
+            cells[self.indexes[name]] = OWN if cell_mark == mark else OTHER
+            self.filled += 1
+        self.cells = cells
+
+    def _reuse_root(self, game: Game) -> Node:
+        """
+        Returns the node of the current position from the tree of the previous move,
+            or a new root, if the position is not in the tree
+        :param game: game, where it's turn of the player now
+        :return: root node
+        """
+        root = self.__root
+        moves = game.moves
+        known = len(self.__root_moves)
+        if (root is None or len(moves) != self.filled or len(moves) < known
+                or moves[:known] != self.__root_moves):
+            root = None
+        else:
+            for name in moves[known:]:
+                root = root.children.get(self.indexes[name])
+                if root is None:
+                    break
+        if root is None:
+            root = Node(None, OTHER, None)
+        root.parent = None
+        self.__root = root
+        self.__root_moves = list(moves)
+        return root
+
+    def _select(self, node: Node) -> Node:
+        """
+        Returns the child with the best UCT value
+        :param node: fully expanded node
+        :return: child node
+        """
+        log_visits = math.log(node.visits)
+        exploration = self.exploration
+        best, best_value = None, -1.0
+        for child in node.children.values():
+            value = child.wins / child.visits + exploration * math.sqrt(log_visits / child.visits)
+            if value > best_value:
+                best, best_value = child, value
+        return best
+
+    def _moves(self, cells: bytearray) -> List[int]:
+        """
+        Returns moves for new nodes: empty cells near marks, or all empty cells
+        :param cells: current position
+        :return: list of cell indexes
+        """
+        empty = [index for index in self.names if cells[index] == EMPTY]
+        if self.radius is None:
+            return empty
+        near = {index + offset for index in self.names if cells[index] != EMPTY for offset in self.offsets}
+        return [index for index in empty if index in near] or empty
+
+    def _wins(self, cells: bytearray, index: int, side: int) -> bool:
+        """
+        Checks if the mark of the side in the cell makes a line of condition cells
+        :param cells: position with the mark
+        :param index: index of the cell
+        :param side: OWN or OTHER
+        :return: True for a win
+        """
+        condition = self.condition
+        for step in self.steps:
+            run = 1
+            near = index + step
+            while cells[near] == side:
+                run += 1
+                near += step
+            near = index - step
+            while cells[near] == side:
+                run += 1
+                near -= step
+            if run >= condition:
+                return True
+        return False
+
+    def _playout(self, cells: bytearray, side: int) -> float:
+        """
+        Plays random moves on a copy of the position until the game is over
+        :param cells: position after the move of the side
+        :param side: side, that made the last move
+        :return: result for the side: 1 for a win, 0.5 for a draw, 0 for a loss
+        """
+        playout = bytearray(cells)
+        empty = [index for index in self.names if playout[index] == EMPTY]
+        self.random.shuffle(empty)
+        wins = self._wins
+        mover = OTHER if side == OWN else OWN
+        for index in empty:
+            playout[index] = mover
+            if wins(playout, index, mover):
+                return 1.0 if mover == side else 0.0
+            mover = OTHER if mover == OWN else OWN
+        return 0.5
@@ -0,0 +1,140 @@
+import logging
+import math
+from typing import Dict, Tuple
+
+from ai_classes.computer_player import ComputerPlayer
+from game_classes.board import Board
+from game_classes.game import Game
+
+
+class MinimaxPlayer(ComputerPlayer):
+    """
+    Computer player with perfect play for small boards (3x3 "Small game").
+        Searches the whole game tree by negamax with alpha-beta pruning. Results are
+        kept in a transposition table keyed by Board.canonical_zobrist, so symmetric
+        positions are solved once. Tables are shared between all players of the class,
+        after the first solve a move is a few table lookups
+        :param name: name for a new player
+
+    :prop name: player's name
+    :prop mark: mark assigned to the player
+    :prop nodes: number of positions searched by the last choose_move
+
+    :method choose_move: returns the best move for the player in the game
+    :method evaluate: returns value of the position for the side to move
+    :method warm_up: solves the empty board of given size, so later moves are instant
+    """
+    _tables: Dict[Tuple[int, int], Dict[int, Tuple[float, float]]] = dict()
+
+    def __init__(self, name: str = 'Computer') -> None:
+        super().__init__(name)
+        self.nodes = 0
+
+    def choose_move(self, game: Game) -> Tuple[int, int]:
+        """
+        Chooses the move with the best game-theoretic value: the fastest win,
+            a draw, or the slowest loss
+        :param game: game, where it's turn of the player now
+        :return: name of the cell to mark
+        """
+        board = self.copy_board(game.board)
+        mark = self.mark
+        other = self.other_mark(game, mark)
+        self.nodes = 0
+        best_move = None
+        alpha = -math.inf
+        for name in self.empty_cells(board):
+            value = self._child_value(board, name, mark, other, alpha, math.inf)
+            if best_move is None or value > alpha:
+                alpha = value
+                best_move = name
+        logging.debug(' '.join([self.name, 'chose', str(best_move), 'with value', str(alpha),
+                                'after', str(self.nodes), 'nodes']))
+        return best_move
+
+    def evaluate(self, board: Board, mark: str, other: str) -> int:
+        """
+        Returns game-theoretic value of the position for the side to move:
+            positive for a win, 0 for a draw, negative for a loss. The bigger
+            the absolute value, the sooner the game ends
+        :param board: board with the position, it will be left unchanged
+        :param mark: mark of the side to move
+        :param other: mark of the opponent
+        :return: value of the position
+        """
+        return self._search(board, mark, other, -math.inf, math.inf)
+
+    @classmethod
+    def warm_up(cls, size: int = 3, condition: int = 3) -> None:
+        """
+        Solves the empty board, so all positions of the game are in the table
+        :param size: size of the board
+        :param condition: win condition of the board
+        :return: None
+        """
+        player = cls()
+        board = Board(size, condition)
+        player._search(board, 'x', 'o', -math.inf, math.inf)
+        logging.debug(' '.join(['Solved board', str(size), 'x', str(size), 'in', str(player.nodes), 'nodes']))
+
+    def _child_value(self, board: Board, name: Tuple[int, int], mark: str, other: str,
+                     alpha: float, beta: float) -> int:
+        """
+        Makes the move, evaluates the result for the moving side and takes the move back
+        :param board: board with the position
+        :param name: cell for the move
+        :param mark: mark of the moving side
+        :param other: mark of the opponent
+        :param alpha: lower bound of interesting values
+        :param beta: upper bound of interesting values
+        :return: value of the move for the moving side
+        """
+        board.put_mark(name, mark)
+        game_over, winner = board.check_win_combo(board.cells[name])
+        if not game_over:
+            value = -self._search(board, other, mark, -beta, -alpha)
+        elif winner == '-':
+            value = 0
+        else:
+            value = board.size ** 2 - board.filled_cells + 1
+        board.remove_mark(name)
+        return value
+
+    def _search(self, board: Board, mark: str, other: str, alpha: float, beta: float) -> int:
+        """
+        Negamax with alpha-beta pruning and transposition table of (lower, upper)
+            bounds of position values
+        :param board: board with the position
+        :param mark: mark of the side to move
+        :param other: mark of the opponent
+        :param alpha: lower bound of interesting values
+        :param beta: upper bound of interesting values
+        :return: value of the position for the side to move
+        """
+        table = self._tables.setdefault((board.size, board.condition), dict())
+        key = board.canonical_zobrist
+        lower, upper = table.get(key, (-math.inf, math.inf))
+        if lower == upper or lower >= beta or upper <= alpha:
+            return lower if lower >= beta or lower == upper else upper
+        alpha = max(alpha, lower)
+        beta = min(beta, upper)
+
+        self.nodes += 1
+        alpha_start = alpha
+        best = -math.inf
+        for name in self.empty_cells(board):
+            value = self._child_value(board, name, mark, other, alpha, beta)
+            best = max(best, value)
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                break
+
+        # bounds from different windows are merged, so the entry only gets tighter
+        if best <= alpha_start:
+            upper = min(upper, best)
+        elif best >= beta:
+            lower = max(lower, best)
+        else:
+            lower = upper = best
+        table[key] = (lower, upper)
+        return best
@@ -0,0 +1,126 @@
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Tuple
+
+from ai_classes.computer_player import ComputerPlayer
+from ai_classes.mcts_player import MCTSPlayer
+from game_classes.game import Game
+from game_classes.player import Player
+
+
+def search_worker(size: int, condition: int, marks: Dict[Tuple[int, int], str], mark: str, other: str,
+                  playouts: int, time_limit: Optional[float], radius: Optional[int],
+                  seed: int) -> Dict[Tuple[int, int], Tuple[int, float]]:
+    """
+    Runs MCTS for the position in a worker process
+    :param size: size of the board
+    :param condition: win condition of the board
+    :param marks: {cell name: mark} for marked cells
+    :param mark: mark of the side to move
+    :param other: mark of the opponent
+    :param playouts: number of playouts, used if time_limit is None
+    :param time_limit: seconds for the search
+    :param radius: radius of tree moves around marks
+    :param seed: seed for random playouts of the worker
+    :return: {cell name: (visits, wins)} for moves of the root
+    """
+    player = MCTSPlayer('Worker', playouts, time_limit, radius=radius, seed=seed)
+    player.mark = mark
+    opponent = Player('Opponent')
+    opponent.mark = other
+    game = Game([player, opponent])
+    game.create_board(size, condition, 'bitboard')
+    for name, cell_mark in marks.items():
+        game.board.put_mark(name, cell_mark)
+    root = player.search(game)
+    return {player.names[move]: (child.visits, child.wins) for move, child in root.children.items()}
+
+
+class ParallelMCTSPlayer(ComputerPlayer):
+    """
+    Computer player with root-parallel Monte Carlo tree search: every worker process
+        builds its own tree for the position with its own random seed, then visits
+        and wins of the root moves are summed and the most visited move is played.
+        Workers don't share anything during the search, so the number of playouts
+        grows with the number of processes. The pool is started by the first move
+        and kept until close
+        :param name: name for a new player
+        :param workers: number of worker processes, all CPUs by default
+        :param playouts: number of playouts of every worker, used if time_limit is None
+        :param time_limit: seconds for a move
+        :param radius: radius of tree moves around marks, None for all empty cells
+        :param seed: base seed, worker i of move n gets seed + n * workers + i
+
+    :prop name: player's name
+    :prop mark: mark assigned to the player
+    :prop playouts_done: total number of playouts of the last choose_move
+    :prop playouts_per_second: total playout speed of the last choose_move
+
+    :method choose_move: returns the most visited move of all workers
+    :method close: stops worker processes
+    """
+
+    def __init__(self, name: str = 'Computer', workers: Optional[int] = None, playouts: int = 10000,
+                 time_limit: Optional[float] = None, radius: Optional[int] = 2, seed: int = 0) -> None:
+        super().__init__(name)
+        self.workers = workers or os.cpu_count() or 1
+        self.playouts = playouts
+        self.time_limit = time_limit
+        self.radius = radius
+        self.seed = seed
+        self.playouts_done = 0
+        self.playouts_per_second = 0.0
+        self.__moves_made = 0
+        self.__executor: Optional[ProcessPoolExecutor] = None
+
+    def choose_move(self, game: Game) -> Tuple[int, int]:
+        """
+        Runs searches in all workers and merges statistics of the root moves
+        :param game: game, where it's turn of the player now
+        :return: name of the cell to mark
+        """
+        start = time.perf_counter()
+        if self.__executor is None:
+            self.__executor = ProcessPoolExecutor(max_workers=self.workers)
+        board = game.board
+        marks = dict(board.marked_cells())
+        other = self.other_mark(game, self.mark)
+        base_seed = self.seed + self.__moves_made * self.workers
+        self.__moves_made += 1
+        futures = [self.__executor.submit(search_worker, board.size, board.condition, marks, self.mark, other,
+                                          self.playouts, self.time_limit, self.radius, base_seed + worker)
+                   for worker in range(self.workers)]
+        merged: Dict[Tuple[int, int], list] = dict()
+        for future in futures:
+            for name, (visits, wins) in future.result().items():
+                stats = merged.setdefault(name, [0, 0.0])
+                stats[0] += visits
+                stats[1] += wins
+        self.playouts_done = sum(visits for visits, _ in merged.values())
+        elapsed = time.perf_counter() - start
+        self.playouts_per_second = self.playouts_done / elapsed if elapsed > 0 else 0.0
+        best = max(merged, key=lambda name: merged[name][0])
+        logging.debug(' '.join([self.name, 'chose', str(best), 'after', str(self.playouts_done), 'playouts in',
+                                str(self.workers), 'workers,', str(round(self.playouts_per_second)), 'playouts/sec']))
+        return best
+
+    def __getstate__(self) -> tuple:
+        """
+        Pickles the player without its worker pool, a copy starts its own pool
+        :return: state of the player: attributes of __dict__ and of __slots__
+        """
+        state = self.__dict__.copy()
+        state['_ParallelMCTSPlayer__executor'] = None
+        # name and mark are kept in __slots__ of Player, not in __dict__
+        return state, {'_Player__name': self.name, '_Player__mark': self.mark}
+
+    def close(self) -> None:
+        """
+        Stops worker processes
+        :return: None
+        """
+        if self.__executor is not None:
+            self.__executor.shutdown()
+            self.__executor = None
@@ -0,0 +1,41 @@
+import random
+from typing import Optional, Tuple
+
+from ai_classes.computer_player import ComputerPlayer
+from game_classes.game import Game
+
+
+class RandomPlayer(ComputerPlayer):
+    """
+    Computer player, that marks a random empty cell. It is the cheapest opponent
+        for batch games and a baseline for other players. A few random cells are
+        tried first, all empty cells are listed only on a crowded board
+        :param name: name for a new player
+        :param seed: seed for random moves
+        :param tries: number of random cells tried before listing empty cells
+
+    :prop name: player's name
+    :prop mark: mark assigned to the player
+
+    :method choose_move: returns a random empty cell
+    """
+
+    def __init__(self, name: str = 'Computer', seed: Optional[int] = None, tries: int = 8) -> None:
+        super().__init__(name)
+        self.random = random.Random(seed)
+        self.tries = tries
+
+    def choose_move(self, game: Game) -> Tuple[int, int]:
+        """
+        Chooses a random empty cell
+        :param game: game, where it's turn of the player now
+        :return: name of the cell to mark
+        """
+        board = game.board
+        size = board.size
+        randrange = self.random.randrange
+        for _ in range(self.tries):
+            name = (randrange(size), randrange(size))
+            if board.get_mark(name) == ' ':
+                return name
+        return self.random.choice(self.empty_cells(board))
@@ -0,0 +1,179 @@
+import logging
+import time
+from itertools import combinations
+from math import comb
+from typing import List, Tuple
+
+import numpy as np
+
+from ai_classes.solved_database import (DISTANCE_BITS, DRAW, HEADER, LOSS, MAGIC, VERSION, WIN,
+                                        layer_sizes, line_masks)
+from game_classes.board import Board
+
+
+def _sorted_masks(cells: int, count: int) -> np.ndarray:
+    """
+    Returns bit masks of all sets of count cells. Increasing order of masks is
+        colexicographic order of the sets, so the index of a mask is its rank
+    :param cells: number of cells
+    :param count: number of cells in a set
+    :return: sorted int64 array
+    """
+    masks = [sum(1 << cell for cell in cells_set) for cells_set in combinations(range(cells), count)]
+    return np.sort(np.array(masks, dtype=np.int64))
+
+
+def _layer(cells: int, marks: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns all positions with the number of marks in order of their ranks
+    :param cells: number of cells of the board
+    :param marks: number of marks
+    :return: (crosses, noughts) int64 arrays of bit masks
+    """
+    crosses_count, noughts_count = (marks + 1) // 2, marks // 2
+    crosses = _sorted_masks(cells, crosses_count)
+    packed = _sorted_masks(cells - crosses_count, noughts_count)  # noughts among cells without crosses
+    free = np.array([[cell for cell in range(cells) if not mask >> cell & 1] for mask in crosses.tolist()],
+                    dtype=np.int64).reshape(len(crosses), cells - crosses_count)
+    noughts = np.zeros((len(crosses), len(packed)), dtype=np.int64)
+    for bit in range(cells - crosses_count):
+        noughts |= ((packed[np.newaxis, :] >> bit) & 1) << free[:, bit:bit + 1]
+    return np.repeat(crosses, len(packed)), noughts.reshape(-1)
+
+
+def _ranks(crosses: np.ndarray, noughts: np.ndarray, cells: int, marks: int, table: np.ndarray) -> np.ndarray:
+    """
+    Returns ranks of positions with the number of marks inside their layer,
+        like SolvedDatabase does for one position
+    :param crosses: int64 array of bit masks of crosses
+    :param noughts: int64 array of bit masks of noughts
+    :param cells: number of cells of the board
+    :param marks: number of marks
+    :param table: binomial coefficients, table[n, k] = comb(n, k)
+    :return: int64 array of ranks
+    """
+    crosses_rank = np.zeros(len(crosses), dtype=np.int64)
+    noughts_rank = np.zeros(len(crosses), dtype=np.int64)
+    seen_crosses = np.zeros(len(crosses), dtype=np.int64)
+    seen_noughts = np.zeros(len(crosses), dtype=np.int64)
+    free = np.zeros(len(crosses), dtype=np.int64)
+    for bit in range(cells):
+        is_cross = (crosses >> bit) & 1
+        is_nought = (noughts >> bit) & 1
+        seen_crosses += is_cross
+        seen_noughts += is_nought
+        crosses_rank += is_cross * table[bit, seen_crosses]
+        noughts_rank += is_nought * table[free, seen_noughts]
+        free += 1 - is_cross
+    return crosses_rank * comb(cells - (marks + 1) // 2, marks // 2) + noughts_rank
+
+
+def _has_line(masks: np.ndarray, lines: List[int]) -> np.ndarray:
+    """
+    Checks which masks contain a whole line
+    :param masks: int64 array of bit masks of one player
+    :param lines: masks of lines of condition cells
+    :return: bool array
+    """
+    found = np.zeros(len(masks), dtype=bool)
+    for line in lines:
+        found |= (masks & line) == line
+    return found
+
+
+def solve(size: int, condition: int) -> List[np.ndarray]:
+    """
+    Solves the board by retrograde analysis. The forward pass marks positions, that
+        can appear in a game, layer by layer from the empty board. The backward pass
+        goes from the full board to the empty one: finished positions are losses for
+        the side to move or draws, others take the best result of their children
+        from the next layer, which is already solved
+    :param size: size of the board, size ** 2 marks must fit 64-bit masks and
+        a distance must fit DISTANCE_BITS
+    :param condition: win condition of the board
+    :return: uint8 arrays of encoded values of every layer, 0 for unreachable positions
+    """
+    cells = size ** 2
+    if cells >= 1 << DISTANCE_BITS:
+        logging.error(' '.join(['Attempt to solve board', str(size), 'x', str(size)]))
+        raise ValueError('Only boards with less than {cells} cells can be solved'.format(cells=1 << DISTANCE_BITS))
+    condition = Board(size, condition).condition
+    lines = line_masks(size, condition)
+    table = np.array([[comb(total, count) for count in range(cells + 2)] for total in range(cells + 1)],
+                     dtype=np.int64)
+    sizes = layer_sizes(size)
+    layers = [_layer(cells, marks) for marks in range(cells + 1)]
+
+    # forward pass: reachable and finished positions
+    reachable = [np.zeros(layer_size, dtype=bool) for layer_size in sizes]
+    reachable[0][0] = True
+    finished = []
+    for marks, (crosses, noughts) in enumerate(layers):
+        over = _has_line(crosses if marks % 2 else noughts, lines)
+        if marks == cells:
+            over[:] = True
+        finished.append(over)
+        if marks == cells:
+            break
+        playing = np.nonzero(reachable[marks] & ~over)[0]
+        playing_crosses, playing_noughts = crosses[playing], noughts[playing]
+        for bit in range(cells):
+            empty = ((playing_crosses | playing_noughts) >> bit) & 1 == 0
+            child_crosses, child_noughts = playing_crosses[empty], playing_noughts[empty]
+            if marks % 2:
+                child_noughts = child_noughts | 1 << bit
+            else:
+                child_crosses = child_crosses | 1 << bit
+            reachable[marks + 1][_ranks(child_crosses, child_noughts, cells, marks + 1, table)] = True
+
+    # backward pass: results of the side to move
+    values = [np.zeros(layer_size, dtype=np.uint8) for layer_size in sizes]
+    for marks in range(cells, -1, -1):
+        crosses, noughts = layers[marks]
+        done = reachable[marks] & finished[marks]
+        lost = done & _has_line(crosses if marks % 2 else noughts, lines)
+        values[marks][lost] = LOSS << DISTANCE_BITS
+        values[marks][done & ~lost] = DRAW << DISTANCE_BITS
+        if marks == cells:
+            continue
+        playing = np.nonzero(reachable[marks] & ~finished[marks])[0]
+        # key of a move for the side to move: result, then the fastest win or the slowest loss
+        best = np.full(len(playing), -1, dtype=np.int64)
+        playing_crosses, playing_noughts = crosses[playing], noughts[playing]
+        for bit in range(cells):
+            empty = ((playing_crosses | playing_noughts) >> bit) & 1 == 0
+            child_crosses, child_noughts = playing_crosses[empty], playing_noughts[empty]
+            if marks % 2:
+                child_noughts = child_noughts | 1 << bit
+            else:
+                child_crosses = child_crosses | 1 << bit
+            child = values[marks + 1][_ranks(child_crosses, child_noughts, cells, marks + 1, table)].astype(np.int64)
+            result = WIN + LOSS - (child >> DISTANCE_BITS)
+            distance = (child & ((1 << DISTANCE_BITS) - 1)) + 1
+            key = (result << DISTANCE_BITS) + np.where(result == WIN, (1 << DISTANCE_BITS) - 1 - distance, distance)
+            best[empty] = np.maximum(best[empty], key)
+        result = best >> DISTANCE_BITS
+        distance = best & ((1 << DISTANCE_BITS) - 1)
+        distance = np.where(result == WIN, (1 << DISTANCE_BITS) - 1 - distance, distance)
+        values[marks][playing] = ((result << DISTANCE_BITS) | distance).astype(np.uint8)
+    return values
+
+
+def write_database(path: str, size: int, condition: int) -> None:
+    """
+    Solves the board and writes the database for SolvedDatabase
+    :param path: path of the new file
+    :param size: size of the board
+    :param condition: win condition of the board
+    :return: None
+    """
+    start = time.perf_counter()
+    condition = Board(size, condition).condition
+    values = solve(size, condition)
+    with open(path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, VERSION, size, condition))
+        for layer in values:
+            file.write(layer.tobytes())
+    logging.info(' '.join(['Solved board', str(size), 'x', str(size), 'with condition', str(condition), 'in',
+                           str(round(time.perf_counter() - start, 1)), 'seconds, database', path, 'has',
+                           str(sum(len(layer) for layer in values)), 'positions']))
@@ -0,0 +1,223 @@
+import logging
+import mmap
+import os
+import struct
+from functools import lru_cache
+from math import comb
+from typing import List, Optional, Tuple
+
+from game_classes.board import Board
+
+UNKNOWN, LOSS, DRAW, WIN = 0, 1, 2, 3  # results for the side to move, UNKNOWN for unreachable positions
+RESULT_NAMES = {LOSS: 'loss', DRAW: 'draw', WIN: 'win'}
+DISTANCE_BITS = 6
+HEADER = struct.Struct('<4sBBBx')  # magic, version, size, condition
+MAGIC = b'TTTS'
+VERSION = 1
+
+
+def database_path(size: int, condition: int, directory: str = 'solved') -> str:
+    """
+    Returns the usual path of the database for the board
+    :param size: size of the board
+    :param condition: win condition of the board
+    :param directory: folder with databases
+    :return: path of the file
+    """
+    return os.path.join(directory, '{size}x{size}_{condition}.ttt'.format(size=size, condition=condition))
+
+
+@lru_cache(maxsize=None)
+def open_database(size: int, condition: int, directory: str = 'solved') -> Optional['SolvedDatabase']:
+    """
+    Opens the database for the board from the folder once per process
+    :param size: size of the board
+    :param condition: win condition of the board
+    :param directory: folder with databases
+    :return: SolvedDatabase, None if there is no database for the board
+    """
+    path = database_path(size, condition, directory)
+    if not os.path.exists(path):
+        return None
+    return SolvedDatabase(path)
+
+
+def layer_sizes(size: int) -> List[int]:
+    """
+    Returns numbers of positions with 0, 1, ... size ** 2 marks. 'x' moves first,
+        so a position with t marks has (t + 1) // 2 crosses and t // 2 noughts
+    :param size: size of the board
+    :return: list of size ** 2 + 1 numbers
+    """
+    cells = size ** 2
+    return [comb(cells, (marks + 1) // 2) * comb(cells - (marks + 1) // 2, marks // 2) for marks in range(cells + 1)]
+
+
+def line_masks(size: int, condition: int) -> List[int]:
+    """
+    Returns bit masks of all lines of condition cells, bit of cell (index_1, index_2)
+        is index_1 * size + index_2. Condition is limited like in Board
+    :param size: size of the board
+    :param condition: win condition of the board
+    :return: list of masks
+    """
+    condition = max(1, min(condition, size))
+    masks = []
+    for index_1 in range(size):
+        for index_2 in range(size):
+            for step_1, step_2 in Board.DIRECTIONS:
+                end_1 = index_1 + step_1 * (condition - 1)
+                end_2 = index_2 + step_2 * (condition - 1)
+                if 0 <= end_1 < size and 0 <= end_2 < size:
+                    masks.append(sum(1 << ((index_1 + step_1 * step) * size + index_2 + step_2 * step)
+                                     for step in range(condition)))
+    return masks
+
+
+def decode(value: int) -> Tuple[int, int]:
+    """
+    Unpacks the byte of the database
+    :param value: byte value
+    :return: (result for the side to move, distance to the end of the game)
+    """
+    return value >> DISTANCE_BITS, value & ((1 << DISTANCE_BITS) - 1)
+
+
+class SolvedDatabase:
+    """
+    Game-theoretic values of all reachable positions of a small board, written by
+        retrograde_solver. A position is one byte: result for the side to move and
+        distance to the end of the game with the best play of both sides.
+
+    Positions are ranked without gaps: first by the number of marks, then by the set
+        of crosses and by the set of noughts among the other cells, both sets in
+        colexicographic order. The rank is computed from the position in O(size ** 2),
+        and the file is memory-mapped, so a lookup reads one byte and the database
+        doesn't need to be loaded or kept in memory
+        :param path: path of the database file
+
+    :prop size: size of the board
+    :prop condition: win condition of the board
+
+    :method lookup: returns result and distance of the position on the board
+    :method lookup_masks: returns result and distance of the position given by bit masks
+    :method best_move: returns the best move of the side to move
+    :method close: closes the file
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.__file = open(path, 'rb')
+        self.__data = mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.size, self.condition = HEADER.unpack_from(self.__data)
+        self.__cells = self.size ** 2
+        sizes = layer_sizes(self.size)
+        if magic != MAGIC or version != VERSION or len(self.__data) != HEADER.size + sum(sizes):
+            self.close()
+            logging.error(' '.join(['File', path, 'is not a solved position database']))
+            raise ValueError('Wrong solved position database file')
+        self.__offsets = [HEADER.size]
+        for layer_size in sizes[:-1]:
+            self.__offsets.append(self.__offsets[-1] + layer_size)
+        self.__comb = [[comb(cells, count) for count in range(self.__cells + 1)] for cells in range(self.__cells + 1)]
+
+    def lookup(self, board: Board) -> Optional[Tuple[int, int]]:
+        """
+        Returns result and distance of the position on the board for the side to move.
+            'x' is expected to move first, like in Game.start_game
+        :param board: board of the same size and condition
+        :return: (LOSS, DRAW or WIN, number of moves to the end of the game),
+            None for positions, that can't appear in a game
+        """
+        return self.lookup_masks(*self._masks(board))
+
+    def lookup_masks(self, crosses: int, noughts: int) -> Optional[Tuple[int, int]]:
+        """
+        Returns result and distance of the position for the side to move
+        :param crosses: bit mask of cells with 'x', bit index_1 * size + index_2
+        :param noughts: bit mask of cells with 'o'
+        :return: (LOSS, DRAW or WIN, number of moves to the end of the game), or None
+        """
+        index = self._rank(crosses, noughts)
+        if index is None or self.__data[index] == UNKNOWN:
+            return None
+        return decode(self.__data[index])
+
+    def best_move(self, board: Board) -> Optional[Tuple[Tuple[int, int], int, int]]:
+        """
+        Returns the best move of the side to move: the fastest win, a draw,
+            or the slowest loss
+        :param board: board of the same size and condition
+        :return: (name of the cell, result, distance) for the side to move,
+            None if the game is over or the position is unknown
+        """
+        crosses, noughts = self._masks(board)
+        if self.lookup_masks(crosses, noughts) is None:
+            return None
+        to_move_is_x = bin(crosses).count('1') == bin(noughts).count('1')
+        best, best_key = None, None
+        for bit in range(self.__cells):
+            if (crosses | noughts) >> bit & 1:
+                continue
+            if to_move_is_x:
+                child = self.lookup_masks(crosses | 1 << bit, noughts)
+            else:
+                child = self.lookup_masks(crosses, noughts | 1 << bit)
+            if child is None:
+                continue
+            result, distance = WIN + LOSS - child[0], child[1] + 1
+            # the fastest win and the slowest loss are the best
+            key = (result, -distance if result == WIN else distance)
+            if best_key is None or key > best_key:
+                best, best_key = ((bit // self.size, bit % self.size), result, distance), key
+        return best
+
+    def close(self) -> None:
+        """
+        Closes the memory map and the file
+        :return: None
+        """
+        self.__data.close()
+        self.__file.close()
+
+    def _masks(self, board: Board) -> Tuple[int, int]:
+        """
+        Returns bit masks of crosses and noughts on the board
+        :param board: board of the same size and condition
+        :return: (crosses, noughts)
+        """
+        if (board.size, board.condition) != (self.size, self.condition):
+            logging.error(' '.join(['Attempt to look up board', str(board.size), 'x', str(board.size),
+                                    'with condition', str(board.condition), 'in database of',
+                                    str(self.size), 'x', str(self.size), 'with condition', str(self.condition)]))
+            raise ValueError('Board must have the size and the condition of the database')
+        masks = {'x': 0, 'o': 0}
+        for (index_1, index_2), mark in board.marked_cells():
+            if mark in masks:
+                masks[mark] |= 1 << (index_1 * self.size + index_2)
+        return masks['x'], masks['o']
+
+    def _rank(self, crosses: int, noughts: int) -> Optional[int]:
+        """
+        Returns position of the byte of the position in the file
+        :param crosses: bit mask of cells with 'x'
+        :param noughts: bit mask of cells with 'o'
+        :return: offset in the file, None if the numbers of marks don't fit 'x' moving first
+        """
+        crosses_count, noughts_count = bin(crosses).count('1'), bin(noughts).count('1')
+        if crosses & noughts or crosses_count - noughts_count not in (0, 1):
+            return None
+        combinations = self.__comb
+        crosses_rank = noughts_rank = 0
+        seen_crosses = seen_noughts = free = 0
+        for bit in range(self.__cells):
+            if crosses >> bit & 1:
+                seen_crosses += 1
+                crosses_rank += combinations[bit][seen_crosses]
+                continue
+            if noughts >> bit & 1:
+                seen_noughts += 1
+                noughts_rank += combinations[free][seen_noughts]
+            free += 1
+        return (self.__offsets[crosses_count + noughts_count]
+                + crosses_rank * combinations[self.__cells - crosses_count][noughts_count] + noughts_rank)
@@ -0,0 +1,426 @@
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+
+from game_classes.board import Board
+from game_classes.game import Game
+from game_classes.sparse_board import MAX_LISTED_SIZE
+from game_classes.zobrist import cell_key, splitmix64
+
+PROVEN, DISPROVEN, UNKNOWN = 'proven', 'disproven', 'unknown'
+INFINITY = 1 << 30
+ATTACKER, DEFENDER = 0, 1
+TURN_KEY = splitmix64(0x7475726E)  # hashed in, when it's turn of the attacker
+
+
+class SearchStopped(Exception):
+    """
+    Raised inside the search, when node or time budget is over
+    """
+
+
+class ThreatSolver:
+    """
+    Proves forced wins by threat sequences with depth-first proof-number search (df-pn).
+
+    The attacker plays only threats: in 'vcf' mode fours (moves, after which the attacker
+        wins with the next move), in 'vct' mode also threes (moves, that make a window of
+        condition cells with condition - 2 attacker marks and no defender marks). The defender
+        must block a four, against a three he can block cells of the attacker's threes or
+        make his own four. VCF proofs are exact: the defender has no other moves, that
+        don't lose at once. VCT proofs assume, like threat-space search does, that other
+        defences against a three don't help.
+
+    Proof and disproof numbers of positions are kept in a transposition table keyed by
+        Zobrist hash. The table holds at most table_size entries, the least recently
+        used ones are evicted, so memory doesn't grow with the search. A disproof is kept
+        with its horizon: number of plies, for which it holds. Sequences cut by max_depth
+        give disproofs with a finite horizon, they aren't used for positions with more
+        plies left and don't make the result DISPROVEN
+        :param mode: 'vcf' or 'vct'
+        :param max_nodes: max number of searched positions for one solve
+        :param time_limit: seconds for one solve, None for no limit
+        :param max_depth: max length of a threat sequence in plies
+        :param table_size: max number of transposition table entries
+
+    :prop result: PROVEN, DISPROVEN or UNKNOWN for the last solve
+    :prop nodes: number of positions searched by the last solve
+
+    :method solve: returns the winning line for the attacker, if it's proven
+    :method solve_game: returns the winning line for the player, whose turn is now in the game
+    """
+
+    def __init__(self, mode: str = 'vcf', max_nodes: int = 100000, time_limit: Optional[float] = None,
+                 max_depth: int = 40, table_size: int = 1 << 18) -> None:
+        if mode not in ('vcf', 'vct'):
+            logging.error(' '.join(['Attempt to create threat solver with', str(mode), 'mode']))
+            raise ValueError("Threat solver mode must be 'vcf' or 'vct'")
+        self.mode = mode
+        self.max_nodes = max_nodes
+        self.time_limit = time_limit
+        self.max_depth = max_depth
+        self.table_size = table_size
+        self.result = UNKNOWN
+        self.nodes = 0
+        self.__table: OrderedDict = OrderedDict()  # {key: (proof number, disproof number, horizon)}
+        self.__table_owner: Tuple = ()
+        self.__geometry: Tuple[int, int] = (0, 0)
+
+    def solve_game(self, game: Game) -> Optional[List[Tuple[int, int]]]:
+        """
+        Looks for a forced win of the player, whose turn is now in the game
+        :param game: game, that is not over
+        :return: winning line, see solve
+        """
+        mark = game.players[game.curr_turn].mark
+        other = game.players[1 - game.curr_turn].mark
+        return self.solve(game.board, mark, other)
+
+    def solve(self, board: Board, attacker: str, defender: str,
+              attacker_to_move: bool = True) -> Optional[List[Tuple[int, int]]]:
+        """
+        Looks for a forced win of the attacker by threats
+        :param board: board with the position, it's left unchanged
+        :param attacker: mark of the player, whose win is looked for
+        :param defender: mark of the opponent
+        :param attacker_to_move: False to prove, that the defender to move loses
+        :return: cells of the winning line from the position: moves of the side to move
+            and replies in turn, the last one completes the win. None if the win is
+            disproven or the budget is over, see result
+        """
+        start = time.perf_counter()
+        self._load(board, attacker, defender)
+        self.nodes = 0
+        self.deadline = None if self.time_limit is None else start + self.time_limit
+        try:
+            proof, disproof, horizon = self._search(attacker_to_move, INFINITY, INFINITY, 0)
+            self.result = (PROVEN if proof == 0 else DISPROVEN if disproof == 0 and horizon == INFINITY
+                           else UNKNOWN)
+            line = self._line(attacker_to_move) if self.result == PROVEN else None
+        except SearchStopped:
+            self.result, line = UNKNOWN, None
+        logging.debug(' '.join(['Threat solver', self.mode, 'for', attacker, 'result:', self.result, 'after',
+                                str(self.nodes), 'nodes in', str(round(time.perf_counter() - start, 3)), 'sec']))
+        return line
+
+    def _load(self, board: Board, attacker: str, defender: str) -> None:
+        """
+        Copies the position of the board: marks, window counts, threat windows and hash
+        :param board: board of the game
+        :param attacker: mark of the attacker
+        :param defender: mark of the defender
+        :return: None
+        """
+        size, condition = board.size, board.condition
+        if condition < 2:
+            logging.error(' '.join(['Attempt to solve board with condition', str(condition)]))
+            raise ValueError('Threat solver needs win condition of 2 or more cells')
+        if size > MAX_LISTED_SIZE:
+            logging.error(' '.join(['Attempt to search board', str(size), 'x', str(size)]))
+            raise ValueError('Threat solver needs a board not bigger than MAX_LISTED_SIZE')
+        if self.__geometry != (size, condition):
+            self._build_geometry(size, condition)
+        owner = (size, condition, attacker, defender, self.mode)
+        if self.__table_owner != owner:
+            self.__table.clear()
+            self.__table_owner = owner
+        marks = (attacker, defender)
+        self.keys = [[cell_key(name, mark) for name in self.names] for mark in marks]
+        self.cells = [-1] * size ** 2
+        self.filled = 0
+        self.key = 0
+        self.counts = ([0] * len(self.windows), [0] * len(self.windows))
+        # {number of own marks: windows with them and no opponent's marks} for both sides
+        self.levels: Tuple[Dict[int, Set[int]], ...] = tuple({level: set() for level in range(condition + 1)}
+                                                             for _ in marks)
+        for levels in self.levels:
+            levels[0].update(range(len(self.windows)))
+        for name, mark in board.marked_cells():
+            if mark in marks:
+                self._make(name[0] * size + name[1], marks.index(mark))
+
+    def _build_geometry(self, size: int, condition: int) -> None:
+        """
+        Prepares cell names and windows of condition cells in every direction
+        :param size: size of the board
+        :param condition: win condition of the board
+        :return: None
+        """
+        self.__geometry = (size, condition)
+        self.condition = condition
+        self.names = [(index_1, index_2) for index_1 in range(size) for index_2 in range(size)]
+        self.windows: List[Tuple[int, ...]] = []
+        self.cell_windows: List[List[int]] = [[] for _ in self.names]
+        for index_1, index_2 in self.names:
+            for step_1, step_2 in Board.DIRECTIONS:
+                end_1 = index_1 + step_1 * (condition - 1)
+                end_2 = index_2 + step_2 * (condition - 1)
+                if 0 <= end_1 < size and 0 <= end_2 < size:
+                    window = tuple((index_1 + step_1 * step) * size + index_2 + step_2 * step
+                                   for step in range(condition))
+                    for index in window:
+                        self.cell_windows[index].append(len(self.windows))
+                    self.windows.append(window)
+
+    def _make(self, index: int, side: int) -> None:
+        """
+        Puts the mark of the side in the cell and moves windows through it between levels
+        :param index: index of the cell
+        :param side: ATTACKER or DEFENDER
+        :return: None
+        """
+        self.cells[index] = side
+        self.filled += 1
+        self.key ^= self.keys[side][index]
+        own, opp = self.counts[side], self.counts[1 - side]
+        own_levels, opp_levels = self.levels[side], self.levels[1 - side]
+        for window in self.cell_windows[index]:
+            stones = own[window]
+            if opp[window] == 0:
+                own_levels[stones].discard(window)
+                own_levels[stones + 1].add(window)
+            if stones == 0:
+                opp_levels[opp[window]].discard(window)
+            own[window] = stones + 1
+
+    def _unmake(self, index: int, side: int) -> None:
+        """
+        Takes back the move, made by _make
+        :param index: index of the cell
+        :param side: ATTACKER or DEFENDER
+        :return: None
+        """
+        self.cells[index] = -1
+        self.filled -= 1
+        self.key ^= self.keys[side][index]
+        own, opp = self.counts[side], self.counts[1 - side]
+        own_levels, opp_levels = self.levels[side], self.levels[1 - side]
+        for window in self.cell_windows[index]:
+            stones = own[window] - 1
+            own[window] = stones
+            if opp[window] == 0:
+                own_levels[stones + 1].discard(window)
+                own_levels[stones].add(window)
+            if stones == 0:
+                opp_levels[opp[window]].add(window)
+
+    def _level_cells(self, side: int, level: int) -> Set[int]:
+        """
+        Returns empty cells of the side's windows with level own marks and no opponent's marks
+        :param side: ATTACKER or DEFENDER
+        :param level: number of own marks in a window
+        :return: set of cell indexes
+        """
+        if level < 0:
+            return set()
+        cells = self.cells
+        return {index for window in self.levels[side][level] for index in self.windows[window] if cells[index] < 0}
+
+    def _status(self, attacker_to_move: bool) -> Optional[bool]:
+        """
+        Checks if the result of the position is clear without search
+        :param attacker_to_move: True if it's turn of the attacker
+        :return: True if the attacker wins, False if he can't win by threats, None if unclear
+        """
+        to_move, waiting = (ATTACKER, DEFENDER) if attacker_to_move else (DEFENDER, ATTACKER)
+        if self.levels[waiting][self.condition]:
+            return not attacker_to_move  # the game is already won
+        if self.levels[to_move][self.condition - 1]:
+            return attacker_to_move  # the side to move completes a line
+        if len(self._level_cells(waiting, self.condition - 1)) > 1:
+            return not attacker_to_move  # two cells to block
+        if self.filled == len(self.cells):
+            return False
+        return None
+
+    def _moves(self, attacker_to_move: bool) -> List[int]:
+        """
+        Returns moves of the side to move, that keep the threat sequence going.
+            The position mustn't be clear by _status
+        :param attacker_to_move: True if it's turn of the attacker
+        :return: list of cell indexes, the most threatening first
+        """
+        four = self.condition - 1
+        if attacker_to_move:
+            moves = self._level_cells(ATTACKER, four - 1)
+            if self.mode == 'vct':
+                moves |= self._level_cells(ATTACKER, four - 2)
+            blocks = self._level_cells(DEFENDER, four)
+            if blocks:
+                moves &= blocks
+            side = ATTACKER
+        else:
+            moves = self._level_cells(ATTACKER, four)
+            if not moves and self.mode == 'vct':  # defences against threes
+                moves = self._level_cells(ATTACKER, four - 1) | self._level_cells(DEFENDER, four - 1)
+            side = DEFENDER
+        counts = self.counts[side]
+        return sorted(moves, key=lambda index: -sum(counts[window] for window in self.cell_windows[index]))
+
+    def _lookup(self, key: int, remaining: int) -> Optional[Tuple[int, int, int]]:
+        """
+        Returns proof and disproof numbers of the position from the table
+        :param key: hash of the position
+        :param remaining: plies left for the search from the position
+        :return: (proof number, disproof number, horizon), None if the position is not
+            in the table or its disproof has a shorter horizon, than remaining
+        """
+        entry = self.__table.get(key)
+        if entry is None or (entry[1] == 0 and entry[2] < remaining):
+            return None
+        self.__table.move_to_end(key)
+        return entry
+
+    def _store(self, key: int, proof: int, disproof: int, horizon: int) -> None:
+        """
+        Saves proof and disproof numbers of the position, evicting the least recently
+            used entry, if the table is full
+        :param key: hash of the position
+        :param proof: proof number
+        :param disproof: disproof number
+        :param horizon: plies, for which the disproof holds, INFINITY if it is exact
+        :return: None
+        """
+        table = self.__table
+        table[key] = (proof, disproof, horizon)
+        table.move_to_end(key)
+        if len(table) > self.table_size:
+            table.popitem(last=False)
+
+    def _search(self, attacker_to_move: bool, proof_limit: int, disproof_limit: int,
+                depth: int) -> Tuple[int, int, int]:
+        """
+        Searches the position until its proof or disproof number reaches the limit.
+            The attacker's nodes are OR nodes, the defender's ones are AND nodes
+        :param attacker_to_move: True if it's turn of the attacker
+        :param proof_limit: threshold for the proof number
+        :param disproof_limit: threshold for the disproof number
+        :param depth: distance from the root in plies
+        :return: (proof number, disproof number, horizon of the disproof) of the position
+        """
+        self.nodes += 1
+        if self.nodes > self.max_nodes or (self.deadline is not None and not self.nodes & 255
+                                           and time.perf_counter() > self.deadline):
+            raise SearchStopped
+        key = self.key ^ TURN_KEY if attacker_to_move else self.key
+        status = self._status(attacker_to_move)
+        horizon = INFINITY
+        if status is None and depth >= self.max_depth:
+            status, horizon = False, 0  # too long to count as a threat sequence
+        moves = [] if status is not None else self._moves(attacker_to_move)
+        if status is not None or not moves:
+            proof, disproof = (0, INFINITY) if status else (INFINITY, 0)
+            self._store(key, proof, disproof, horizon)
+            return proof, disproof, horizon
+
+        side = ATTACKER if attacker_to_move else DEFENDER
+        numbers = []
+        for index in moves:
+            child_key = key ^ TURN_KEY ^ self.keys[side][index]
+            child = self._lookup(child_key, self.max_depth - depth - 1)
+            if child is None:
+                child = self._estimate(index, side)
+                self._store(child_key, *child)
+            numbers.append(child)
+        while True:
+            if attacker_to_move:
+                proof = min(child[0] for child in numbers)
+                disproof = min(INFINITY, sum(child[1] for child in numbers))
+            else:
+                proof = min(INFINITY, sum(child[0] for child in numbers))
+                disproof = min(child[1] for child in numbers)
+            if proof >= proof_limit or disproof >= disproof_limit:
+                break
+            # the most proving child and the limits for it
+            own = 0 if attacker_to_move else 1
+            best, first, second = 0, INFINITY, INFINITY
+            for position, child in enumerate(numbers):
+                if child[own] < first:
+                    best, first, second = position, child[own], first
+                elif child[own] < second:
+                    second = child[own]
+            child_proof, child_disproof, _ = numbers[best]
+            if attacker_to_move:
+                child_proof_limit = min(proof_limit, second + 1)
+                child_disproof_limit = disproof_limit - disproof + child_disproof
+            else:
+                child_proof_limit = proof_limit - proof + child_proof
+                child_disproof_limit = min(disproof_limit, second + 1)
+            self._make(moves[best], side)
+            numbers[best] = self._search(not attacker_to_move, child_proof_limit, child_disproof_limit, depth + 1)
+            self._unmake(moves[best], side)
+        if disproof == 0:
+            # the attacker needs all moves disproven, the defender one disproven reply
+            horizons = [child[2] for child in numbers if child[1] == 0]
+            horizon = min(INFINITY, (min(horizons) if attacker_to_move else max(horizons)) + 1)
+        self._store(key, proof, disproof, horizon)
+        return proof, disproof, horizon
+
+    def _estimate(self, index: int, side: int) -> Tuple[int, int]:
+        """
+        Returns proof and disproof numbers of the position after a new move: exact ones
+            for a clear result, else the number of moves of the side to move there.
+            A four leaves the defender one move, so it is tried before threes
+        :param index: index of the cell
+        :param side: side, that makes the move
+        :return: (proof number, disproof number, horizon of the disproof)
+        """
+        self._make(index, side)
+        attacker_to_move = side == DEFENDER
+        status = self._status(attacker_to_move)
+        if status is None:
+            moves = len(self._moves(attacker_to_move))
+            if not moves:
+                numbers = (INFINITY, 0)
+            else:
+                numbers = (1, moves) if attacker_to_move else (moves, 1)
+        else:
+            numbers = (0, INFINITY) if status else (INFINITY, 0)
+        self._unmake(index, side)
+        return numbers + (INFINITY,)
+
+    def _line(self, attacker_to_move: bool) -> List[Tuple[int, int]]:
+        """
+        Follows proven moves from the position: a proven move of the attacker, any reply
+            of the defender. Positions evicted from the table are searched again
+        :param attacker_to_move: True if it's turn of the attacker
+        :return: cells of the winning line
+        """
+        line = []
+        made = []
+        while True:
+            side = ATTACKER if attacker_to_move else DEFENDER
+            if attacker_to_move and self.levels[ATTACKER][self.condition - 1]:
+                line.append(self.names[min(self._level_cells(ATTACKER, self.condition - 1))])
+                break
+            if self._status(attacker_to_move) is not None:
+                if not attacker_to_move and self._status(attacker_to_move):
+                    # the defender blocks one of two winning cells, the attacker takes the other
+                    line.extend(self.names[index] for index in sorted(self._level_cells(ATTACKER,
+                                                                                        self.condition - 1))[:2])
+                break
+            chosen = None
+            moves = self._moves(attacker_to_move)
+            child_key = self.key if attacker_to_move else self.key ^ TURN_KEY
+            for index in moves:
+                numbers = self._lookup(child_key ^ self.keys[side][index], 0)
+                if numbers is not None and numbers[0] == 0:
+                    chosen = index
+                    break
+            for index in moves if chosen is None else ():  # proofs evicted from the table
+                self._make(index, side)
+                numbers = self._search(not attacker_to_move, INFINITY, INFINITY, len(made) + 1)
+                self._unmake(index, side)
+                if numbers[0] == 0:
+                    chosen = index
+                    break
+            if chosen is None:
+                break
+            self._make(chosen, side)
+            made.append((chosen, side))
+            line.append(self.names[chosen])
+            attacker_to_move = not attacker_to_move
+        for index, side in reversed(made):
+            self._unmake(index, side)
+        return line
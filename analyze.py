@@ -0,0 +1,56 @@
+import argparse
+import json
+import logging
+import sys
+
+from simulation_classes.analyzer import ENGINES, AnalysisStats, analyze
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parses command line arguments of the game analysis
+    :return: namespace with arguments
+    """
+    parser = argparse.ArgumentParser(description='Analyzes recorded games: blunders, decisive moves and lengths')
+    parser.add_argument('records', help='file with records of the games, written by simulate.py --records')
+    parser.add_argument('output', help='file for results of the games as JSON lines')
+    parser.add_argument('-e', '--engine', choices=ENGINES, default='auto',
+                        help='solved database, threat solver or none, auto chooses by the board')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='number of processes, all CPUs by default')
+    parser.add_argument('-b', '--batch-size', type=int, default=64, help='number of games in one task of a worker')
+    parser.add_argument('-d', '--directory', default='solved', help='folder with solved position databases')
+    parser.add_argument('--max-nodes', type=int, default=20000, help='budget of one threat solve')
+    parser.add_argument('-r', '--resume', action='store_true', help='continue an interrupted analysis')
+    parser.add_argument('--json', help='file to save the summary as JSON')
+    parser.add_argument('-q', '--quiet', action='store_true', help="don't print progress")
+    return parser.parse_args()
+
+
+def print_progress(stats: AnalysisStats) -> None:
+    """
+    Prints the number of analyzed games and blunders so far in one line
+    :param stats: stats of the analyzed games
+    :return: None
+    """
+    sys.stderr.write('\r{} games: {} with blunders'.format(stats.games, stats.games_with_blunders))
+    sys.stderr.flush()
+
+
+if __name__ == '__main__':
+
+    logging.basicConfig(
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s - %(funcName)s',
+        level=logging.WARNING
+    )
+
+    args = parse_args()
+    stats = analyze(args.records, args.output, args.engine, args.workers, args.batch_size, args.resume,
+                    args.directory, args.max_nodes, None if args.quiet else print_progress)
+    if not args.quiet:
+        sys.stderr.write('\n')
+    summary = stats.summary()
+    print(json.dumps({key: value for key, value in summary.items() if key not in ('lengths', 'decided_at')},
+                     indent=2))
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump(summary, file, indent=2)
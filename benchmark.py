@@ -0,0 +1,71 @@
+import argparse
+import json
+import logging
+import sys
+
+from game_classes.game import BOARD_BACKENDS
+from simulation_classes.benchmark import CONDITIONS, OPERATIONS, SIZES, compare, run
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parses command line arguments of the benchmark
+    :return: namespace with arguments
+    """
+    parser = argparse.ArgumentParser(description='Measures speed and memory of core game operations')
+    parser.add_argument('-s', '--sizes', type=int, nargs='+', default=list(SIZES), help='sizes of boards')
+    parser.add_argument('-c', '--conditions', type=int, nargs='+', default=list(CONDITIONS),
+                        help='win conditions of boards')
+    parser.add_argument('--backends', nargs='+', choices=list(BOARD_BACKENDS), default=None,
+                        help='board backends, all by default')
+    parser.add_argument('--operations', nargs='+', choices=list(OPERATIONS), default=None,
+                        help='operations, all by default')
+    parser.add_argument('--no-interface', action='store_true',
+                        help="don't measure Interface.draw_new_board and the first frame")
+    parser.add_argument('--no-startup', action='store_true',
+                        help="don't measure imports and the first frame in new processes")
+    parser.add_argument('-t', '--min-time', type=float, default=0.2, help='min seconds of one run of a benchmark')
+    parser.add_argument('-o', '--output', help='file to save results as JSON, it can be a baseline later')
+    parser.add_argument('-b', '--baseline',
+                        help='file with results of an earlier run to compare with, then startup code, that fails '
+                             'in a new process, is an error')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='allowed relative slowdown or memory growth against the baseline')
+    return parser.parse_args()
+
+
+def print_result(result: dict) -> None:
+    """
+    Prints one result in a line
+    :param result: result of a benchmark
+    :return: None
+    """
+    memory = '' if result['memory_bytes'] is None else '  {:>12,} bytes'.format(result['memory_bytes'])
+    print('{:<40} {:>14,.0f} ops/sec{}'.format(result['name'], result['ops_per_sec'], memory))
+    sys.stdout.flush()
+
+
+if __name__ == '__main__':
+
+    logging.basicConfig(
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s - %(funcName)s',
+        level=logging.WARNING
+    )
+
+    args = parse_args()
+    results = run(args.sizes, args.conditions, args.backends, args.operations, not args.no_interface,
+                  args.min_time, not args.no_startup, bool(args.baseline), print_result)
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)
+    if args.baseline:
+        with open(args.baseline) as file:
+            changes = compare(results, json.load(file), args.tolerance)
+        print()
+        for change in changes:
+            print('{:<40} {:>7.2f}x{}'.format(change['name'], change['ratio'],
+                                             '  REGRESSION' if change['regression'] else ''))
+        regressions = [change for change in changes if change['regression']]
+        if regressions:
+            print('{} regressions against {}'.format(len(regressions), args.baseline))
+            sys.exit(1)
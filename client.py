@@ -0,0 +1,36 @@
+import argparse
+import asyncio
+import json
+import logging
+
+from network_classes.client import load_test
+from network_classes.protocol import DEFAULT_PORT
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parses command line arguments of the load test client
+    :return: namespace with arguments
+    """
+    parser = argparse.ArgumentParser(description='Plays random games on the game server by many pairs of clients')
+    parser.add_argument('--host', default='127.0.0.1', help='address of the server')
+    parser.add_argument('-p', '--port', type=int, default=DEFAULT_PORT, help='port of the server')
+    parser.add_argument('-n', '--pairs', type=int, default=100, help='number of pairs of clients, playing at once')
+    parser.add_argument('-g', '--games', type=int, default=10, help='number of games of every pair')
+    parser.add_argument('-s', '--size', type=int, default=10, help='size of the board')
+    parser.add_argument('-c', '--condition', type=int, default=5, help='win condition of the board')
+    parser.add_argument('--seed', type=int, default=0, help='base seed of the moves')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+
+    logging.basicConfig(
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s - %(funcName)s',
+        level=logging.WARNING
+    )
+
+    args = parse_args()
+    summary = asyncio.run(load_test(args.host, args.port, args.pairs, args.games, args.size, args.condition,
+                                    args.seed))
+    print(json.dumps(summary, indent=2))
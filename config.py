@@ -16,8 +16,17 @@ footer_height = 0.05
 small_game_size = 3
 big_game_size = 10
 
+vs_computer = False  # C key switches it in the game
+computer_time_limit = 0.1  # seconds for a move of computer in big game
+solved_dir = './solved'  # solved position databases, made by solve.py
+
+dirty_rendering = True  # redraw the window only after changes: marks, status text, hover of buttons
+frame_rate = 60  # frames per second, while something changes
+idle_frame_rate = 10  # frames per second, while nothing changes, None for no cap
+
 x_pic = './images/x.png'
 o_pic = './images/o.png'
+click_sound = './images/rockHit2.wav'
 button_width = 200
 button_space = 20
 
@@ -1 +1,14 @@
-from .game import Game
+from importlib import import_module
+
+# Classes are imported on first access, so importing a single module of the package,
+# like game_classes.board, doesn't import the rest of it
+_EXPORTS = {'Game': '.game'}
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(' '.join(['module', __name__, 'has no attribute', name]))
+    value = getattr(import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
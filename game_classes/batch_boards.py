@@ -0,0 +1,97 @@
+import logging
+from typing import Iterable, Tuple
+
+import numpy as np
+
+from game_classes.bit_board import BitBoard
+from game_classes.board import Board
+
+EMPTY = 0
+MARK_CODES = {'x': 1, 'o': 2}
+BOTH = -1  # winner code of a board, where both players have win combinations
+
+
+def board_to_array(board: Board) -> np.ndarray:
+    """
+    Returns position of the board as an int8 array: EMPTY for empty cells,
+        MARK_CODES values for marks
+    :param board: board of any backend
+    :return: array of shape (size, size)
+    """
+    array = np.zeros((board.size, board.size), dtype=np.int8)
+    for name, mark in board.marked_cells():
+        array[name] = MARK_CODES[mark]
+    return array
+
+
+def boards_to_array(boards: Iterable[Board]) -> np.ndarray:
+    """
+    Stacks positions of boards of the same size into one array
+    :param boards: boards of any backend
+    :return: int8 array of shape (batch, size, size)
+    """
+    return np.stack([board_to_array(board) for board in boards])
+
+
+def array_to_board(array: np.ndarray, condition: int, board_class: type = BitBoard) -> Board:
+    """
+    Creates a board with the position of the array
+    :param array: int8 array of shape (size, size) with EMPTY and MARK_CODES values
+    :param condition: win condition of the board
+    :param board_class: Board or its subclass
+    :return: new board
+    """
+    marks = {code: mark for mark, code in MARK_CODES.items()}
+    board = board_class(array.shape[0], condition)
+    for index_1, index_2 in zip(*np.nonzero(array)):
+        board.put_mark((int(index_1), int(index_2)), marks[int(array[index_1, index_2])])
+    return board
+
+
+def line_windows(stones: np.ndarray, condition: int) -> np.ndarray:
+    """
+    Finds lines of condition stones along the four directions of Board.DIRECTIONS.
+        Windows of condition cells are checked for all boards at once: a window is
+        full, if the stone array and its condition - 1 shifted slices all have
+        a stone at its first cell
+    :param stones: bool array of shape (batch, size, size)
+    :param condition: number of consecutive stones
+    :return: bool array of shape (batch,), True for boards with a line
+    """
+    batch, size = stones.shape[0], stones.shape[1]
+    condition = max(1, min(condition, size))
+    span = size - condition + 1
+    found = np.zeros(batch, dtype=bool)
+    # (rows, columns) of the first slice and the step of the slices for every direction
+    for (row, column), (step_1, step_2) in (((0, 0), (0, 1)), ((0, 0), (1, 0)),
+                                            ((0, 0), (1, 1)), ((0, condition - 1), (1, -1))):
+        rows = size if step_1 == 0 else span
+        columns = size if step_2 == 0 else span
+        window = np.ones((batch, rows, columns), dtype=bool)
+        for shift in range(condition):
+            first_1 = row + shift * step_1
+            first_2 = column + shift * step_2
+            window &= stones[:, first_1:first_1 + rows, first_2:first_2 + columns]
+        found |= window.reshape(batch, -1).any(axis=1)
+    return found
+
+
+def batch_check_win(boards: np.ndarray, condition: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Checks positions of many boards at once, like Board.check_win_combo checks one board
+    :param boards: int8 array of shape (batch, size, size) with EMPTY and MARK_CODES values
+    :param condition: win condition of the boards
+    :return: (over, winners): bool array, True if the game is over, and int8 array
+        with the MARK_CODES value of the winner, EMPTY for a drawn or unfinished game
+        and BOTH if both players have win combinations
+    """
+    if boards.ndim != 3 or boards.shape[1] != boards.shape[2]:
+        logging.error(' '.join(['Attempt to check boards of shape', str(boards.shape)]))
+        raise ValueError('Boards must be an array of shape (batch, size, size)')
+    winners = np.full(boards.shape[0], EMPTY, dtype=np.int8)
+    for code in MARK_CODES.values():
+        wins = line_windows(boards == code, condition)
+        winners[wins & (winners != EMPTY)] = BOTH
+        winners[wins & (winners == EMPTY)] = code
+    full = (boards != EMPTY).reshape(boards.shape[0], -1).all(axis=1)
+    return (winners != EMPTY) | full, winners
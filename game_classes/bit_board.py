@@ -0,0 +1,252 @@
+import logging
+from collections.abc import Mapping
+from typing import Iterator, Tuple
+
+from game_classes.board import Board
+
+
+class BitCell:
+    """
+    Lightweight cell view for BitBoard and SparseBoard. Keeps no mark itself,
+        reads and writes it through the board
+        :param board: board, the cell belongs to
+        :param name: name of the cell tuple(index_1, index_2)
+
+    :prop name: cell name, tuple(index_1, index_2)
+
+    :method set_mark: sets a mark (str) in the empty cell, or None for empty.
+            If try to set a new mark in not empty cell, then returns False
+    :method get_mark: returns mark, placed into cell; or ' ' if the cell is empty
+    """
+    __slots__ = ('board', 'name')
+
+    def __init__(self, board: 'BitBoard', name: Tuple[int, int]) -> None:
+        self.board = board
+        self.name = name
+
+    def set_mark(self, mark: str) -> bool:
+        """
+        Sets mark in the cell on the board
+        :param mark: mark, that will be set, None for empty
+        :return: True, if mark was set successfully
+        """
+        return self.board.set_cell_mark(self.name, mark)
+
+    def get_mark(self) -> str:
+        """
+        Getter for mark of the cell
+        :return: mark, ' ' if there's no mark yet
+        """
+        return self.board.get_mark(self.name)
+
+
+class BitCells(Mapping):
+    """
+    Read-only mapping {(index_1, index_2): BitCell}, that creates cell views on demand
+        :param board: board, the cells belong to
+    """
+    __slots__ = ('board',)
+
+    def __init__(self, board: 'BitBoard') -> None:
+        self.board = board
+
+    def __getitem__(self, name: Tuple[int, int]) -> BitCell:
+        if not self.board.is_on_board(name):
+            raise KeyError(name)
+        return BitCell(self.board, name)
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        size = self.board.size
+        for index_1 in range(size):
+            for index_2 in range(size):
+                yield index_1, index_2
+
+    def __len__(self) -> int:
+        return self.board.size ** 2
+
+    def __contains__(self, name) -> bool:
+        return self.board.is_on_board(name)
+
+
+class BitBoard(Board):
+    """
+    Board, that keeps marks of every player as an integer bitboard instead of
+        a dictionary of Cell objects. Cell (index_1, index_2) is the bit
+        index_1 * (size + 1) + index_2, the extra column stays empty and
+        stops shifted lines from wrapping to the next row, so no masks of
+        lines are needed
+        :param size: size of a new board
+        :param condition: win condition, number of consecutive cells
+            one needs to mark
+
+    :prop size: size of the board
+    :prop condition: condition for win, number of consecutive cells
+    :prop filled_cells: number of non-empty cells on the board
+    :prop cells: mapping of cell views {(index_1, index_2): BitCell}
+    :prop zobrist: 64-bit Zobrist hash of the position, updated on every move and undo
+    :prop canonical_zobrist: hash of the position, same for all its rotations and reflections
+    :prop patterns: index of line patterns, kept after track_patterns call, else None
+
+    :method is_on_board: checks if the name belongs to a cell of the board
+    :method get_mark: returns mark of the cell with given name
+    :method mark_bits: returns bitboard of the given mark
+    :method set_cell_mark: sets or clears a mark without counting filled cells
+    :method put_mark: sets mark in the empty cell and counts it as filled
+    :method put_mark_trusted: sets mark in the cell, known to be empty, without checks
+    :method remove_mark: clears the marked cell, undoing put_mark
+    :method reset: clears the board in place for a new game
+    :method track_patterns: starts keeping index of line patterns on every move and undo
+    :method track_candidates: starts keeping set of empty cells near marks on every move and undo
+    :method check_win_combo: check if any win combination appeared, or
+            if the game is over because all cells are filled
+    """
+    __slots__ = ('__width', '__marks', '__occupied', '__full', '__view', '__windows')
+
+    def _create_cells(self) -> None:
+        """
+        Creates empty bitboards and masks of the windows around a cell
+        :return: None
+        """
+        self.__width = self.size + 1
+        self.__marks = dict()  # {mark: bitboard}
+        self.__occupied = 0
+        self.__full = 0
+        for index_1 in range(self.size):
+            self.__full |= ((1 << self.size) - 1) << (index_1 * self.__width)
+        self.__view = BitCells(self)
+        # {direction shift: mask of 2 * condition - 1 cells along the direction}, for rows,
+        # columns and both diagonals
+        self.__windows = {shift: sum(1 << (step * shift) for step in range(2 * self.condition - 1))
+                          for shift in (1, self.__width, self.__width + 1, self.__width - 1)}
+        logging.debug(' '.join(['Created bitboard', str(self.size), 'x', str(self.size)]))
+
+    @property
+    def cells(self) -> BitCells:
+        """
+        Getter for property cells
+        :return: mapping of cell views {name: BitCell}
+        """
+        return self.__view
+
+    def get_mark(self, cell_name: Tuple[int, int]) -> str:
+        """
+        Returns mark of the cell with given name
+        :param cell_name: tuple of indexes
+        :return: mark, ' ' if there's no mark yet
+        """
+        bit = 1 << (cell_name[0] * self.__width + cell_name[1])
+        if self.__occupied & bit:
+            for mark, bits in self.__marks.items():
+                if bits & bit:
+                    return mark
+        return ' '
+
+    def mark_bits(self, mark: str) -> int:
+        """
+        Returns bitboard of the given mark
+        :param mark: players' mark, ' ' for empty cells
+        :return: int with bits set for every cell with the mark
+        """
+        if mark == ' ':
+            return self.__full & ~self.__occupied
+        return self.__marks.get(mark, 0)
+
+    def set_cell_mark(self, cell_name: Tuple[int, int], mark: str) -> bool:
+        """
+        Sets mark in the empty cell, or clears the cell if mark is None.
+            Doesn't change filled_cells, same as Cell.set_mark
+        :param cell_name: tuple of indexes
+        :param mark: mark, that will be set, None for empty
+        :return: True, if mark was set successfully
+        """
+        bit = 1 << (cell_name[0] * self.__width + cell_name[1])
+        if mark is None:
+            for name in self.__marks:
+                self.__marks[name] &= ~bit
+            self.__occupied &= ~bit
+            return True
+        if self.__occupied & bit:
+            return False
+        self.__marks[mark] = self.__marks.get(mark, 0) | bit
+        self.__occupied |= bit
+        return True
+
+    def _clear_all(self) -> None:
+        """
+        Clears all marked cells at once. Keeps the rest of the board state as is
+        :return: None
+        """
+        self.__marks = dict()
+        self.__occupied = 0
+
+    def _place(self, cell_name: Tuple[int, int], mark: str) -> bool:
+        """
+        Sets mark in the cell, if the cell exists and is empty. Keeps the rest
+            of the board state as is
+        :param cell_name: tuple of indexes
+        :param mark: mark, that will be set
+        :return: True if mark was set successfully
+        """
+        return self.is_on_board(cell_name) and self.set_cell_mark(cell_name, mark)
+
+    def _place_trusted(self, cell_name: Tuple[int, int], mark: str) -> None:
+        """
+        Sets mark in the cell, that is known to be on the board and empty.
+            Keeps the rest of the board state as is
+        :param cell_name: tuple of indexes
+        :param mark: mark, that will be set
+        :return: None
+        """
+        bit = 1 << (cell_name[0] * self.__width + cell_name[1])
+        self.__marks[mark] = self.__marks.get(mark, 0) | bit
+        self.__occupied |= bit
+
+    def _clear(self, cell_name: Tuple[int, int]) -> str:
+        """
+        Clears the cell. Keeps the rest of the board state as is
+        :param cell_name: tuple of indexes
+        :return: removed mark, ' ' if the cell was empty already
+        """
+        mark = self.get_mark(cell_name)
+        if mark != ' ':
+            bit = 1 << (cell_name[0] * self.__width + cell_name[1])
+            self.__marks[mark] &= ~bit
+            self.__occupied &= ~bit
+        return mark
+
+    def check_win_combo(self, cell: BitCell) -> Tuple[bool, str]:
+        """
+        Checks if there is a win combination on the board, or if all cells are filled.
+        Looks only at the cells not further than condition - 1 from given cell.
+        Every direction is tested with shift-and-mask on the window shifted down
+        to the low bits: after condition - 1 steps of bits &= bits >> shift
+        only the starts of long enough runs stay set. A run, that wraps to another
+        row, passes the empty extra column, so it breaks there
+        :param cell: last marked cell
+        :return: True if the game is over and the winner as his mark. If it's drawn game,
+        second value will be '-'
+        """
+        cell_name = cell.name
+        mark = cell.get_mark()
+        if self.condition == 0:
+            return True, mark
+        bits = self.mark_bits(mark)
+        index = cell_name[0] * self.__width + cell_name[1]
+        for shift, window in self.__windows.items():
+            start = index - (self.condition - 1) * shift
+            if start >= 0:
+                run = (bits >> start) & window
+            else:
+                run = bits & (window >> -start)
+            for _ in range(self.condition - 1):
+                if not run:
+                    break
+                run &= run >> shift
+            if run:
+                logging.debug(' '.join(['Win! Line with shift', str(shift)]))
+                return True, mark
+
+        if self.filled_cells == self.size ** 2:
+            logging.debug(''.join(['Drawn game!']))
+            return True, '-'
+        return False, '-'
@@ -1,7 +1,10 @@
 import logging
-from typing import Dict, Tuple
+from typing import Dict, Iterator, Optional, Tuple
 
+from game_classes.candidates import CandidateSet
 from game_classes.cell import Cell
+from game_classes.patterns import DIRECTIONS, PatternIndex
+from game_classes.zobrist import ZobristHash
 
 
 class Board:
@@ -15,15 +18,41 @@ class Board:
     :prop condition: condition for win, number of consecutive cells
     :prop filled_cells: number of non-empty cells on the board
     :prop cells: dictionary of cells {(index_1, index_2): Cell}
+    :prop zobrist: 64-bit Zobrist hash of the position, updated on every move and undo
+    :prop canonical_zobrist: hash of the position, same for all its rotations and reflections
+    :prop patterns: index of line patterns, kept after track_patterns call, else None
 
+    :method is_on_board: checks if the name belongs to a cell of the board
+    :method get_mark: returns mark of the cell with given name
+    :method marked_cells: yields names and marks of the non-empty cells
+    :method put_mark: sets mark in the empty cell and counts it as filled
+    :method put_mark_trusted: sets mark in the cell, known to be empty, without checks
+    :method remove_mark: clears the marked cell, undoing put_mark
+    :method reset: clears the board in place for a new game
+    :method track_patterns: starts keeping index of line patterns on every move and undo
+    :method track_candidates: starts keeping set of empty cells near marks on every move and undo
     :method check_win_combo: check if any win combination appeared, or
             if the game is over because all cells are filled
     """
+    __slots__ = ('__size', '__condition', '__filled_cells', '__zobrist', '__patterns', '__candidates',
+                 '__trackers', '__cells')
+    DIRECTIONS = DIRECTIONS
 
     def __init__(self, size: int, condition: int) -> None:
         self.size = size
         self.condition = condition
         self.filled_cells = 0
+        self.__zobrist = ZobristHash(self.size)
+        self.__patterns = None
+        self.__candidates = dict()  # {radius: CandidateSet}
+        self.__trackers = []  # indexes, updated by put_mark and remove_mark
+        self._create_cells()
+
+    def _create_cells(self) -> None:
+        """
+        Creates empty cells of the board
+        :return: None
+        """
         self.__cells = dict()
         for index_1 in range(self.size):
             for index_2 in range(self.size):
@@ -112,45 +141,222 @@ class Board:
         """
         self.__cells[cell.name] = cell
 
+    @property
+    def zobrist(self) -> int:
+        """
+        Getter for zobrist property
+        :return: 64-bit Zobrist hash of the position
+        """
+        return self.__zobrist.value
+
+    @property
+    def canonical_zobrist(self) -> int:
+        """
+        Getter for canonical_zobrist property. The first read starts keeping hashes
+            of the symmetric images on every move and undo
+        :return: 64-bit hash of the canonical form of the position among its 8 symmetric images
+        """
+        self.__zobrist.track_images(self.marked_cells())
+        return self.__zobrist.canonical
+
+    @property
+    def patterns(self) -> Optional[PatternIndex]:
+        """
+        Getter for patterns property
+        :return: index of line patterns, None if it's not kept
+        """
+        return self.__patterns
+
+    def track_patterns(self) -> PatternIndex:
+        """
+        Starts keeping index of line patterns: runs of marks with their threat types
+            and cells, that win right now. The index is built for the current position
+            once and then updated on every move and undo
+        :return: index of line patterns
+        """
+        if self.__patterns is None:
+            self.__patterns = PatternIndex(self.size, self.condition)
+            self._track(self.__patterns)
+        return self.__patterns
+
+    def track_candidates(self, radius: int = 2) -> CandidateSet:
+        """
+        Starts keeping set of empty cells not further than radius from any mark.
+            The set is built for the current position once and then updated on every
+            move and undo
+        :param radius: max distance from a mark
+        :return: set of candidate cells
+        """
+        if radius not in self.__candidates:
+            self.__candidates[radius] = CandidateSet(self.size, radius)
+            self._track(self.__candidates[radius])
+        return self.__candidates[radius]
+
+    def _track(self, tracker) -> None:
+        """
+        Adds the current marks to the tracker and calls its put and remove methods
+            on every later move and undo
+        :param tracker: object with put(cell_name, mark) and remove(cell_name, mark) methods
+        :return: None
+        """
+        for name, mark in self.marked_cells():
+            tracker.put(name, mark)
+        self.__trackers.append(tracker)
+
+    def marked_cells(self) -> Iterator[Tuple[Tuple[int, int], str]]:
+        """
+        Yields names and marks of the non-empty cells
+        :return: generator of (name, mark) pairs
+        """
+        for name in self.cells:
+            mark = self.get_mark(name)
+            if mark != ' ':
+                yield name, mark
+
+    def is_on_board(self, name: Tuple[int, int]) -> bool:
+        """
+        Checks if the name belongs to a cell of the board
+        :param name: tuple of indexes
+        :return: True if there is such cell
+        """
+        return (type(name) == tuple and len(name) == 2
+                and type(name[0]) == int and type(name[1]) == int
+                and 0 <= name[0] < self.size and 0 <= name[1] < self.size)
+
+    def get_mark(self, cell_name: Tuple[int, int]) -> str:
+        """
+        Returns mark of the cell with given name
+        :param cell_name: tuple of indexes
+        :return: mark, ' ' if there's no mark yet
+        """
+        return self.cells[cell_name].get_mark()
+
+    def put_mark(self, cell_name: Tuple[int, int], mark: str) -> bool:
+        """
+        Sets mark in the cell with given name, if the cell exists and is empty
+        :param cell_name: tuple of indexes
+        :param mark: mark, that will be set
+        :return: True if mark was set successfully
+        """
+        if mark is None or not self._place(cell_name, mark):
+            return False
+        self.filled_cells += 1
+        self.__zobrist.toggle(cell_name, mark)
+        for tracker in self.__trackers:
+            tracker.put(cell_name, mark)
+        return True
+
+    def remove_mark(self, cell_name: Tuple[int, int]) -> str:
+        """
+        Clears the marked cell with given name, undoing put_mark
+        :param cell_name: tuple of indexes
+        :return: removed mark, ' ' if the cell was empty already
+        """
+        mark = self._clear(cell_name)
+        if mark != ' ':
+            self.filled_cells -= 1
+            self.__zobrist.toggle(cell_name, mark)
+            for tracker in self.__trackers:
+                tracker.remove(cell_name, mark)
+        return mark
+
+    def put_mark_trusted(self, cell_name: Tuple[int, int], mark: str) -> None:
+        """
+        Sets mark in the cell like put_mark, but without checks: the cell must be
+            on the board and empty, for example validated by Game.apply_moves
+        :param cell_name: tuple of indexes
+        :param mark: mark, that will be set
+        :return: None
+        """
+        self._place_trusted(cell_name, mark)
+        self.__filled_cells += 1
+        self.__zobrist.toggle(cell_name, mark)
+        for tracker in self.__trackers:
+            tracker.put(cell_name, mark)
+
+    def reset(self) -> None:
+        """
+        Clears the board in place, so it can be used for a new game without creating
+            cells again. Indexes of patterns and candidates are dropped, like
+            on a new board
+        :return: None
+        """
+        if self.filled_cells:
+            self._clear_all()
+            self.filled_cells = 0
+        self.__zobrist.reset()
+        self.__patterns = None
+        self.__candidates = dict()
+        self.__trackers = []
+
+    def _clear_all(self) -> None:
+        """
+        Clears all marked cells. Keeps the rest of the board state as is
+        :return: None
+        """
+        for name, _ in list(self.marked_cells()):
+            self._clear(name)
+
+    def _place(self, cell_name: Tuple[int, int], mark: str) -> bool:
+        """
+        Sets mark in the cell, if the cell exists and is empty. Keeps the rest
+            of the board state as is
+        :param cell_name: tuple of indexes
+        :param mark: mark, that will be set
+        :return: True if mark was set successfully
+        """
+        cell = self.cells.get(cell_name)
+        if cell is None or cell.get_mark() != ' ':
+            return False
+        return cell.set_mark(mark)
+
+    def _place_trusted(self, cell_name: Tuple[int, int], mark: str) -> None:
+        """
+        Sets mark in the cell, that is known to be on the board and empty.
+            Keeps the rest of the board state as is
+        :param cell_name: tuple of indexes
+        :param mark: mark, that will be set
+        :return: None
+        """
+        self.cells[cell_name].set_mark_trusted(mark)
+
+    def _clear(self, cell_name: Tuple[int, int]) -> str:
+        """
+        Clears the cell. Keeps the rest of the board state as is
+        :param cell_name: tuple of indexes
+        :return: removed mark, ' ' if the cell was empty already
+        """
+        cell = self.cells[cell_name]
+        mark = cell.get_mark()
+        if mark != ' ':
+            cell.set_mark(None)
+        return mark
+
     def check_win_combo(self, cell: Cell) -> Tuple[bool, str]:
         """
         Checks if there is a win combination on the board, or if all cells are filled.
-        Looks only near given cell
+        Looks only near given cell: a win can use only cells not further than
+        condition - 1 from it, so every direction costs O(condition), not O(size)
         :param cell: last marked cell
         :return: True if the game is over and the winner as his mark. If it's drawn game,
         second value will be '-'
         """
         cell_name = cell.name
         mark = cell.get_mark()
-        horizontal = vertical = 0
-        diagonal_right = diagonal_left = 0
-        delta = cell_name[1] - cell_name[0]
-        sum_index = cell_name[0] + cell_name[1]
-        for index_1 in range(self.size):
-            if self.cells[cell_name[0], index_1].get_mark() == mark:
-                horizontal += 1
-            else:
-                horizontal = 0
-            if self.cells[index_1, cell_name[1]].get_mark() == mark:
-                vertical += 1
-            else:
-                vertical = 0
-            if (0 <= index_1 + delta < self.size) and (
-                    self.cells[index_1, index_1 + delta].get_mark() == mark):
-                diagonal_right += 1
-            else:
-                diagonal_right = 0
-            if (0 <= sum_index - index_1 < self.size) and (
-                    self.cells[index_1, sum_index - index_1].get_mark() == mark):
-                diagonal_left += 1
-            else:
-                diagonal_left = 0
-            if max(horizontal, vertical, diagonal_right, diagonal_left) >= self.condition:
-                logging.debug(' '.join(['Win!',
-                                        'horizontal', str(horizontal),
-                                        'vertical', str(vertical),
-                                        'diagonal_right', str(diagonal_right),
-                                        'diagonal_left', str(diagonal_left)]))
+        reach = self.condition - 1
+        for step_1, step_2 in self.DIRECTIONS:
+            line = 1
+            for sign in (1, -1):
+                index_1, index_2 = cell_name
+                for _ in range(reach):
+                    index_1 += sign * step_1
+                    index_2 += sign * step_2
+                    neighbour = self.cells.get((index_1, index_2))
+                    if neighbour is None or neighbour.get_mark() != mark:
+                        break
+                    line += 1
+            if line >= self.condition:
+                logging.debug(' '.join(['Win!', str(line), 'in line along', str((step_1, step_2))]))
                 return True, mark
 
         if self.filled_cells == len(self.cells):
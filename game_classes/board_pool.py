@@ -0,0 +1,62 @@
+import logging
+from collections import OrderedDict
+from typing import Tuple
+
+from game_classes.board import Board
+
+
+class BoardPool:
+    """
+    Small pool of boards, that can be used again. A board is kept per
+        (size, condition, board class), the least recently used ones are dropped,
+        when there are more than max_boards of them
+        :param max_boards: max number of kept boards
+
+    :method acquire: returns an empty board, taken from the pool or created
+    :method release: puts the board into the pool
+    """
+
+    def __init__(self, max_boards: int = 4) -> None:
+        self.max_boards = max_boards
+        self.__boards: OrderedDict = OrderedDict()  # {(size, condition, board class): Board}
+
+    def __len__(self) -> int:
+        return len(self.__boards)
+
+    def acquire(self, size: int, condition: int, board_class: type = Board) -> Board:
+        """
+        Returns an empty board: the kept one, cleared in place, or a new one
+        :param size: size of the board
+        :param condition: win condition of the board, as the board keeps it
+        :param board_class: Board or its subclass
+        :return: board, that is not in the pool any more
+        """
+        board = self.__boards.pop(self._key(size, condition, board_class), None)
+        if board is None:
+            return board_class(size, condition)
+        board.reset()
+        logging.debug(' '.join(['Board', str(size), 'x', str(size), 'was taken from the pool']))
+        return board
+
+    def release(self, board: Board) -> None:
+        """
+        Puts the board into the pool. The board mustn't be used after it
+        :param board: board, that is not needed any more
+        :return: None
+        """
+        key = self._key(board.size, board.condition, type(board))
+        self.__boards[key] = board
+        self.__boards.move_to_end(key)
+        while len(self.__boards) > self.max_boards:
+            self.__boards.popitem(last=False)
+
+    @staticmethod
+    def _key(size: int, condition: int, board_class: type) -> Tuple[int, int, type]:
+        """
+        Returns the key of boards, that can replace each other
+        :param size: size of the board
+        :param condition: win condition of the board
+        :param board_class: Board or its subclass
+        :return: (size, condition, board class)
+        """
+        return size, condition, board_class
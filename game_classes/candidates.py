@@ -0,0 +1,85 @@
+from typing import Dict, Iterator, List, Set, Tuple
+
+
+class CandidateSet:
+    """
+    Set of empty cells not further than radius from any mark on the board
+        (a square of (2 * radius + 1) ** 2 cells around every mark), updated on every move
+        and undo. Sensible moves almost always lie there, so move generators can iterate
+        it instead of all empty cells of the board
+        :param size: size of the board
+        :param radius: max distance from a mark
+
+    :prop size: size of the board
+    :prop radius: max distance from a mark
+
+    :method put: adds the mark in the cell
+    :method remove: removes the mark in the cell
+    """
+
+    def __init__(self, size: int, radius: int = 2) -> None:
+        self.size = size
+        self.radius = radius
+        self.__near: Dict[Tuple[int, int], int] = dict()  # {cell: number of marks around}
+        self.__marked: Set[Tuple[int, int]] = set()
+        self.__cells: Set[Tuple[int, int]] = set()
+        self.__around: Dict[Tuple[int, int], List[Tuple[int, int]]] = dict()  # cache of _around
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        return iter(self.__cells)
+
+    def __len__(self) -> int:
+        return len(self.__cells)
+
+    def __contains__(self, cell_name: Tuple[int, int]) -> bool:
+        return cell_name in self.__cells
+
+    def put(self, cell_name: Tuple[int, int], mark: str) -> None:
+        """
+        Adds the mark in the cell: the cell stops being a candidate,
+            empty cells around become candidates
+        :param cell_name: tuple of indexes
+        :param mark: mark in the cell
+        :return: None
+        """
+        marked, cells, counts = self.__marked, self.__cells, self.__near
+        marked.add(cell_name)
+        cells.discard(cell_name)
+        for near in self._around(cell_name):
+            counts[near] = counts.get(near, 0) + 1
+            if near not in marked:
+                cells.add(near)
+
+    def remove(self, cell_name: Tuple[int, int], mark: str) -> None:
+        """
+        Removes the mark in the cell: cells without other marks around
+            stop being candidates, the cell becomes a candidate, if there are marks around
+        :param cell_name: tuple of indexes
+        :param mark: mark, that was in the cell
+        :return: None
+        """
+        cells, counts = self.__cells, self.__near
+        self.__marked.discard(cell_name)
+        for near in self._around(cell_name):
+            counts[near] -= 1
+            if not counts[near]:
+                del counts[near]
+                cells.discard(near)
+        if cell_name in self.__near:
+            self.__cells.add(cell_name)
+
+    def _around(self, cell_name: Tuple[int, int]) -> List[Tuple[int, int]]:
+        """
+        Returns cells of the board not further than radius from the cell, including it.
+            Lists are cached for cells, that were marked once
+        :param cell_name: tuple of indexes
+        :return: list of cell names
+        """
+        around = self.__around.get(cell_name)
+        if around is None:
+            index_1, index_2 = cell_name
+            around = [(near_1, near_2)
+                      for near_1 in range(max(0, index_1 - self.radius), min(self.size, index_1 + self.radius + 1))
+                      for near_2 in range(max(0, index_2 - self.radius), min(self.size, index_2 + self.radius + 1))]
+            self.__around[cell_name] = around
+        return around
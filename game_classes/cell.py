@@ -13,9 +13,11 @@ class Cell:
 
     :method set_mark: sets a mark (str) in the empty cell, or None for empty.
             If try to set a new mark in not empty cell, then returns False
+    :method set_mark_trusted: sets a mark in the cell, known to be empty, without checks and logs
 
     :method get_mark: returns mark, placed into cell; or ' ' if the cell is empty
     """
+    __slots__ = ('__name', '__mark')
 
     def __init__(self, name: Tuple[int, int]) -> None:
         self.name = name
@@ -59,6 +61,14 @@ class Cell:
                                    'there is already', self.get_mark()]))
             return False
 
+    def set_mark_trusted(self, mark: str) -> None:
+        """
+        Sets mark in the cell, that is known to be empty, for example by Game.apply_moves
+        :param mark: mark, that will be set
+        :return: None
+        """
+        self.__mark = mark
+
     def get_mark(self) -> str:
         """
         Getter for mark property
@@ -1,33 +1,64 @@
 import logging
 import random
-from typing import List, Tuple
+from typing import List, Optional, Sequence, Tuple
 
+from game_classes.bit_board import BitBoard
 from game_classes.board import Board
+from game_classes.board_pool import BoardPool
 from game_classes.player import Player
+from game_classes.record import GameRecord
+from game_classes.sparse_board import SparseBoard
+
+BOARD_BACKENDS = {'cells': Board, 'bitboard': BitBoard, 'sparse': SparseBoard}
 
 
 class Game:
     """
     Class for a game
         :param players: list of players for a new game
+        :param recording: keep record of every game, started by start_game
+        :param board_pool: pool of boards for create_board, a new pool by default
 
     :prop board: a board, assigned to the game
     :prop state: current state [0 - the game can continue,
                 1 - if there is a win combination on the board and game is stopped]
     :prop curr_turn: index of a player, whose makes a move now
     :prop players: list of players for the game
+    :prop winner: result of the game: None while it continues, mark of the winner
+                or '-' for drawn game
+    :prop moves: names of the marked cells in order of the moves
+    :prop undone_moves: names of the cells, taken back by unmake_move, that can be redone
+    :prop record: GameRecord of the current game, if recording is on, else None
+    :prop board_pool: pool, that keeps boards of other sizes for later games
 
-    :method create_board: creates a new board of given size
+    :method create_board: prepares an empty board of given size: clears the current one,
+                takes one from the pool or creates a new one
     :method single_turn: checks if the cell is empty and makes a move by given player
-    :method start_game: creates new board, zeroes game state, randomly assigns marks
-                to players and returns index of a first one
+    :method make_move: makes a move by the current player, checks the result
+                and passes the turn
+    :method unmake_move: takes back the last move
+    :method redo_move: makes again the last move, taken back by unmake_move
+    :method apply_moves: makes a sequence of moves, validated once, without checks of every move
+    :method start_game: prepares empty board, zeroes game state, assigns marks to players,
+                randomly or by the given first player, and returns index of a first one
+    :method reset: starts a new game on the current board, cleared in place
+    :method load_record: starts the game of the record and makes its moves
     """
+    __slots__ = ('__board', '__state', '__players', '__curr_turn', '__winner', 'recording', 'record',
+                 'board_pool', '__moves', '__undone_moves')
 
-    def __init__(self, players: List[Player]) -> None:
+    def __init__(self, players: List[Player], recording: bool = False,
+                 board_pool: Optional[BoardPool] = None) -> None:
         self.board = None
         self.state = 0
         self.players = players
         self.curr_turn = None
+        self.winner = None
+        self.recording = recording
+        self.record: Optional[GameRecord] = None
+        self.board_pool = board_pool if board_pool is not None else BoardPool()
+        self.__moves = []
+        self.__undone_moves = []
 
     @property
     def board(self) -> Board:
@@ -87,10 +118,10 @@ class Game:
                                     'players']))
             raise ValueError('Game can be created only for 2 players')
         for item in players:
-            if type(item) != Player:
+            if not isinstance(item, Player):
                 logging.error(' '.join(['List of players contains', str(type(item)),
                                         'type']))
-                raise ValueError('Players list should contain only values of Player class')
+                raise ValueError('Players list should contain only values of Player class or its subclasses')
         self.__players = players
 
     @property
@@ -113,49 +144,243 @@ class Game:
             raise ValueError('Index of next player is not in players list')
         self.__curr_turn = curr_turn
 
-    def create_board(self, size: int = 0, condition: int = 0) -> None:
+    @property
+    def winner(self) -> Optional[str]:
+        """
+        Getter for winner property
+        :return: None while the game continues, mark of the winner or '-' for drawn game
+        """
+        return self.__winner
+
+    @winner.setter
+    def winner(self, winner: Optional[str]) -> None:
+        """
+        Setter for winner property, if winner is not str or None raises ValueError
+        :param winner: mark of the winner, '-' for drawn game or None
+        """
+        if type(winner) != str and winner is not None:
+            logging.error(' '.join(['Attempt to set', str(type(winner)), 'as a winner of the game']))
+            raise ValueError('Winner must be a str value or None')
+        self.__winner = winner
+
+    @property
+    def moves(self) -> List[Tuple[int, int]]:
+        """
+        Getter for moves property
+        :return: names of the marked cells in order of the moves
+        """
+        return self.__moves
+
+    @property
+    def undone_moves(self) -> List[Tuple[int, int]]:
+        """
+        Getter for undone_moves property
+        :return: names of the cells, taken back by unmake_move, the last one is redone first
+        """
+        return self.__undone_moves
+
+    def create_board(self, size: int = 0, condition: int = 0, backend: str = 'cells') -> None:
         """
-        Creates new board, if size is smaller than condition, condition = size
+        Prepares an empty board, if size is smaller than condition, condition = size.
+            The current board is cleared in place, if it fits, else it goes to the pool
+            and the board is taken from the pool or created. So the previous board
+            mustn't be used after this call
         :param size: size of a new board
         :param condition: max sequence of elements for win
+        :param backend: key of BOARD_BACKENDS: 'cells' for dictionary of Cell objects,
+            'bitboard' for integer bitboards, 'sparse' for dictionary of marked cells only
         :return: None
         """
-        if condition < size:
-            self.board = Board(size, condition)
-        else:
+        if backend not in BOARD_BACKENDS:
+            logging.error(' '.join(['Attempt to create board with', str(backend), 'backend']))
+            raise ValueError('Board backend must be one of ' + ', '.join(BOARD_BACKENDS))
+        board_class = BOARD_BACKENDS[backend]
+        if condition >= size:
             condition = size
-            self.board = Board(size, size)
-        logging.debug(''.join(['Created new board ', str(size), 'x', str(size),
+        board = self.board
+        if board is not None and (board.size, board.condition, type(board)) == (size, condition, board_class):
+            board.reset()
+        else:
+            if board is not None:
+                self.board_pool.release(board)
+            self.board = self.board_pool.acquire(size, condition, board_class)
+        logging.debug(''.join(['Prepared board ', str(size), 'x', str(size),
                                ' with win condition ', str(condition)]))
 
     def single_turn(self, player: Player, cell_name: Tuple[int, int]) -> bool:
         """
-        If cell is empty sets mark
+        If cell is empty sets mark. Moves and the record are kept by make_move
         :param player: player, who makes his move
         :param cell_name: tuple of indexes
         :return: True if mark was set successfully
         """
-        cell = self.board.cells.get(cell_name, 0)
-        if cell != 0 and cell.get_mark() == ' ':
-            player.put_mark(cell)
-            self.board.filled_cells += 1
+        if self.board.put_mark(cell_name, player.mark):
             logging.debug(' '.join([player.name, 'marked', str(cell_name)]))
             return True
         logging.debug(''.join([player.name, ' wanted to mark ', str(cell_name),
                                ", but the cell isn't empty"]))
         return False
 
-    def start_game(self, size: int, condition: int) -> int:
+    def make_move(self, cell_name: Tuple[int, int]) -> bool:
+        """
+        Makes a move by the current player. If the move is successful, remembers it,
+            checks if the game is over and passes the turn to the other player.
+            A new move makes undone moves impossible to redo
+        :param cell_name: tuple of indexes
+        :return: True if the move was made
+        """
+        if not self._apply_move(cell_name):
+            return False
+        self.__undone_moves.clear()
+        return True
+
+    def unmake_move(self) -> Optional[Tuple[int, int]]:
+        """
+        Takes back the last move in constant time: clears its cell, gives the turn back
+            and reopens the game if the move has finished it
+        :return: name of the cleared cell, None if there are no moves
+        """
+        if not self.__moves:
+            return None
+        cell_name = self.__moves.pop()
+        self.board.remove_mark(cell_name)
+        if self.record is not None:
+            self.record.moves.pop()
+        self.curr_turn = 1 - self.curr_turn
+        self.state = 0
+        self.winner = None
+        self.__undone_moves.append(cell_name)
+        logging.debug(' '.join(['Move', str(cell_name), 'was taken back']))
+        return cell_name
+
+    def redo_move(self) -> Optional[Tuple[int, int]]:
+        """
+        Makes again the last move, taken back by unmake_move
+        :return: name of the marked cell, None if there is nothing to redo
+        """
+        if not self.__undone_moves:
+            return None
+        cell_name = self.__undone_moves.pop()
+        self._apply_move(cell_name)
+        return cell_name
+
+    def apply_moves(self, cell_names: Sequence[Tuple[int, int]]) -> int:
+        """
+        Trusted fast path for many moves: all moves are validated at once, then made
+            in order by the players in turn without checks of every move and of every
+            property assignment. Results are the same as of make_move for each move.
+            Moves after the end of the game are not made
+        :param cell_names: names of distinct empty cells of the board
+        :return: number of made moves
+        """
+        board = self.board
+        if board is None or self.__curr_turn is None:
+            logging.error('Attempt to apply moves before the start of the game')
+            raise ValueError('Moves can be applied only after start_game')
+        if self.__state == 1:
+            return 0
+        cell_names = list(cell_names)
+        if (not all(board.is_on_board(name) and board.get_mark(name) == ' ' for name in cell_names)
+                or len(set(cell_names)) != len(cell_names)):
+            logging.error(' '.join(['Attempt to apply moves', str(cell_names)]))
+            raise ValueError('Moves must be distinct empty cells of the board')
+        players = self.__players
+        moves = self.__moves
+        record_moves = self.record.moves if self.record is not None else None
+        turn = self.__curr_turn
+        made = 0
+        for cell_name in cell_names:
+            mark = players[turn].mark
+            board.put_mark_trusted(cell_name, mark)
+            moves.append(cell_name)
+            if record_moves is not None:
+                record_moves.append(cell_name)
+            made += 1
+            turn = 1 - turn
+            game_over, winner = board.check_win_combo(board.cells[cell_name])
+            if game_over:
+                self.__state = 1
+                self.__winner = winner
+                break
+        self.__curr_turn = turn
+        if made:
+            self.__undone_moves.clear()
+        return made
+
+    def _apply_move(self, cell_name: Tuple[int, int]) -> bool:
+        """
+        Marks the cell by the current player, remembers the move in moves and the record,
+            checks the result and passes the turn
+        :param cell_name: tuple of indexes
+        :return: True if the move was made
+        """
+        if self.state == 1 or not self.single_turn(self.players[self.curr_turn], cell_name):
+            return False
+        self.__moves.append(cell_name)
+        if self.record is not None:
+            self.record.moves.append(cell_name)
+        result_check = self.board.check_win_combo(self.board.cells[cell_name])
+        if result_check[0]:
+            self.state = 1
+            self.winner = result_check[1]
+        self.curr_turn = 1 - self.curr_turn
+        return True
+
+    def start_game(self, size: int, condition: int, backend: str = 'cells',
+                   first_player: Optional[int] = None) -> int:
         """
         Creates new game and chooses a player, who first makes a move
         :param size: size of a new board
         :param condition: max sequence of elements for win
+        :param backend: key of BOARD_BACKENDS for the new board
+        :param first_player: index of the player, who makes the first move, random if None
+        :return: first player index
+        """
+        self.create_board(size, condition, backend)
+        return self.reset(first_player)
+
+    def reset(self, first_player: Optional[int] = None) -> int:
+        """
+        Starts a new game on the current board, cleared in place without creating
+            cells again
+        :param first_player: index of the player, who makes the first move, random if None
         :return: first player index
         """
-        self.create_board(size, condition)
+        if self.board is None:
+            logging.error('Attempt to reset game without board')
+            raise ValueError('Game can be reset only after start_game')
+        self.board.reset()
         self.state = 0
-        first_player = random.randint(0, 1)
+        self.winner = None
+        self.__moves.clear()
+        self.__undone_moves.clear()
+        if first_player is None:
+            first_player = random.randint(0, 1)
+        elif first_player not in range(2):
+            logging.error(' '.join(['Attempt to start game with first player', str(first_player)]))
+            raise ValueError('Index of the first player is not in players list')
         self.players[first_player].mark = 'x'
         self.players[1 - first_player].mark = 'o'
         current_player_index = first_player
+        self.curr_turn = current_player_index
+        self.record = GameRecord(self.board.size, self.board.condition, first_player) if self.recording else None
         return current_player_index
+
+    def load_record(self, record: GameRecord, backend: str = 'cells') -> bool:
+        """
+        Starts the game of the record: the first player of the record gets 'x',
+            then moves of the record are made in order. Moves are validated at once,
+            so nothing is made, if one of them is wrong
+        :param record: record of a game
+        :param backend: key of BOARD_BACKENDS for the new board
+        :return: True if all moves of the record were made
+        """
+        self.start_game(record.size, record.condition, backend, record.first_player)
+        try:
+            made = self.apply_moves(record.moves)
+        except ValueError:
+            return False
+        if made < len(record.moves):
+            logging.error(' '.join(['Moves of the record after', str(record.moves[made - 1]), 'can not be made']))
+            return False
+        return True
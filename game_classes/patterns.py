@@ -0,0 +1,280 @@
+from typing import Dict, List, Optional, Set, Tuple
+
+DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+THREATS = ('open_two', 'closed_two', 'open_three', 'closed_three', 'open_four', 'closed_four')
+
+
+class PatternIndex:
+    """
+    Index of line patterns on a board, updated on every move and undo.
+
+    Runs are maximal lines of one player's marks in a direction. A run of
+        condition - 1 marks is a four, condition - 2 - a three, condition - 3 - a two.
+        It is open if both cells next to its ends are empty, closed if one of them is.
+        Runs, that can't grow to condition cells between the opponent's marks and
+        the edges of the board, are dead and not counted.
+    Windows are lines of condition cells. A window with condition - 1 marks of one
+        player and nothing else wins for the player by its empty cell, gapped lines
+        like "xx.xx" are found here too.
+    A move changes only runs and windows not further than condition from its cell,
+        so an update costs O(condition ** 2), queries cost O(1) to O(number of answers)
+        :param size: size of the board
+        :param condition: win condition of the board
+
+    :prop size: size of the board
+    :prop condition: number of consecutive cells for win
+
+    :method put: adds the mark in the cell to the index
+    :method remove: removes the mark in the cell from the index
+    :method winning_cells: returns cells, that win for the player right now
+    :method blocking_cells: returns cells, where the player must block the opponent
+    :method threat_counts: returns numbers of the player's runs by threat type
+    :method cell_threats: returns threat types of runs through the cell
+    """
+
+    def __init__(self, size: int, condition: int) -> None:
+        self.size = size
+        self.condition = condition
+        self.__marks: Dict[Tuple[int, int], str] = dict()
+        # {(direction, first cell): (mark, cells of the run, threat type or None)}
+        self.__runs: Dict[Tuple[Tuple[int, int], Tuple[int, int]], Tuple[str, List, Optional[str]]] = dict()
+        self.__run_starts: Dict[Tuple[Tuple[int, int], Tuple[int, int]], Tuple[int, int]] = dict()
+        self.__threats: Dict[str, Dict[str, int]] = dict()
+        # {(direction, first cell): {mark: number of marks}}, only windows with marks
+        self.__windows: Dict[Tuple[Tuple[int, int], Tuple[int, int]], Dict[str, int]] = dict()
+        # {mark: {cell: number of windows, completed by the cell}}
+        self.__wins: Dict[str, Dict[Tuple[int, int], int]] = dict()
+
+    def put(self, cell_name: Tuple[int, int], mark: str) -> None:
+        """
+        Adds the mark in the cell to the index
+        :param cell_name: tuple of indexes
+        :param mark: mark in the cell
+        :return: None
+        """
+        self._change(cell_name, mark)
+
+    def remove(self, cell_name: Tuple[int, int], mark: str) -> None:
+        """
+        Removes the mark in the cell from the index
+        :param cell_name: tuple of indexes
+        :param mark: mark, that was in the cell
+        :return: None
+        """
+        self._change(cell_name, None)
+
+    def winning_cells(self, mark: str) -> Set[Tuple[int, int]]:
+        """
+        Returns empty cells, that complete a win combination for the player
+        :param mark: mark of the player
+        :return: set of cell names
+        """
+        return set(self.__wins.get(mark, ()))
+
+    def blocking_cells(self, mark: str) -> Set[Tuple[int, int]]:
+        """
+        Returns empty cells, where the player must put a mark, not to lose
+            with the next move of the opponent
+        :param mark: mark of the player
+        :return: set of cell names
+        """
+        cells = set()
+        for other, wins in self.__wins.items():
+            if other != mark:
+                cells.update(wins)
+        return cells
+
+    def threat_counts(self, mark: str) -> Dict[str, int]:
+        """
+        Returns numbers of the player's runs by threat type
+        :param mark: mark of the player
+        :return: {threat type from THREATS: number of runs}
+        """
+        counts = dict.fromkeys(THREATS, 0)
+        counts.update(self.__threats.get(mark, {}))
+        return counts
+
+    def cell_threats(self, cell_name: Tuple[int, int]) -> Dict[Tuple[int, int], str]:
+        """
+        Returns threat types of runs through the cell
+        :param cell_name: tuple of indexes
+        :return: {direction: threat type} for directions with counted runs
+        """
+        threats = dict()
+        for direction in DIRECTIONS:
+            start = self.__run_starts.get((direction, cell_name))
+            if start is not None and self.__runs[direction, start][2] is not None:
+                threats[direction] = self.__runs[direction, start][2]
+        return threats
+
+    def _on_board(self, cell_name: Tuple[int, int]) -> bool:
+        """
+        Checks if the cell is on the board
+        :param cell_name: tuple of indexes
+        :return: True if the cell is on the board
+        """
+        return 0 <= cell_name[0] < self.size and 0 <= cell_name[1] < self.size
+
+    def _change(self, cell_name: Tuple[int, int], mark: Optional[str]) -> None:
+        """
+        Sets mark in the cell or clears it, updating runs and windows around
+        :param cell_name: tuple of indexes
+        :param mark: new mark, None for empty
+        :return: None
+        """
+        old_mark = self.__marks.get(cell_name)
+        for direction in DIRECTIONS:
+            self._forget_runs(cell_name, direction)
+        windows = self._windows_through(cell_name)
+        before = [self._window_win(window) for window in windows]
+        if mark is None:
+            del self.__marks[cell_name]
+        else:
+            self.__marks[cell_name] = mark
+        for window, win_before in zip(windows, before):
+            counts = self.__windows.setdefault(window, dict())
+            if old_mark is not None:
+                counts[old_mark] -= 1
+                if not counts[old_mark]:
+                    del counts[old_mark]
+            if mark is not None:
+                counts[mark] = counts.get(mark, 0) + 1
+            if not counts:
+                del self.__windows[window]
+            win_after = self._window_win(window)
+            if win_before != win_after:
+                self._count_win(win_before, -1)
+                self._count_win(win_after, 1)
+        for direction in DIRECTIONS:
+            self._index_runs(cell_name, direction)
+
+    def _windows_through(self, cell_name: Tuple[int, int]) -> List[Tuple[Tuple[int, int], Tuple[int, int]]]:
+        """
+        Returns all windows of condition cells on the board, containing the cell
+        :param cell_name: tuple of indexes
+        :return: list of (direction, first cell)
+        """
+        windows = []
+        last = self.condition - 1
+        for direction in DIRECTIONS:
+            for shift in range(self.condition):
+                first = (cell_name[0] - shift * direction[0], cell_name[1] - shift * direction[1])
+                end = (first[0] + last * direction[0], first[1] + last * direction[1])
+                if self._on_board(first) and self._on_board(end):
+                    windows.append((direction, first))
+        return windows
+
+    def _window_win(self, window: Tuple[Tuple[int, int], Tuple[int, int]]) -> Optional[Tuple[str, Tuple[int, int]]]:
+        """
+        Checks if the window can be completed with one mark
+        :param window: (direction, first cell)
+        :return: (mark of the player, empty cell), or None
+        """
+        counts = self.__windows.get(window)
+        if not counts or len(counts) != 1:
+            return None
+        mark, stones = next(iter(counts.items()))
+        if stones != self.condition - 1:
+            return None
+        direction, first = window
+        for shift in range(self.condition):
+            cell_name = (first[0] + shift * direction[0], first[1] + shift * direction[1])
+            if cell_name not in self.__marks:
+                return mark, cell_name
+        return None
+
+    def _count_win(self, win: Optional[Tuple[str, Tuple[int, int]]], delta: int) -> None:
+        """
+        Changes the number of windows, completed by the cell for the player
+        :param win: (mark, empty cell) or None
+        :param delta: +1 or -1
+        :return: None
+        """
+        if win is None:
+            return
+        mark, cell_name = win
+        wins = self.__wins.setdefault(mark, dict())
+        wins[cell_name] = wins.get(cell_name, 0) + delta
+        if not wins[cell_name]:
+            del wins[cell_name]
+
+    def _nearby(self, cell_name: Tuple[int, int], direction: Tuple[int, int]) -> List[Tuple[int, int]]:
+        """
+        Returns marked cells in the direction, not further than condition from the cell.
+            Only runs through these cells can change, when the cell changes
+        :param cell_name: tuple of indexes
+        :param direction: direction of the line
+        :return: list of cell names
+        """
+        return [near for near in ((cell_name[0] + shift * direction[0], cell_name[1] + shift * direction[1])
+                                  for shift in range(-self.condition, self.condition + 1))
+                if near in self.__marks]
+
+    def _forget_runs(self, cell_name: Tuple[int, int], direction: Tuple[int, int]) -> None:
+        """
+        Removes from the index runs of the direction near the cell
+        :param cell_name: tuple of indexes
+        :param direction: direction of the line
+        :return: None
+        """
+        for near in self._nearby(cell_name, direction):
+            start = self.__run_starts.get((direction, near))
+            if start is None:
+                continue
+            mark, cells, threat = self.__runs.pop((direction, start))
+            for run_cell in cells:
+                del self.__run_starts[direction, run_cell]
+            if threat is not None:
+                self.__threats[mark][threat] -= 1
+
+    def _index_runs(self, cell_name: Tuple[int, int], direction: Tuple[int, int]) -> None:
+        """
+        Adds to the index runs of the direction near the cell
+        :param cell_name: tuple of indexes
+        :param direction: direction of the line
+        :return: None
+        """
+        for near in self._nearby(cell_name, direction):
+            if (direction, near) in self.__run_starts:
+                continue
+            mark = self.__marks[near]
+            start = near
+            while self.__marks.get((start[0] - direction[0], start[1] - direction[1])) == mark:
+                start = (start[0] - direction[0], start[1] - direction[1])
+            cells = [start]
+            while self.__marks.get((cells[-1][0] + direction[0], cells[-1][1] + direction[1])) == mark:
+                cells.append((cells[-1][0] + direction[0], cells[-1][1] + direction[1]))
+            threat = self._classify(mark, cells, direction)
+            self.__runs[direction, start] = (mark, cells, threat)
+            for run_cell in cells:
+                self.__run_starts[direction, run_cell] = start
+            if threat is not None:
+                threats = self.__threats.setdefault(mark, dict())
+                threats[threat] = threats.get(threat, 0) + 1
+
+    def _classify(self, mark: str, cells: List[Tuple[int, int]], direction: Tuple[int, int]) -> Optional[str]:
+        """
+        Returns threat type of the run
+        :param mark: mark of the run
+        :param cells: cells of the run in order
+        :param direction: direction of the run
+        :return: threat type from THREATS, None for other and dead runs
+        """
+        names = {self.condition - 1: 'four', self.condition - 2: 'three', self.condition - 3: 'two'}
+        name = names.get(len(cells))
+        if name is None or len(cells) < 2:
+            return None
+        open_ends = 0
+        room = len(cells)
+        for sign, end in ((-1, cells[0]), (1, cells[-1])):
+            near = (end[0] + sign * direction[0], end[1] + sign * direction[1])
+            if self._on_board(near) and near not in self.__marks:
+                open_ends += 1
+            for _ in range(self.condition - len(cells)):
+                if not self._on_board(near) or self.__marks.get(near, mark) != mark:
+                    break
+                room += 1
+                near = (near[0] + sign * direction[0], near[1] + sign * direction[1])
+        if not open_ends or room < self.condition:
+            return None
+        return ('open_' if open_ends == 2 else 'closed_') + name
@@ -13,6 +13,8 @@ class Player:
 
     :method put_mark: sets player's mark in the given cell
     """
+    __slots__ = ('__name', '__mark')  # subclasses without __slots__ keep their attributes in __dict__
+
     def __init__(self, name: str) -> None:
         self.name = name
         self.mark = None
@@ -0,0 +1,216 @@
+import logging
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+MAGIC = b'TTTR'
+VERSION = 1
+CHUNK_SIZE = 1 << 16
+
+
+class GameRecord:
+    """
+    Class for a record of a game: board and moves in order
+        :param size: size of the board
+        :param condition: win condition of the board
+        :param first_player: index of the player, who made the first move
+        :param moves: names of the marked cells in order of the moves
+
+    :method encode: returns the record in binary format
+    :method decode: returns the record from binary format and the position after it
+    """
+
+    def __init__(self, size: int, condition: int, first_player: int,
+                 moves: Optional[List[Tuple[int, int]]] = None) -> None:
+        self.size = size
+        self.condition = condition
+        self.first_player = first_player
+        self.moves = moves if moves is not None else []
+
+    def __eq__(self, other: object) -> bool:
+        return (isinstance(other, GameRecord) and (self.size, self.condition, self.first_player, self.moves)
+                == (other.size, other.condition, other.first_player, other.moves))
+
+    def __repr__(self) -> str:
+        return 'GameRecord({size}, {condition}, {first}, {moves})'.format(
+            size=self.size, condition=self.condition, first=self.first_player, moves=self.moves)
+
+    def encode(self) -> bytes:
+        """
+        Returns the record in binary format: varints of size and condition, byte of
+            the first player, varint of the number of moves, then a byte per move
+            (index_1 * size + index_2), or a varint per move for boards bigger than 16x16
+        :return: bytes of the record
+        """
+        data = bytearray(encode_varint(self.size))
+        data += encode_varint(self.condition)
+        data.append(self.first_player)
+        data += encode_varint(len(self.moves))
+        size = self.size
+        if size * size <= 256:
+            data += bytes(index_1 * size + index_2 for index_1, index_2 in self.moves)
+        else:
+            for index_1, index_2 in self.moves:
+                data += encode_varint(index_1 * size + index_2)
+        return bytes(data)
+
+    @classmethod
+    def decode(cls, data: bytes, position: int = 0) -> Tuple['GameRecord', int]:
+        """
+        Returns the record from binary format, raises IndexError if data ends inside it
+        :param data: bytes with records
+        :param position: index of the first byte of the record
+        :return: record and index of the first byte after it
+        """
+        size, position = decode_varint(data, position)
+        condition, position = decode_varint(data, position)
+        first_player = data[position]
+        count, position = decode_varint(data, position + 1)
+        if size * size <= 256:
+            if position + count > len(data):
+                raise IndexError('Record is not complete')
+            moves = [divmod(index, size) for index in data[position:position + count]]
+            position += count
+        else:
+            moves = []
+            for _ in range(count):
+                index, position = decode_varint(data, position)
+                moves.append(divmod(index, size))
+        return cls(size, condition, first_player, moves), position
+
+
+def encode_varint(value: int) -> bytes:
+    """
+    Returns the non-negative int as LEB128 varint: 7 bits per byte, high bit set
+        in all bytes except the last one
+    :param value: non-negative int
+    :return: bytes of the varint
+    """
+    data = bytearray()
+    while value > 0x7f:
+        data.append(value & 0x7f | 0x80)
+        value >>= 7
+    data.append(value)
+    return bytes(data)
+
+
+def decode_varint(data: bytes, position: int) -> Tuple[int, int]:
+    """
+    Reads LEB128 varint, raises IndexError if data ends inside it
+    :param data: bytes with the varint
+    :param position: index of its first byte
+    :return: value and index of the first byte after the varint
+    """
+    value = shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, position
+        shift += 7
+
+
+class RecordWriter:
+    """
+    Writes game records one by one to a binary file, can be used as a context manager
+        :param file: path of a new file, or a binary file object opened for writing
+        :param append: add records to the end of an existing file
+
+    :method write: writes the record
+    :method close: closes the file, if it was opened by the writer
+    """
+
+    def __init__(self, file, append: bool = False) -> None:
+        self.__own_file = isinstance(file, str)
+        if self.__own_file:
+            exists = append and _has_header(file)
+            self.file: BinaryIO = open(file, 'ab' if exists else 'wb')
+            if not exists:
+                self.file.write(MAGIC + bytes([VERSION]))
+        else:
+            self.file = file
+            self.file.write(MAGIC + bytes([VERSION]))
+        self.count = 0
+
+    def __enter__(self) -> 'RecordWriter':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def write(self, record: GameRecord) -> None:
+        """
+        Writes the record
+        :param record: record of a game
+        :return: None
+        """
+        self.file.write(record.encode())
+        self.count += 1
+
+    def write_bytes(self, data: bytes, count: int) -> None:
+        """
+        Writes records, that were already encoded, for example by worker processes
+        :param data: concatenated encoded records
+        :param count: number of records in data
+        :return: None
+        """
+        self.file.write(data)
+        self.count += count
+
+    def close(self) -> None:
+        """
+        Closes the file, if the writer opened it, else only flushes it
+        :return: None
+        """
+        if self.__own_file:
+            self.file.close()
+        else:
+            self.file.flush()
+
+
+def _has_header(path: str) -> bool:
+    """
+    Checks if the file exists and starts with the header of record files
+    :param path: path of the file
+    :return: True for a record file
+    """
+    try:
+        with open(path, 'rb') as file:
+            return file.read(len(MAGIC) + 1) == MAGIC + bytes([VERSION])
+    except FileNotFoundError:
+        return False
+
+
+def read_records(file, chunk_size: int = CHUNK_SIZE) -> Iterator[GameRecord]:
+    """
+    Yields records of the file one by one. The file is read by chunks,
+        so it's never loaded whole
+    :param file: path of the file, or a binary file object opened for reading
+    :param chunk_size: number of bytes read at once
+    :return: generator of records
+    """
+    stream = open(file, 'rb') if isinstance(file, str) else file
+    try:
+        if stream.read(len(MAGIC) + 1) != MAGIC + bytes([VERSION]):
+            logging.error(' '.join(['Attempt to read records from', str(file)]))
+            raise ValueError('File is not a game record file')
+        data = b''
+        position = 0
+        while True:
+            chunk = stream.read(chunk_size)
+            data = data[position:] + chunk
+            position = 0
+            while position < len(data):
+                try:
+                    record, position_after = GameRecord.decode(data, position)
+                except IndexError:
+                    break
+                position = position_after
+                yield record
+            if not chunk:
+                if position < len(data):
+                    logging.error(' '.join(['Game record file', str(file), 'ends inside a record']))
+                    raise ValueError('Game record file is truncated')
+                return
+    finally:
+        if stream is not file:
+            stream.close()
@@ -0,0 +1,205 @@
+import logging
+from collections.abc import Mapping
+from typing import Dict, Iterator, Tuple
+
+from game_classes.bit_board import BitCell
+from game_classes.board import Board
+
+UNBOUNDED_SIZE = 1 << 31  # size of an effectively infinite board
+MAX_LISTED_SIZE = 1 << 12  # boards up to this size can list all their cells
+
+
+class SparseCells(Mapping):
+    """
+    Read-only mapping {(index_1, index_2): BitCell} over all cells of a sparse board.
+        Cell views are created on demand, iteration goes over the whole board lazily.
+        Boards bigger than MAX_LISTED_SIZE can't be iterated, use marked_cells,
+        candidate sets or is_on_board for them
+        :param board: board, the cells belong to
+    """
+    __slots__ = ('board',)
+
+    def __init__(self, board: 'SparseBoard') -> None:
+        self.board = board
+
+    def __getitem__(self, name: Tuple[int, int]) -> BitCell:
+        if not self.board.is_on_board(name):
+            raise KeyError(name)
+        return BitCell(self.board, name)
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        size = self._listed_size()
+        for index_1 in range(size):
+            for index_2 in range(size):
+                yield index_1, index_2
+
+    def __len__(self) -> int:
+        return self._listed_size() ** 2
+
+    def _listed_size(self) -> int:
+        """
+        Returns size of the board, if its cells can be listed, else raises ValueError
+        :return: size of the board
+        """
+        size = self.board.size
+        if size > MAX_LISTED_SIZE:
+            logging.error(' '.join(['Attempt to list all cells of sparse board', str(size), 'x', str(size)]))
+            raise ValueError('Cells of a board bigger than MAX_LISTED_SIZE can not be listed')
+        return size
+
+    def __contains__(self, name) -> bool:
+        return self.board.is_on_board(name)
+
+
+class SparseBoard(Board):
+    """
+    Board, that keeps only marked cells in a dictionary {name: mark}. Nothing is
+        created for empty cells, so memory and creation time depend on the number
+        of moves, not on the size, and the board can be as big as UNBOUNDED_SIZE
+        for games on an effectively infinite grid. Names are non-negative, like on
+        other boards, so the grid is unbounded only toward bigger indexes: a game
+        should start near (UNBOUNDED_SIZE // 2, UNBOUNDED_SIZE // 2) to have room
+        in all directions. Cells of boards bigger than MAX_LISTED_SIZE can't be
+        iterated, only marked_cells can
+        :param size: size of a new board
+        :param condition: win condition, number of consecutive cells
+            one needs to mark
+
+    :prop size: size of the board
+    :prop condition: condition for win, number of consecutive cells
+    :prop filled_cells: number of non-empty cells on the board
+    :prop cells: mapping of cell views {(index_1, index_2): BitCell}
+    :prop zobrist: 64-bit Zobrist hash of the position, updated on every move and undo
+    :prop canonical_zobrist: hash of the position, same for all its rotations and reflections
+    :prop patterns: index of line patterns, kept after track_patterns call, else None
+
+    :method is_on_board: checks if the name belongs to a cell of the board
+    :method get_mark: returns mark of the cell with given name
+    :method marked_cells: yields names and marks of the non-empty cells
+    :method set_cell_mark: sets or clears a mark without counting filled cells
+    :method put_mark: sets mark in the empty cell and counts it as filled
+    :method put_mark_trusted: sets mark in the cell, known to be empty, without checks
+    :method remove_mark: clears the marked cell, undoing put_mark
+    :method reset: clears the board in place for a new game
+    :method track_patterns: starts keeping index of line patterns on every move and undo
+    :method track_candidates: starts keeping set of empty cells near marks on every move and undo
+    :method check_win_combo: check if any win combination appeared, or
+            if the game is over because all cells are filled
+    """
+    __slots__ = ('__marks', '__view')
+
+    def _create_cells(self) -> None:
+        """
+        Creates an empty dictionary of marks
+        :return: None
+        """
+        self.__marks: Dict[Tuple[int, int], str] = dict()
+        self.__view = SparseCells(self)
+        logging.debug(' '.join(['Created sparse board', str(self.size), 'x', str(self.size)]))
+
+    @property
+    def cells(self) -> SparseCells:
+        """
+        Getter for property cells
+        :return: mapping of cell views {name: BitCell}
+        """
+        return self.__view
+
+    def get_mark(self, cell_name: Tuple[int, int]) -> str:
+        """
+        Returns mark of the cell with given name
+        :param cell_name: tuple of indexes
+        :return: mark, ' ' if there's no mark yet
+        """
+        return self.__marks.get(cell_name, ' ')
+
+    def marked_cells(self) -> Iterator[Tuple[Tuple[int, int], str]]:
+        """
+        Yields names and marks of the non-empty cells, without walking empty ones
+        :return: generator of (name, mark) pairs
+        """
+        yield from list(self.__marks.items())
+
+    def set_cell_mark(self, cell_name: Tuple[int, int], mark: str) -> bool:
+        """
+        Sets mark in the empty cell, or clears the cell if mark is None.
+            Doesn't change filled_cells, same as Cell.set_mark
+        :param cell_name: tuple of indexes
+        :param mark: mark, that will be set, None for empty
+        :return: True, if mark was set successfully
+        """
+        if mark is None:
+            self.__marks.pop(cell_name, None)
+            return True
+        if cell_name in self.__marks:
+            return False
+        self.__marks[cell_name] = mark
+        return True
+
+    def _clear_all(self) -> None:
+        """
+        Clears all marked cells at once. Keeps the rest of the board state as is
+        :return: None
+        """
+        self.__marks.clear()
+
+    def _place(self, cell_name: Tuple[int, int], mark: str) -> bool:
+        """
+        Sets mark in the cell, if the cell exists and is empty. Keeps the rest
+            of the board state as is
+        :param cell_name: tuple of indexes
+        :param mark: mark, that will be set
+        :return: True if mark was set successfully
+        """
+        return self.is_on_board(cell_name) and self.set_cell_mark(cell_name, mark)
+
+    def _place_trusted(self, cell_name: Tuple[int, int], mark: str) -> None:
+        """
+        Sets mark in the cell, that is known to be on the board and empty.
+            Keeps the rest of the board state as is
+        :param cell_name: tuple of indexes
+        :param mark: mark, that will be set
+        :return: None
+        """
+        self.__marks[cell_name] = mark
+
+    def _clear(self, cell_name: Tuple[int, int]) -> str:
+        """
+        Clears the cell. Keeps the rest of the board state as is
+        :param cell_name: tuple of indexes
+        :return: removed mark, ' ' if the cell was empty already
+        """
+        return self.__marks.pop(cell_name, ' ')
+
+    def check_win_combo(self, cell: BitCell) -> Tuple[bool, str]:
+        """
+        Checks if there is a win combination on the board, or if all cells are filled.
+        Looks only near given cell, like Board.check_win_combo, reading marks
+        straight from the dictionary. Cells outside the board are never marked,
+        so the walk stops at the edges without bound checks
+        :param cell: last marked cell
+        :return: True if the game is over and the winner as his mark. If it's drawn game,
+        second value will be '-'
+        """
+        cell_name = cell.name
+        marks = self.__marks
+        mark = marks.get(cell_name, ' ')
+        reach = self.condition - 1
+        for step_1, step_2 in self.DIRECTIONS:
+            line = 1
+            for sign in (1, -1):
+                index_1, index_2 = cell_name
+                for _ in range(reach):
+                    index_1 += sign * step_1
+                    index_2 += sign * step_2
+                    if marks.get((index_1, index_2)) != mark:
+                        break
+                    line += 1
+            if line >= self.condition:
+                logging.debug(' '.join(['Win!', str(line), 'in line along', str((step_1, step_2))]))
+                return True, mark
+
+        if self.filled_cells == self.size ** 2:
+            logging.debug(''.join(['Drawn game!']))
+            return True, '-'
+        return False, '-'
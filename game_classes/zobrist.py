@@ -0,0 +1,160 @@
+import logging
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
+
+MASK_64 = (1 << 64) - 1
+SYMMETRIES = 8
+
+
+def splitmix64(value: int) -> int:
+    """
+    Mixes bits of the value, gives well distributed 64-bit numbers for
+        consecutive inputs and the same result in every process
+    :param value: any int
+    :return: 64-bit int
+    """
+    value = (value + 0x9E3779B97F4A7C15) & MASK_64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & MASK_64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & MASK_64
+    return value ^ (value >> 31)
+
+
+def transform(size: int, cell_name: Tuple[int, int], symmetry: int) -> Tuple[int, int]:
+    """
+    Returns the image of the cell under one of 8 symmetries of the square board:
+        0 - identity, 1..3 - rotations by 90, 180, 270 degrees,
+        4..7 - reflections
+    :param size: size of the board
+    :param cell_name: tuple of indexes
+    :param symmetry: index of symmetry [0, 7]
+    :return: name of the image cell
+    """
+    index_1, index_2 = cell_name
+    last = size - 1
+    return ((index_1, index_2), (index_2, last - index_1),
+            (last - index_1, last - index_2), (last - index_2, index_1),
+            (index_1, last - index_2), (last - index_1, index_2),
+            (index_2, index_1), (last - index_2, last - index_1))[symmetry]
+
+
+def cell_key(cell_name: Tuple[int, int], mark: str) -> int:
+    """
+    Returns Zobrist key of the mark in the cell
+    :param cell_name: tuple of indexes
+    :param mark: mark in the cell
+    :return: 64-bit key
+    """
+    mark_code = int.from_bytes(mark.encode(), 'little')
+    return splitmix64(splitmix64(splitmix64(mark_code) ^ cell_name[0]) ^ cell_name[1])
+
+
+@lru_cache(maxsize=1 << 16)
+def symmetric_keys(size: int, cell_name: Tuple[int, int], mark: str) -> Tuple[int, ...]:
+    """
+    Returns keys of the mark in the images of the cell under all symmetries
+    :param size: size of the board
+    :param cell_name: tuple of indexes
+    :param mark: mark in the cell
+    :return: tuple of 8 keys, one per symmetry
+    """
+    return tuple(cell_key(transform(size, cell_name, symmetry), mark) for symmetry in range(SYMMETRIES))
+
+
+class ZobristHash:
+    """
+    Zobrist hash of a position. Hashes of its 7 symmetric images are kept only after
+        track_images call: then they are computed from the marked cells once and updated
+        on every toggle, so boards, which nobody asks for the canonical form, pay for
+        one key per move
+        :param size: size of the board
+
+    :prop size: size of the board
+    :prop value: 64-bit hash of the position
+    :prop canonical: hash of the canonical form, the smallest of 8 images' hashes
+    :prop symmetry: index of the symmetry, that turns the position into canonical form
+
+    :method track_images: starts keeping hashes of the symmetric images
+    :method reset: sets the hash of the empty board
+    :method toggle: adds the mark in the cell to the hash or removes it from the hash
+    """
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.__value = 0
+        self.__images: Optional[List[int]] = None  # hashes of 8 images, kept after track_images call
+
+    @property
+    def value(self) -> int:
+        """
+        Getter for value property
+        :return: 64-bit hash of the position
+        """
+        return self.__value
+
+    @property
+    def canonical(self) -> int:
+        """
+        Getter for canonical property, images must be tracked
+        :return: 64-bit hash of the canonical form of the position
+        """
+        return min(self._images())
+
+    @property
+    def symmetry(self) -> int:
+        """
+        Getter for symmetry property, images must be tracked
+        :return: index of the symmetry, that gives the canonical form
+        """
+        hashes = self._images()
+        return hashes.index(min(hashes))
+
+    def track_images(self, marked_cells: Iterable[Tuple[Tuple[int, int], str]]) -> None:
+        """
+        Starts keeping hashes of the symmetric images, does nothing if they are kept already
+        :param marked_cells: (name, mark) pairs of the non-empty cells of the position
+        :return: None
+        """
+        if self.__images is not None:
+            return
+        images = [0] * SYMMETRIES
+        for cell_name, mark in marked_cells:
+            keys = symmetric_keys(self.size, cell_name, mark)
+            for symmetry in range(SYMMETRIES):
+                images[symmetry] ^= keys[symmetry]
+        self.__images = images
+
+    def _images(self) -> List[int]:
+        """
+        Returns hashes of all 8 images of the position, if they aren't tracked, raises ValueError
+        :return: list of hashes, one per symmetry
+        """
+        if self.__images is None:
+            logging.error('Attempt to get canonical hash without tracked images')
+            raise ValueError('Images must be tracked by track_images first')
+        return self.__images
+
+    def reset(self) -> None:
+        """
+        Sets all hashes to the hash of the empty board
+        :return: None
+        """
+        self.__value = 0
+        if self.__images is not None:
+            self.__images = [0] * SYMMETRIES
+
+    def toggle(self, cell_name: Tuple[int, int], mark: str) -> None:
+        """
+        XORs keys of the mark in the cell into the hashes: the first call adds the mark,
+            the second one removes it
+        :param cell_name: tuple of indexes
+        :param mark: mark in the cell
+        :return: None
+        """
+        images = self.__images
+        if images is None:
+            self.__value ^= cell_key(cell_name, mark)
+            return
+        keys = symmetric_keys(self.size, cell_name, mark)
+        self.__value ^= keys[0]
+        for symmetry in range(SYMMETRIES):
+            images[symmetry] ^= keys[symmetry]
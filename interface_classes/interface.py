@@ -1,5 +1,5 @@
 import logging
-from typing import Tuple, List
+from typing import TYPE_CHECKING, Optional, Tuple, List
 
 import arcade
 import arcade.gui
@@ -10,19 +10,28 @@ from common_functions import tuple_verification
 from game_classes.player import Player
 from game_classes.game import Game
 
+if TYPE_CHECKING:  # computer players and network modules are imported, when they are needed first
+    from network_classes.line_client import LineClient
+
+REDRAW_FRAMES = 2  # frames drawn after a change, so both front and back buffers show it
+
 
 class Interface(arcade.Window):
     """
     Main interface class.
     """
-    def __init__(self, game_name: str) -> None:
+    def __init__(self, game_name: str, client: Optional['LineClient'] = None, player_name: str = 'Player') -> None:
         """
         Creates main interface for a game window
         :param game_name: name for window
+        :param client: connection to the game server for network mode, None for games on this computer.
+            In network mode the buttons create sessions on the server, moves are sent to it,
+            and the board shows moves, that come from it
+        :param player_name: name of the player of this window on the server
         :return: None
         """
         # ------ All constants set
-        self.click = arcade.load_sound("images/rockHit2.wav")
+        self.click = None  # sound of a click, loaded at the first click
         self.colours = dict()
         self._all_config_values_verification()
 
@@ -34,9 +43,18 @@ class Interface(arcade.Window):
         player_1 = Player('Player 1')
         player_2 = Player('Player 2')
         self.game = Game([player_1, player_2])
+        self.human_opponent = player_2
+        self.computer_opponents = dict()  # {game size: computer player}, created for the first game against it
+        self.vs_computer = config.vs_computer
+
+        # ------ Network mode
+        self.client = client
+        self.player_name = player_name
+        self.session = None  # number of the session on the server
+        self.network_index = None  # index of the player of this window, None for a spectator
 
         # ------ Status bar
-        self.state_bar = arcade.Text('Board created', 5, 5, self.colours['text'])
+        self.state_bar = arcade.Text('Choose a game', 5, 5, self.colours['text'])
 
         # ------ Playing field
         # Playing field constant properties
@@ -50,9 +68,17 @@ class Interface(arcade.Window):
         # Playing field chainable properties
         self.grid_sprite_list = arcade.SpriteList()  # for cells drawing
         self.grid_sprites = []  # for cells changing
-        self.board_sprites = arcade.SpriteList()  # just cells background
+        self.board_shapes = arcade.ShapeElementList()  # grid and cells background, drawn at once
         self.grid_size = 0
         self.cell_side = 0
+        self.textures = dict()  # {'x', 'o', 'empty': Texture}, shared by all cells of all boards
+        self.board_cache = dict()  # {grid size: (grid_sprite_list, grid_sprites, board_shapes)}
+        self.marked_sprites = set()  # sprites with x or o texture
+
+        # ------ Rendering
+        self.dirty_frames = REDRAW_FRAMES  # frames to draw yet, 0 when the window shows the current state
+        self.drawn_view = None  # status text and states of buttons, as they were drawn last time
+        self.frame_rate = config.frame_rate  # current frames per second of the event loop
 
         # ------ Main menu
         self.manager = arcade.gui.UIManager()
@@ -72,22 +98,29 @@ class Interface(arcade.Window):
         self.buttons.add(small_game_button.with_space_around(left=button_space, right=button_space))
         self.buttons.add(big_game_button.with_space_around(left=button_space, right=button_space))
         self.buttons.add(quit_button.with_space_around(left=button_space, right=button_space))
+        self.menu_buttons = [small_game_button, big_game_button, quit_button]
 
         @small_game_button.event("on_click")
         def on_click_small_game(event):
             logging.debug(' '.join(['Pressed small_game button']))
-            self.setup(config.small_game_size)
-            self.game.curr_turn = self.game.start_game(config.small_game_size, 3)
+            if self.client is not None:
+                self._create_session(config.small_game_size, 3)
+                return
+            self.setup(config.small_game_size, 3)
             self.state_bar.text = 'Small game started. Now turn of {name}'.format(
                 name=self.game.players[self.game.curr_turn].name)
+            self._computer_turn()
 
         @big_game_button.event("on_click")
         def on_click_big_game(event):
             logging.debug(' '.join(['Pressed big_game button']))
-            self.setup(config.big_game_size)
-            self.game.curr_turn = self.game.start_game(config.big_game_size, 5)
+            if self.client is not None:
+                self._create_session(config.big_game_size, 5)
+                return
+            self.setup(config.big_game_size, 5)
             self.state_bar.text = 'Big game started. Now turn of {name}'.format(
                 name=self.game.players[self.game.curr_turn].name)
+            self._computer_turn()
 
         @quit_button.event("on_click")
         def on_click_quit(event):
@@ -102,26 +135,34 @@ class Interface(arcade.Window):
                 child=self.buttons)
         )
 
-    def setup(self, game_size: int, condition: int = 5) -> None:
+    def setup(self, game_size: int, condition: int = 5, first_player: Optional[int] = None) -> None:
         """
-        Set up the game here. Call this function to restart the game.
+        Set up the game here. Call this function to restart the game. The game
+            clears its board in place, if the size is the same, or takes it from
+            the pool of boards
         :param game_size: size of the game
         :param condition: win combination
+        :param first_player: index of the player, who makes the first move, random if None
         :return: None
         """
         # ------ Game start section
-        self.game.curr_turn = self.game.start_game(game_size, condition)
+        opponent = self.human_opponent
+        if self.vs_computer and self.client is None:
+            opponent = self._computer_opponent(game_size) or opponent
+        self.game.players = [self.game.players[0], opponent]
+        self.game.curr_turn = self.game.start_game(game_size, condition, first_player=first_player)
 
         # ------ Interface section
         self.grid_size = game_size
-        self.grid_sprite_list, self.grid_sprites, self.board_sprites = self.draw_new_board()
+        self.grid_sprite_list, self.grid_sprites, self.board_shapes = self.draw_new_board()
+        self._mark_dirty()
 
     def on_mouse_press(self, x: int, y: int, button: int, modifiers: int) -> None:
         """
         Mouse click event (not in main menu)
         :return: None
         """
-        arcade.play_sound(self.click)
+        arcade.play_sound(self._load_click())
 
         column = int((x - self.bottom_left_board[0]) // (self.cell_side + self.cell_margin))
         row = int((y - self.bottom_left_board[1]) // (self.cell_side + self.cell_margin))
@@ -132,37 +173,303 @@ class Interface(arcade.Window):
             logging.debug(' '.join([f'Click coordinates: ({x}, {y}). Out of grid']))
             return
 
+        if self.client is not None:
+            if (self.game.state != 1 and self.game.curr_turn == self.network_index
+                    and self.game.board.get_mark(cell_name) == ' '):
+                from network_classes.protocol import MOVE
+                self.client.send({'type': MOVE, 'cell': cell_name})
+            return
+
         if self.game.state != 1:  # if game is not over yet
-            if self.game.single_turn(self.game.players[self.game.curr_turn], cell_name):
+            if self.game.make_move(cell_name):
 
                 logging.debug(
                     ' '.join([f'Click coordinates: ({x}, {y}). Grid coordinates: ({cell_name[0]}, {cell_name[1]})']))
-                self.game.curr_turn = 1 - self.game.curr_turn
-                self.state_bar.text = 'Now turn of {name}'.format(name=self.game.players[self.game.curr_turn].name)
 
                 # HERE NEED RAW_CELL_NAME!!!
                 self._set_mark(raw_cell_name, self.game.players[self.game.curr_turn].mark)
+                self._update_state_bar()
+                self._computer_turn()
+
+    def on_key_press(self, symbol: int, modifiers: int) -> None:
+        """
+        Keyboard event: Ctrl+Z takes back the last move, Ctrl+Y makes it again.
+            Moves of computer are taken back and made again together with the previous move.
+            C switches computer opponent for the next game, H shows a hint
+        :return: None
+        """
+        if symbol == arcade.key.C and not modifiers & arcade.key.MOD_CTRL:
+            self.vs_computer = not self.vs_computer
+            self.state_bar.text = 'Computer opponent is {state} for the next game'.format(
+                state='on' if self.vs_computer else 'off')
+            return
+        if symbol == arcade.key.H and self.game.board is not None and self.game.state != 1:
+            self._show_hint()
+            return
+        if not modifiers & arcade.key.MOD_CTRL or self.game.board is None or self.client is not None:
+            return  # the server doesn't take moves back
+        if symbol == arcade.key.Z:
+            while self.game.moves:
+                cell_name = self.game.unmake_move()
+                self._set_mark(self._cell_name_convert(cell_name), None)
+                if not self._is_computer_turn():
+                    break
+            self._update_state_bar()
+            self._computer_turn()  # if the first move of computer was taken back
+        elif symbol == arcade.key.Y:
+            while self.game.undone_moves:
+                cell_name = self.game.redo_move()
+                self._set_mark(self._cell_name_convert(cell_name), self.game.players[self.game.curr_turn].mark)
+                if not self._is_computer_turn():
+                    break
+            self._update_state_bar()
+
+    def _show_hint(self) -> None:
+        """
+        Shows in status bar the best move from the solved position database of the board,
+            if there is one. Else shows cells, where the current player wins right now or
+            must block the opponent. The board keeps pattern index since the first hint
+        :return: None
+        """
+        board = self.game.board
+        from ai_classes.solved_database import RESULT_NAMES, open_database
+
+        database = open_database(board.size, board.condition, config.solved_dir)
+        best = None if database is None else database.best_move(board)
+        if best is not None:
+            cell_name, result, distance = best
+            self.state_bar.text = 'Hint: best move {cell}, {result} in {distance} moves'.format(
+                cell=cell_name, result=RESULT_NAMES[result], distance=distance)
+            return
+        patterns = board.track_patterns()
+        mark = self.game.players[self.game.curr_turn].mark
+        winning_cells = sorted(patterns.winning_cells(mark))
+        blocking_cells = sorted(patterns.blocking_cells(mark))
+        if winning_cells:
+            self.state_bar.text = 'Hint: win at ' + ', '.join(map(str, winning_cells))
+        elif blocking_cells:
+            self.state_bar.text = 'Hint: block at ' + ', '.join(map(str, blocking_cells))
+        else:
+            threats = {name: count for name, count in patterns.threat_counts(mark).items() if count}
+            self.state_bar.text = 'Hint: no immediate threats. Your lines: {lines}'.format(
+                lines=', '.join(' '.join([str(count), name.replace('_', ' ')]) for name, count in threats.items())
+                or 'none')
 
-                result_check = self.game.board.check_win_combo(self.game.board.cells[cell_name])
-                if result_check[0]:
-                    self.game.state = 1
-                    winner = result_check[1]
-                    if winner == '-':
-                        tail = 'Drawn game!'
-                    else:
-                        tail = 'Win of {name}!'.format(name=self.game.players[1 - self.game.curr_turn].name)
-                    self.state_bar.text = ' '.join(['Game is over.', tail])
+    def on_update(self, delta_time: float) -> None:
+        """
+        Update event: in network mode takes messages of the server
+        :return: None
+        """
+        if self.client is None:
+            return
+        for message in self.client.poll():
+            self._on_server_message(message)
+
+    def _create_session(self, game_size: int, condition: int) -> None:
+        """
+        Asks the server for a new session, this window becomes its first player
+        :param game_size: size of the game
+        :param condition: win combination
+        :return: None
+        """
+        from network_classes.protocol import CREATE
+
+        self.client.send({'type': CREATE, 'size': game_size, 'condition': condition, 'name': self.player_name})
+        self.state_bar.text = 'Waiting for the server'
+
+    def join_session(self, session: int, spectator: bool = False) -> None:
+        """
+        Asks the server to join the session as its second player or as a spectator
+        :param session: number of the session on the server
+        :param spectator: watch the game instead of playing
+        :return: None
+        """
+        from network_classes.protocol import JOIN, WATCH
+
+        if spectator:
+            self.client.send({'type': WATCH, 'session': session})
+        else:
+            self.client.send({'type': JOIN, 'session': session, 'name': self.player_name})
+        self.state_bar.text = 'Waiting for the server'
+
+    def _on_server_message(self, message: dict) -> None:
+        """
+        Shows the message of the server: the role of this window, the state of the game or a move
+        :param message: decoded message of the server
+        :return: None
+        """
+        from network_classes.protocol import CLOSED, ERROR, JOINED, MOVED, PLAYER, STATE
+
+        if message['type'] == JOINED:
+            self.session = message['session']
+            self.network_index = message['index'] if message['role'] == PLAYER else None
+        elif message['type'] == STATE:
+            self._show_state(message)
+        elif message['type'] == MOVED:
+            cell_name = tuple(message['cell'])
+            if not self.game.make_move(cell_name):
+                logging.error(' '.join(['Move', str(cell_name), 'of the server can not be made here']))
+                return
+            self._set_mark(self._cell_name_convert(cell_name), self.game.players[self.game.curr_turn].mark)
+            self._update_state_bar()
+        elif message['type'] == CLOSED:
+            self.session = self.network_index = None
+            if self.game.state == 1:  # the result of the game stays in the status bar
+                self.state_bar.text = ' '.join([self.state_bar.text, 'Choose a game'])
+            else:
+                self.state_bar.text = 'Session is closed: {reason}. Choose a game'.format(reason=message['reason'])
+        elif message['type'] == ERROR:
+            self.state_bar.text = 'Server: {message}'.format(message=message['message'])
+
+    def _show_state(self, state: dict) -> None:
+        """
+        Sets up the board of the session and makes its moves
+        :param state: STATE message of the server
+        :return: None
+        """
+        first_player = state['first'] or 0
+        self.setup(state['size'], state['condition'], first_player)
+        for player, name in zip(self.game.players, state['players']):
+            player.name = name
+        self.game.apply_moves([tuple(cell_name) for cell_name in state['moves']])
+        for index, cell_name in enumerate(self.game.moves):
+            next_player = self.game.players[(first_player + index + 1) % 2]  # as _set_mark gets it after a move
+            self._set_mark(self._cell_name_convert(cell_name), next_player.mark)
+        if state['first'] is None:
+            self.state_bar.text = 'Session {session}: waiting for the second player'.format(session=state['session'])
+        else:
+            self._update_state_bar()
+
+    def _computer_opponent(self, game_size: int) -> Optional[Player]:
+        """
+        Returns computer player for the game size, created and imported at the first call
+        :param game_size: size of the game
+        :return: computer player, None if there's no one for the size
+        """
+        if game_size not in self.computer_opponents:
+            if game_size == config.small_game_size:
+                from ai_classes.database_player import DatabasePlayer
+                self.computer_opponents[game_size] = DatabasePlayer('Computer', config.solved_dir)
+            elif game_size == config.big_game_size:
+                from ai_classes.gomoku_player import GomokuPlayer
+                self.computer_opponents[game_size] = GomokuPlayer('Computer', config.computer_time_limit)
+        return self.computer_opponents.get(game_size)
+
+    def _is_computer_turn(self) -> bool:
+        """
+        Checks if it's turn of a computer player now
+        :return: True if the current player is one of computer_opponents
+        """
+        return self.game.players[self.game.curr_turn] in self.computer_opponents.values()
+
+    def _computer_turn(self) -> None:
+        """
+        Makes moves of computer players, while it's their turn and the game is not over
+        :return: None
+        """
+        moved = False
+        while self.game.state != 1 and self._is_computer_turn():
+            cell_name = self.game.players[self.game.curr_turn].choose_move(self.game)
+            if not self.game.make_move(cell_name):
+                logging.error(' '.join(['Computer player chose unavailable cell', str(cell_name)]))
+                break
+            self._set_mark(self._cell_name_convert(cell_name), self.game.players[self.game.curr_turn].mark)
+            moved = True
+        if moved:
+            self._update_state_bar()
+
+    def _update_state_bar(self) -> None:
+        """
+        Shows in status bar whose turn is now, or the result of the finished game
+        :return: None
+        """
+        if self.game.state == 1:
+            if self.game.winner == '-':
+                tail = 'Drawn game!'
+            else:
+                tail = 'Win of {name}!'.format(name=self.game.players[1 - self.game.curr_turn].name)
+            self.state_bar.text = ' '.join(['Game is over.', tail])
+        else:
+            self.state_bar.text = 'Now turn of {name}'.format(name=self.game.players[self.game.curr_turn].name)
+
+    def on_mouse_motion(self, x: int, y: int, dx: int, dy: int) -> None:
+        """
+        Mouse move event: redraws the window at once, if a button is hovered or left
+        :return: None
+        """
+        self._check_view()
+
+    def on_resize(self, width: int, height: int) -> None:
+        """
+        Window resize event: the whole window must be drawn again
+        :return: None
+        """
+        super().on_resize(width, height)
+        self._mark_dirty()
+
+    def on_expose(self) -> None:
+        """
+        Window expose event: the window was uncovered, the whole window must be drawn again
+        :return: None
+        """
+        self._mark_dirty()
+
+    def _check_view(self) -> None:
+        """
+        Marks the window dirty, if status text or hover and press of buttons
+            are not the same, as they were drawn last time
+        :return: None
+        """
+        view = (self.state_bar.text, tuple((button.hovered, button.pressed) for button in self.menu_buttons))
+        if view != self.drawn_view:
+            self.drawn_view = view
+            self._mark_dirty()
+
+    def _mark_dirty(self) -> None:
+        """
+        Requests drawing of the window in the next frames, and lifts the idle frame rate cap
+        :return: None
+        """
+        self.dirty_frames = REDRAW_FRAMES
+        if self.frame_rate != config.frame_rate:
+            self._set_frame_rate(config.frame_rate)
+
+    def _set_frame_rate(self, frame_rate: float) -> None:
+        """
+        Changes how often the window is updated and, with arcade versions, that have
+            Window.set_draw_rate, redrawn. With older ones on_draw keeps being called
+            at the rate of the event loop, and returns at once, while nothing changed.
+            In network mode on_update takes messages of the server, so it keeps
+            the full frame_rate of config, and only drawing slows down
+        :param frame_rate: frames per second
+        :return: None
+        """
+        self.set_update_rate(1 / (config.frame_rate if self.client is not None else frame_rate))
+        set_draw_rate = getattr(self, 'set_draw_rate', None)
+        if set_draw_rate is not None:
+            set_draw_rate(1 / frame_rate)
+        self.frame_rate = frame_rate
+        logging.debug(' '.join(['Frame rate is', str(frame_rate), 'per second']))
 
     def on_draw(self) -> None:
         """
-        Render the screen.
+        Render the screen. With dirty_rendering in config, the screen is rendered only
+            after changes, and the frame rate goes down to idle_frame_rate, when there are none
         :return: None
         """
+        if config.dirty_rendering:
+            self._check_view()
+            if not self.dirty_frames:
+                return
+            self.dirty_frames -= 1
+            if not self.dirty_frames and config.idle_frame_rate:
+                self._set_frame_rate(config.idle_frame_rate)
+
         self.clear()
         self.state_bar.draw()
         self.manager.draw()
 
-        self.board_sprites.draw()
+        self.board_shapes.draw()
         self.grid_sprite_list.draw()
 
     def _cell_name_convert(self, name: Tuple[int, int]) -> Tuple[int, int]:
@@ -178,39 +485,48 @@ class Interface(arcade.Window):
         Changes texture of the sprite, given by its address
         :param cell: address of the sprite in grid_sprites list
         :param mark: string with mark. If it's 'o', sets texture 0,
-            else - texture 1
+            if it's None - empty texture 2, else - texture 1
         :return: None
         """
         row, column = cell
-        if mark == 'o':
-            self.grid_sprites[row][column].set_texture(0)
-        else:
-            self.grid_sprites[row][column].set_texture(1)
+        sprite = self.grid_sprites[row][column]
+        self._mark_dirty()
+        if mark is None:
+            sprite.set_texture(2)
+            self.marked_sprites.discard(sprite)
+            return
+        sprite.set_texture(0 if mark == 'o' else 1)
+        self.marked_sprites.add(sprite)
 
-    def draw_new_board(self) -> Tuple[arcade.SpriteList, List[List[arcade.Sprite]], arcade.SpriteList]:
+    def draw_new_board(self) -> Tuple[arcade.SpriteList, List[List[arcade.Sprite]], arcade.ShapeElementList]:
         """
-        Generates sprite lists for a new board
-        :return: grid_sprite_list, grid_sprites, board_sprites
+        Returns sprite lists for the board of grid_size. Textures are created once and
+            shared by all cells, sprites and background shapes are created once per
+            size of the board. A board of the same size again only clears its marks
+        :return: grid_sprite_list, grid_sprites, board_shapes
         """
+        self.cell_side = round((self.field_size - (self.grid_size + 2) * self.cell_margin) // self.grid_size)
+        for sprite in self.marked_sprites:
+            sprite.set_texture(2)
+        self.marked_sprites.clear()
+        if self.grid_size in self.board_cache:
+            return self.board_cache[self.grid_size]
+
+        textures = self._load_textures()
+        texture_size = max(textures['x'].size)
+        scale = self.cell_side / texture_size
         grid_sprite_list = arcade.SpriteList()
         grid_sprites = []
-        board_sprites = arcade.SpriteList()
-
-        self.cell_side = round((self.field_size - (self.grid_size + 2) * self.cell_margin) // self.grid_size)
-
-        x_text = arcade.load_texture(config.x_pic, can_cache=True)
-        o_text = arcade.load_texture(config.o_pic, can_cache=True)
-        scale = self.cell_side / max(x_text.size)
+        board_shapes = arcade.ShapeElementList()
 
         # for grid
         base_size = (self.grid_size + 2) * self.cell_margin + self.grid_size * self.cell_side
-        board_sprites.append(arcade.Sprite(center_x=round(self.bottom_left_board[0] + base_size / 2),
-                                           center_y=round(self.bottom_left_board[1] + base_size / 2),
-                                           texture=arcade.Texture.create_filled('grid_background',
-                                                                                (base_size,
-                                                                                 base_size),
-                                                                                self.colours['grid'])))
-
+        board_shapes.append(arcade.create_rectangle_filled(round(self.bottom_left_board[0] + base_size / 2),
+                                                           round(self.bottom_left_board[1] + base_size / 2),
+                                                           base_size, base_size, self.colours['grid']))
+        # cells background as one shape: corners of every cell, counterclockwise
+        points = []
+        half = self.cell_side / 2
         for row in range(self.grid_size):
             grid_sprites.append([])
             for column in range(self.grid_size):
@@ -218,29 +534,42 @@ class Interface(arcade.Window):
                      + self.bottom_left_board[0] + self.cell_margin)
                 y = (row * (self.cell_side + self.cell_margin) + (self.cell_side / 2 + self.cell_margin)
                      + self.bottom_left_board[1] + self.cell_margin)
-                sprite = arcade.Sprite(image_x=max(x_text.size),
-                                       image_y=max(x_text.size),
+                sprite = arcade.Sprite(image_x=texture_size,
+                                       image_y=texture_size,
                                        scale=scale,
-                                       texture=arcade.Texture.create_empty('empty',
-                                                                           (max(x_text.size), max(x_text.size))))
-                sprite.append_texture(x_text)
-                sprite.append_texture(o_text)
+                                       texture=textures['empty'])
+                sprite.append_texture(textures['x'])
+                sprite.append_texture(textures['o'])
+                sprite.append_texture(textures['empty'])  # for taken back moves
                 sprite.center_x = x
                 sprite.center_y = y
                 grid_sprite_list.append(sprite)
                 grid_sprites[row].append(sprite)
+                points += [(x - half, y - half), (x + half, y - half), (x + half, y + half), (x - half, y + half)]
+        board_shapes.append(arcade.create_rectangles_filled_with_colors(points, [self.colours['cell']] * len(points)))
+        self.board_cache[self.grid_size] = grid_sprite_list, grid_sprites, board_shapes
+        return self.board_cache[self.grid_size]
 
-                # for cells background
-                board_sprites.append(arcade.Sprite(image_x=max(x_text.size),
-                                                   image_y=max(x_text.size),
-                                                   scale=scale,
-                                                   center_x=x,
-                                                   center_y=y,
-                                                   texture=arcade.Texture.create_filled('cell_background',
-                                                                                        (max(x_text.size),
-                                                                                         max(x_text.size)),
-                                                                                        self.colours['cell'])))
-        return grid_sprite_list, grid_sprites, board_sprites
+    def _load_click(self) -> arcade.Sound:
+        """
+        Loads the sound of a click once, when it's played first time, not at start
+        :return: sound of a click
+        """
+        if self.click is None:
+            self.click = arcade.load_sound(config.click_sound)
+        return self.click
+
+    def _load_textures(self) -> dict:
+        """
+        Loads images of marks and creates the empty texture once for all boards
+        :return: {'x', 'o', 'empty': Texture}
+        """
+        if not self.textures:
+            x_text = arcade.load_texture(config.x_pic, can_cache=True)
+            o_text = arcade.load_texture(config.o_pic, can_cache=True)
+            self.textures = {'x': x_text, 'o': o_text,
+                             'empty': arcade.Texture.create_empty('empty', (max(x_text.size), max(x_text.size)))}
+        return self.textures
 
     def _all_config_values_verification(self):
         """
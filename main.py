@@ -1,6 +1,19 @@
+import argparse
 import logging
-import arcade
-from interface_classes.interface import Interface
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parses command line arguments of the game window
+    :return: namespace with arguments
+    """
+    parser = argparse.ArgumentParser(description='Tic-tac-toe and gomoku in a window')
+    parser.add_argument('--connect', metavar='HOST:PORT',
+                        help='play on the game server (see server.py): the buttons create sessions there')
+    parser.add_argument('--join', type=int, metavar='SESSION', help='join the session of the server as a player')
+    parser.add_argument('--watch', type=int, metavar='SESSION', help='watch the session of the server')
+    parser.add_argument('--name', default='Player', help='name of the player on the server')
+    return parser.parse_args()
 
 
 if __name__ == '__main__':
@@ -10,6 +23,17 @@ if __name__ == '__main__':
         level=logging.INFO
     )
 
-    interface = Interface("Tic-Tac-Toe")
-    interface.setup(10)
-    arcade.run()
+    args = parse_args()
+    client = None
+    if args.connect:
+        from network_classes.line_client import LineClient
+        from network_classes.protocol import read_address
+        client = LineClient(*read_address(args.connect))
+
+    # arcade is imported only with the window, sounds and textures are loaded, when they are needed first
+    from interface_classes.interface import Interface
+
+    interface = Interface("Tic-Tac-Toe", client, args.name)  # the board is set up by the buttons of the menu
+    if client is not None and (args.join is not None or args.watch is not None):
+        interface.join_session(args.join if args.join is not None else args.watch, args.join is None)
+    interface.run()
@@ -0,0 +1,19 @@
+from importlib import import_module
+
+# Classes are imported on first access, so the game window takes LineClient without asyncio
+_EXPORTS = {'GameServer': '.server',
+            'Session': '.server',
+            'AsyncClient': '.client',
+            'load_test': '.client',
+            'play_pair': '.client',
+            'LineClient': '.line_client',
+            'read_address': '.protocol'}
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(' '.join(['module', __name__, 'has no attribute', name]))
+    value = getattr(import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
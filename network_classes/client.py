@@ -0,0 +1,151 @@
+import asyncio
+import random
+import statistics
+import time
+from typing import List
+
+from network_classes.protocol import (CLOSED, CREATE, DEFAULT_PORT, ERROR, JOIN, JOINED, MAX_LINE, MOVE, MOVED,
+                                      STATE, decode, encode)
+
+
+class AsyncClient:
+    """
+    Asyncio client of GameServer
+        :param reader: stream from the server
+        :param writer: stream to the server
+
+    :method connect: opens a connection to the server
+    :method send: sends a message
+    :method receive: waits for the next message
+    :method receive_type: waits for the next message of given types, skipping others
+    :method close: closes the connection
+    """
+    __slots__ = ('reader', 'writer')
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def connect(cls, host: str = '127.0.0.1', port: int = DEFAULT_PORT) -> 'AsyncClient':
+        """
+        Opens a connection to the server
+        :param host: address of the server
+        :param port: port of the server
+        :return: connected client
+        """
+        reader, writer = await asyncio.open_connection(host, port, limit=MAX_LINE)
+        return cls(reader, writer)
+
+    def send(self, message: dict) -> None:
+        """
+        Sends a message, without waiting for the server
+        :param message: dictionary with 'type' key
+        :return: None
+        """
+        self.writer.write(encode(message))
+
+    async def receive(self) -> dict:
+        """
+        Waits for the next message, if the server closed the connection, raises ConnectionError
+        :return: decoded message
+        """
+        line = await self.reader.readline()
+        if not line:
+            raise ConnectionError('Server closed the connection')
+        return decode(line)
+
+    async def receive_type(self, *types: str) -> dict:
+        """
+        Waits for the next message of given types, ERROR messages raise ValueError
+        :param types: types of messages
+        :return: decoded message
+        """
+        while True:
+            message = await self.receive()
+            if message['type'] in types:
+                return message
+            if message['type'] == ERROR:
+                raise ValueError(message['message'])
+
+    async def close(self) -> None:
+        """
+        Closes the connection
+        :return: None
+        """
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+async def play_pair(host: str, port: int, size: int, condition: int, games: int, seed: int,
+                    latencies: List[float]) -> int:
+    """
+    Two clients play games against each other by random moves, as stand-ins of real players
+    :param host: address of the server
+    :param port: port of the server
+    :param size: size of the boards
+    :param condition: win condition of the boards
+    :param games: number of games in a row
+    :param seed: seed of the moves
+    :param latencies: seconds from sending of a move to getting it back are added here
+    :return: number of made moves
+    """
+    rng = random.Random(seed)
+    clients = [await AsyncClient.connect(host, port), await AsyncClient.connect(host, port)]
+    moves = 0
+    try:
+        for _ in range(games):
+            clients[0].send({'type': CREATE, 'size': size, 'condition': condition, 'name': 'Bot 1'})
+            session = (await clients[0].receive_type(JOINED))['session']
+            await clients[0].receive_type(STATE)  # the session waits for the second player
+            clients[1].send({'type': JOIN, 'session': session, 'name': 'Bot 2'})
+            states = [await client.receive_type(STATE) for client in clients]
+            free = [(index_1, index_2) for index_1 in range(size) for index_2 in range(size)]
+            rng.shuffle(free)
+            turn = states[0]['turn']
+            while turn is not None:
+                start = time.perf_counter()
+                clients[turn].send({'type': MOVE, 'cell': free.pop()})
+                moved = [await client.receive_type(MOVED) for client in clients]
+                latencies.append(time.perf_counter() - start)
+                moves += 1
+                turn = moved[0]['turn']
+            for client in clients:  # the server closes the session after the last move
+                await client.receive_type(CLOSED)
+    finally:
+        for client in clients:
+            await client.close()
+    return moves
+
+
+async def load_test(host: str = '127.0.0.1', port: int = DEFAULT_PORT, pairs: int = 100, games: int = 10,
+                    size: int = 10, condition: int = 5, seed: int = 0) -> dict:
+    """
+    Plays games of many pairs of clients at once
+    :param host: address of the server
+    :param port: port of the server
+    :param pairs: number of pairs of clients, so of sessions at once
+    :param games: number of games of every pair
+    :param size: size of the boards
+    :param condition: win condition of the boards
+    :param seed: base seed of the moves
+    :return: {'pairs', 'games', 'moves', 'seconds', 'moves_per_sec', 'latency_mean', 'latency_p50', 'latency_p99'},
+        latencies in seconds
+    """
+    latencies = []
+    start = time.perf_counter()
+    moves = await asyncio.gather(*[play_pair(host, port, size, condition, games, seed + pair, latencies)
+                                   for pair in range(pairs)])
+    seconds = time.perf_counter() - start
+    latencies.sort()
+
+    def percentile(share: float) -> float:
+        return latencies[min(len(latencies) - 1, int(share * len(latencies)))] if latencies else 0.0
+
+    return {'pairs': pairs, 'games': pairs * games, 'moves': sum(moves), 'seconds': seconds,
+            'moves_per_sec': sum(moves) / seconds if seconds else 0.0,
+            'latency_mean': statistics.fmean(latencies) if latencies else 0.0,
+            'latency_p50': percentile(0.5), 'latency_p99': percentile(0.99)}
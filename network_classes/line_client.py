@@ -0,0 +1,80 @@
+import logging
+import select
+import socket
+from typing import List
+
+from network_classes.protocol import CLOSED, DEFAULT_PORT, decode, encode
+
+
+class LineClient:
+    """
+    Client of GameServer for programs with their own event loop, like the game window.
+        Messages are sent at once and received by poll without waiting
+        :param host: address of the server
+        :param port: port of the server
+        :param timeout: seconds to wait for the connection and for sending
+
+    :prop connected: False after the server closed the connection
+
+    :method send: sends a message
+    :method poll: returns messages, that came since the last call
+    :method close: closes the connection
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = DEFAULT_PORT, timeout: float = 5.0) -> None:
+        self.__socket = socket.create_connection((host, port), timeout=timeout)
+        self.__socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.__buffer = b''
+        self.connected = True
+        logging.info(' '.join(['Connected to', host, str(port)]))
+
+    def send(self, message: dict) -> None:
+        """
+        Sends a message, if the connection is closed, does nothing
+        :param message: dictionary with 'type' key
+        :return: None
+        """
+        if not self.connected:
+            return
+        try:
+            self.__socket.sendall(encode(message))
+        except OSError as error:
+            logging.error(' '.join(['Message was not sent:', repr(error)]))
+            self.close()
+
+    def poll(self) -> List[dict]:
+        """
+        Returns messages, that came since the last call, without waiting. If the connection
+            is lost, the last message is CLOSED
+        :return: list of decoded messages
+        """
+        messages = []
+        lost = False
+        while self.connected and select.select([self.__socket], [], [], 0)[0]:
+            try:
+                data = self.__socket.recv(1 << 16)
+            except OSError:
+                data = b''
+            if not data:
+                self.close()
+                lost = True
+                break
+            self.__buffer += data
+        *lines, self.__buffer = self.__buffer.split(b'\n')
+        for line in lines:
+            try:
+                messages.append(decode(line))
+            except ValueError:
+                logging.error(' '.join(['Got a wrong message from the server', repr(line[:64])]))
+        if lost:
+            messages.append({'type': CLOSED, 'session': None, 'reason': 'connection lost'})
+        return messages
+
+    def close(self) -> None:
+        """
+        Closes the connection
+        :return: None
+        """
+        if self.connected:
+            self.connected = False
+            self.__socket.close()
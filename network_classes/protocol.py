@@ -0,0 +1,75 @@
+import json
+import logging
+from typing import Tuple
+
+MAX_LINE = 1 << 12  # max length of a message in bytes, longer lines close the connection
+DEFAULT_PORT = 8765
+
+# Messages of clients: {'type': ..., other keys}
+CREATE = 'create'  # 'size', 'condition', 'name': starts a session and joins it as the first player
+JOIN = 'join'  # 'session', 'name': joins the session as the second player, the game starts
+WATCH = 'watch'  # 'session': joins the session as a spectator
+MOVE = 'move'  # 'cell': [index_1, index_2], move of the player, whose turn it is
+LEAVE = 'leave'  # leaves the session, the session is closed, if a player leaves
+
+# Messages of the server
+JOINED = 'joined'  # 'session', 'role', 'index': reply to create, join and watch
+STATE = 'state'  # 'session', 'size', 'condition', 'players', 'first', 'moves', 'turn', 'over', 'winner'
+MOVED = 'moved'  # 'cell', 'mark', 'turn', 'over', 'winner': broadcast of a made move
+CLOSED = 'closed'  # 'session', 'reason': the session doesn't exist any more, also sent after the last move
+ERROR = 'error'  # 'message': the request was rejected, the connection stays open
+
+PLAYER = 'player'
+SPECTATOR = 'spectator'
+
+
+def encode(message: dict) -> bytes:
+    """
+    Returns the message as one line of compact JSON
+    :param message: dictionary with 'type' key
+    :return: bytes, that end with a newline
+    """
+    return (json.dumps(message, separators=(',', ':')) + '\n').encode()
+
+
+def decode(line: bytes) -> dict:
+    """
+    Returns the message from one line of JSON, if the line is not a valid message, raises ValueError
+    :param line: bytes with or without the newline
+    :return: dictionary with 'type' key
+    """
+    try:
+        message = json.loads(line)
+    except (UnicodeDecodeError, json.JSONDecodeError):
+        logging.debug(' '.join(['Got not a JSON line', repr(line[:64])]))
+        raise ValueError('Message must be one line of JSON')
+    if type(message) != dict or type(message.get('type')) != str:
+        logging.debug(' '.join(['Got a message without type', repr(line[:64])]))
+        raise ValueError('Message must be a JSON object with type')
+    return message
+
+
+def parse_cell(value) -> Tuple[int, int]:
+    """
+    Returns the name of a cell from its JSON form, if it's not a pair of integers, raises ValueError
+    :param value: list of two indexes
+    :return: tuple of indexes
+    """
+    if (type(value) != list or len(value) != 2
+            or type(value[0]) != int or type(value[1]) != int):
+        raise ValueError('Cell must be a list of two integers')
+    return value[0], value[1]
+
+
+def read_address(address: str, default_port: int = DEFAULT_PORT) -> Tuple[str, int]:
+    """
+    Returns host and port from 'host:port' or 'host', if the port is wrong, raises ValueError
+    :param address: address of the server
+    :param default_port: port, if the address has none
+    :return: (host, port)
+    """
+    host, _, port = address.rpartition(':') if ':' in address else (address, '', str(default_port))
+    if not port.isdigit() or not host:
+        logging.error(' '.join(['Wrong address of the server', address]))
+        raise ValueError("Address must be 'host:port'")
+    return host, int(port)
@@ -0,0 +1,461 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Iterator, List, Optional
+
+from game_classes.board_pool import BoardPool
+from game_classes.game import BOARD_BACKENDS, Game
+from game_classes.player import Player
+from network_classes.protocol import (CLOSED, CREATE, DEFAULT_PORT, ERROR, JOIN, JOINED, LEAVE, MAX_LINE, MOVE,
+                                      MOVED, PLAYER, SPECTATOR, STATE, WATCH, decode, encode, parse_cell)
+
+MAX_NAME = 32  # max length of a player's name
+MAX_BUFFER = 1 << 16  # bytes, not sent to a client yet, after which the client is disconnected as too slow
+
+
+class Connection:
+    """
+    Class for a connected client
+        :param writer: stream of the client
+
+    :prop writer: stream of the client
+    :prop session: session, the client takes part in, None if there's no one
+    :prop role: PLAYER or SPECTATOR in the session
+    :prop index: index of the player in the game of the session, None for a spectator
+    :prop task: task, that reads messages of the client
+    """
+    __slots__ = ('writer', 'session', 'role', 'index', 'task')
+
+    def __init__(self, writer: asyncio.StreamWriter) -> None:
+        self.writer = writer
+        self.task: Optional[asyncio.Task] = asyncio.current_task()
+        self.session: Optional[Session] = None
+        self.role: Optional[str] = None
+        self.index: Optional[int] = None
+
+
+class Session:
+    """
+    Class for a game, hosted by the server
+        :param session_id: number of the session
+        :param game: game with the board, created for the session
+
+    :prop id: number of the session
+    :prop game: game of the session
+    :prop players: connections of the players by their index in the game, None for a free place
+    :prop spectators: connections of the spectators
+    :prop first: index of the player, who made the first move, None while the second player is awaited
+    :prop active: time of the last action in the session by time.monotonic
+
+    :method connections: yields connections of the players and the spectators
+    :method state: returns STATE message of the session
+    """
+    __slots__ = ('id', 'game', 'players', 'spectators', 'first', 'active')
+
+    def __init__(self, session_id: int, game: Game) -> None:
+        self.id = session_id
+        self.game = game
+        self.players: List[Optional[Connection]] = [None, None]
+        self.spectators = set()
+        self.first: Optional[int] = None
+        self.active = 0.0
+
+    def connections(self) -> Iterator[Connection]:
+        """
+        Yields connections of the players and the spectators
+        :return: generator of connections
+        """
+        for connection in self.players:
+            if connection is not None:
+                yield connection
+        yield from self.spectators
+
+    def state(self) -> dict:
+        """
+        Returns the full state of the session, that is sent on join and on start of the game
+        :return: STATE message
+        """
+        game = self.game
+        over = game.state == 1
+        return {'type': STATE, 'session': self.id, 'size': game.board.size, 'condition': game.board.condition,
+                'players': [player.name for player in game.players], 'first': self.first, 'moves': game.moves,
+                'turn': None if self.first is None or over else game.curr_turn, 'over': over, 'winner': game.winner}
+
+
+class GameServer:
+    """
+    Asyncio server, that hosts many games at once. Clients send messages of protocol module,
+        one JSON object per line. Moves are validated by Game.make_move, every made move is
+        sent to both players and all spectators of the session. A session is closed after
+        the last move of its game, or if it has no actions for idle_timeout seconds.
+        Boards of closed sessions are used again by new ones
+        :param idle_timeout: seconds without actions, after which a session is closed
+        :param max_sessions: max number of sessions at once
+        :param backend: key of BOARD_BACKENDS for boards of the games, sparse boards take
+            the least memory per session
+        :param max_size: max size of a board
+
+    :prop sessions: sessions {id: Session}, the least recently active first
+    :prop moves: number of made moves
+    :prop evicted: number of sessions, closed as idle
+
+    :method start: starts listening and closing of idle sessions, returns the port
+    :method serve_forever: serves clients until it's cancelled
+    :method close: stops the server, closes all sessions and waits for the clients' tasks
+    :method handle_message: makes what the message of the client asks for
+    :method close_session: closes the session and tells it all its clients
+    :method evict_idle: closes sessions without actions for idle_timeout seconds
+    :method stats: returns numbers of sessions, connections, moves and evicted sessions
+    """
+
+    def __init__(self, idle_timeout: float = 300.0, max_sessions: int = 100000, backend: str = 'sparse',
+                 max_size: int = 100) -> None:
+        if backend not in BOARD_BACKENDS:
+            logging.error(' '.join(['Attempt to create server with', str(backend), 'backend']))
+            raise ValueError('Board backend must be one of ' + ', '.join(BOARD_BACKENDS))
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self.backend = backend
+        self.max_size = max_size
+        self.sessions: OrderedDict = OrderedDict()
+        self.moves = 0
+        self.evicted = 0
+        self.__connections = set()
+        self.__next_id = 1
+        self.__board_pool = BoardPool()
+        self.__server: Optional[asyncio.AbstractServer] = None
+        self.__evictor: Optional[asyncio.Task] = None
+        self.__handlers = {CREATE: self._create, JOIN: self._join, WATCH: self._watch, MOVE: self._move,
+                           LEAVE: self._leave}
+
+    async def start(self, host: str = '127.0.0.1', port: int = DEFAULT_PORT) -> int:
+        """
+        Starts listening and closing of idle sessions
+        :param host: address to listen on
+        :param port: port to listen on, 0 for any free port
+        :return: port, the server listens on
+        """
+        self.__server = await asyncio.start_server(self._handle_client, host, port, limit=MAX_LINE)
+        self.__evictor = asyncio.ensure_future(self._evict_loop())
+        port = self.__server.sockets[0].getsockname()[1]
+        logging.info(' '.join(['Server listens on', host, str(port)]))
+        return port
+
+    async def serve_forever(self) -> None:
+        """
+        Serves clients until it's cancelled, then closes the server
+        :return: None
+        """
+        try:
+            await self.__server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+        """
+        Stops listening, closes all sessions and connections. Tasks of the clients are
+            cancelled and awaited, so none of them is left pending
+        :return: None
+        """
+        if self.__evictor is not None:
+            self.__evictor.cancel()
+            self.__evictor = None
+        if self.__server is not None:
+            self.__server.close()
+        for session in list(self.sessions.values()):
+            self.close_session(session, 'server stopped')
+        tasks = [connection.task for connection in self.__connections if connection.task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self.__server is not None:
+            await self.__server.wait_closed()
+            self.__server = None
+
+    def stats(self) -> dict:
+        """
+        Returns numbers of the server
+        :return: {'sessions', 'connections', 'moves', 'evicted'}
+        """
+        return {'sessions': len(self.sessions), 'connections': len(self.__connections),
+                'moves': self.moves, 'evicted': self.evicted}
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Reads messages of one client until it disconnects
+        :param reader: stream from the client
+        :param writer: stream to the client
+        :return: None
+        """
+        connection = Connection(writer)
+        self.__connections.add(connection)
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:  # the line is longer than MAX_LINE
+                    self._send(connection, {'type': ERROR, 'message': 'Message is too long'})
+                    break
+                except ConnectionError:
+                    break
+                if not line:
+                    break
+                try:
+                    self.handle_message(connection, decode(line))
+                except ValueError as error:
+                    self._send(connection, {'type': ERROR, 'message': str(error)})
+        except asyncio.CancelledError:
+            pass  # the server is closed
+        finally:
+            self._leave(connection, {})
+            self.__connections.discard(connection)
+            writer.close()
+
+    def handle_message(self, connection: Connection, message: dict) -> None:
+        """
+        Makes what the message of the client asks for, if it can't be done, raises ValueError
+        :param connection: client, who sent the message
+        :param message: decoded message
+        :return: None
+        """
+        handler = self.__handlers.get(message['type'])
+        if handler is None:
+            raise ValueError('Unknown message type ' + message['type'][:MAX_NAME])
+        handler(connection, message)
+
+    def _create(self, connection: Connection, message: dict) -> None:
+        """
+        Creates a session and joins the client to it as the first player
+        :param connection: client
+        :param message: CREATE message
+        :return: None
+        """
+        size, condition = message.get('size'), message.get('condition')
+        if type(size) != int or not 1 <= size <= self.max_size:
+            raise ValueError('Size must be an integer from 1 to {}'.format(self.max_size))
+        if type(condition) != int or not 1 <= condition <= size:
+            raise ValueError('Condition must be an integer from 1 to size')
+        if len(self.sessions) >= self.max_sessions:
+            raise ValueError('Server is full')
+        name = self._name(message, 'Player 1')
+        self._leave(connection, {})
+        game = Game([Player(name), Player('Player 2')], board_pool=self.__board_pool)
+        game.create_board(size, condition, self.backend)
+        session = Session(self.__next_id, game)
+        self.__next_id += 1
+        self.sessions[session.id] = session
+        self._enter(connection, session, PLAYER, 0)
+        logging.debug(' '.join(['Session', str(session.id), 'was created']))
+
+    def _join(self, connection: Connection, message: dict) -> None:
+        """
+        Joins the client to the session as the second player and starts the game
+        :param connection: client
+        :param message: JOIN message
+        :return: None
+        """
+        session = self._session(message)
+        if session.players[1] is not None or session.players[0] is connection:
+            raise ValueError('Session is full')
+        name = self._name(message, 'Player 2')
+        self._leave(connection, {})
+        session.game.players[1].name = name
+        session.first = session.game.reset()
+        self._enter(connection, session, PLAYER, 1)
+        self._broadcast(session, session.state())
+
+    def _watch(self, connection: Connection, message: dict) -> None:
+        """
+        Joins the client to the session as a spectator
+        :param connection: client
+        :param message: WATCH message
+        :return: None
+        """
+        session = self._session(message)
+        if connection.session is session and connection.role == PLAYER:
+            raise ValueError('Players can not watch their own game')
+        self._leave(connection, {})
+        self._enter(connection, session, SPECTATOR, None)
+
+    def _move(self, connection: Connection, message: dict) -> None:
+        """
+        Makes the move of the player and sends it to the session. The last move of the game
+            closes the session
+        :param connection: client
+        :param message: MOVE message
+        :return: None
+        """
+        session = connection.session
+        if session is None or connection.role != PLAYER:
+            raise ValueError('Only players can make moves')
+        game = session.game
+        if session.first is None:
+            raise ValueError('Game waits for the second player')
+        if game.state == 1:
+            raise ValueError('Game is over')
+        if game.curr_turn != connection.index:
+            raise ValueError('Not your turn')
+        cell_name = parse_cell(message.get('cell'))
+        if not game.make_move(cell_name):
+            raise ValueError('Cell is not available')
+        self.moves += 1
+        self._touch(session)
+        over = game.state == 1
+        self._broadcast(session, {'type': MOVED, 'cell': cell_name, 'mark': game.players[connection.index].mark,
+                                  'turn': None if over else game.curr_turn, 'over': over, 'winner': game.winner})
+        if over:
+            self.close_session(session, 'game over')
+
+    def _leave(self, connection: Connection, message: dict) -> None:
+        """
+        Takes the client out of its session. The session is closed, if a player leaves it
+        :param connection: client
+        :param message: LEAVE message
+        :return: None
+        """
+        session = connection.session
+        if session is None:
+            return
+        if connection.role == SPECTATOR:
+            session.spectators.discard(connection)
+            connection.session = connection.role = None
+            return
+        self.close_session(session, 'player left')
+
+    def close_session(self, session: Session, reason: str) -> None:
+        """
+        Closes the session, tells it all its clients and keeps its board for new sessions
+        :param session: open session
+        :param reason: reason for clients
+        :return: None
+        """
+        if self.sessions.pop(session.id, None) is None:
+            return
+        self._broadcast(session, {'type': CLOSED, 'session': session.id, 'reason': reason})
+        for connection in list(session.connections()):
+            connection.session = connection.role = connection.index = None
+        session.players = [None, None]
+        session.spectators.clear()
+        self.__board_pool.release(session.game.board)
+        session.game.board = None
+        logging.debug(' '.join(['Session', str(session.id), 'was closed:', reason]))
+
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        """
+        Closes sessions without actions for idle_timeout seconds. Only sessions at the start
+            of the ordered dictionary are checked, so the time doesn't depend on the number
+            of active sessions
+        :param now: time by time.monotonic, current time by default
+        :return: number of closed sessions
+        """
+        deadline = (time.monotonic() if now is None else now) - self.idle_timeout
+        evicted = 0
+        while self.sessions:
+            session = next(iter(self.sessions.values()))
+            if session.active > deadline:
+                break
+            self.close_session(session, 'idle')
+            evicted += 1
+        self.evicted += evicted
+        if evicted:
+            logging.info(' '.join(['Closed', str(evicted), 'idle sessions. Now:', str(self.stats())]))
+        return evicted
+
+    async def _evict_loop(self) -> None:
+        """
+        Closes idle sessions a few times per idle_timeout
+        :return: None
+        """
+        while True:
+            await asyncio.sleep(max(self.idle_timeout / 4, 0.01))
+            self.evict_idle()
+
+    def _enter(self, connection: Connection, session: Session, role: str, index: Optional[int]) -> None:
+        """
+        Adds the client to the session and sends it JOINED and STATE messages
+        :param connection: client without a session
+        :param session: open session
+        :param role: PLAYER or SPECTATOR
+        :param index: index of the player, None for a spectator
+        :return: None
+        """
+        connection.session, connection.role, connection.index = session, role, index
+        if role == PLAYER:
+            session.players[index] = connection
+        else:
+            session.spectators.add(connection)
+        self._touch(session)
+        self._send(connection, {'type': JOINED, 'session': session.id, 'role': role, 'index': index})
+        if role == SPECTATOR or index == 0:  # the second player gets the state together with the others
+            self._send(connection, session.state())
+
+    def _session(self, message: dict) -> Session:
+        """
+        Returns the open session, given in the message, if there's no such one, raises ValueError
+        :param message: message with 'session' key
+        :return: session
+        """
+        session = self.sessions.get(message.get('session')) if type(message.get('session')) == int else None
+        if session is None:
+            raise ValueError('No such session')
+        return session
+
+    @staticmethod
+    def _name(message: dict, default: str) -> str:
+        """
+        Returns the name of the player from the message
+        :param message: message with optional 'name' key
+        :param default: name, if the message has none
+        :return: name, cut to MAX_NAME characters
+        """
+        name = message.get('name', default)
+        if type(name) != str:
+            raise ValueError('Name must be a string')
+        return name[:MAX_NAME] or default
+
+    def _touch(self, session: Session) -> None:
+        """
+        Remembers the time of an action in the session, and moves it to the end of the order
+        :param session: open session
+        :return: None
+        """
+        session.active = time.monotonic()
+        self.sessions.move_to_end(session.id)
+
+    def _broadcast(self, session: Session, message: dict) -> None:
+        """
+        Sends the message to the players and the spectators of the session. The message is encoded once
+        :param session: session
+        :param message: message of the server
+        :return: None
+        """
+        data = encode(message)
+        for connection in list(session.connections()):
+            self._write(connection, data)
+
+    def _send(self, connection: Connection, message: dict) -> None:
+        """
+        Sends the message to one client
+        :param connection: client
+        :param message: message of the server
+        :return: None
+        """
+        self._write(connection, encode(message))
+
+    @staticmethod
+    def _write(connection: Connection, data: bytes) -> None:
+        """
+        Writes the data without waiting for the client. A client, that doesn't read,
+            is disconnected, when MAX_BUFFER bytes wait for it
+        :param connection: client
+        :param data: encoded message
+        :return: None
+        """
+        writer = connection.writer
+        if writer.is_closing():
+            return
+        writer.write(data)
+        if writer.transport.get_write_buffer_size() > MAX_BUFFER:
+            logging.warning('Client is disconnected as too slow')
+            writer.close()
@@ -0,0 +1,47 @@
+import argparse
+import asyncio
+import logging
+
+from game_classes.game import BOARD_BACKENDS
+from network_classes.protocol import DEFAULT_PORT
+from network_classes.server import GameServer
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parses command line arguments of the game server
+    :return: namespace with arguments
+    """
+    parser = argparse.ArgumentParser(description='Hosts games for clients over TCP, one JSON message per line')
+    parser.add_argument('--host', default='127.0.0.1', help='address to listen on')
+    parser.add_argument('-p', '--port', type=int, default=DEFAULT_PORT, help='port to listen on')
+    parser.add_argument('--idle-timeout', type=float, default=300.0,
+                        help='seconds without actions, after which a session is closed')
+    parser.add_argument('--max-sessions', type=int, default=100000, help='max number of sessions at once')
+    parser.add_argument('--max-size', type=int, default=100, help='max size of a board')
+    parser.add_argument('--backend', choices=list(BOARD_BACKENDS), default='sparse', help='board backend')
+    return parser.parse_args()
+
+
+async def serve(args: argparse.Namespace) -> None:
+    """
+    Runs the server until it's stopped
+    :param args: namespace with arguments
+    :return: None
+    """
+    server = GameServer(args.idle_timeout, args.max_sessions, args.backend, args.max_size)
+    await server.start(args.host, args.port)
+    await server.serve_forever()
+
+
+if __name__ == '__main__':
+
+    logging.basicConfig(
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s - %(funcName)s',
+        level=logging.INFO
+    )
+
+    try:
+        asyncio.run(serve(parse_args()))
+    except KeyboardInterrupt:
+        logging.info('Server is stopped')
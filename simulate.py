@@ -0,0 +1,62 @@
+import argparse
+import json
+import logging
+import sys
+
+from game_classes.game import BOARD_BACKENDS
+from simulation_classes.simulator import PLAYER_TYPES, SimulationStats, simulate
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parses command line arguments of the batch simulator
+    :return: namespace with arguments
+    """
+    parser = argparse.ArgumentParser(description='Plays games between computer players without the interface')
+    parser.add_argument('first', help='first player: ' + ', '.join(PLAYER_TYPES) +
+                        ", optionally with parameters like 'mcts:playouts=200,radius=1'")
+    parser.add_argument('second', help='second player, in the same form')
+    parser.add_argument('-n', '--games', type=int, default=1000, help='number of games')
+    parser.add_argument('-s', '--size', type=int, default=3, help='size of the board')
+    parser.add_argument('-c', '--condition', type=int, default=3, help='win condition of the board')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='number of processes, all CPUs by default')
+    parser.add_argument('-b', '--batch-size', type=int, default=500, help='number of games in one task of a worker')
+    parser.add_argument('--seed', type=int, default=0, help='base seed of the games')
+    parser.add_argument('--backend', choices=list(BOARD_BACKENDS), default='bitboard', help='board backend')
+    parser.add_argument('--json', help='file to save the summary as JSON')
+    parser.add_argument('--records', help='file to save records of the games')
+    parser.add_argument('-q', '--quiet', action='store_true', help="don't print progress")
+    return parser.parse_args()
+
+
+def print_progress(stats: SimulationStats) -> None:
+    """
+    Prints the number of games and results so far in one line
+    :param stats: stats of the finished games
+    :return: None
+    """
+    sys.stderr.write('\r{} games: {} - {} - {} draws'.format(stats.games, stats.wins[0], stats.wins[1], stats.draws))
+    sys.stderr.flush()
+
+
+if __name__ == '__main__':
+
+    logging.basicConfig(
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s - %(funcName)s',
+        level=logging.WARNING
+    )
+
+    args = parse_args()
+    stats = simulate((args.first, args.second), args.size, args.condition, args.games, args.workers,
+                     args.batch_size, args.seed, args.backend, None if args.quiet else print_progress,
+                     args.records)
+    if not args.quiet:
+        sys.stderr.write('\n')
+    summary = stats.summary()
+    summary['players'] = [args.first, args.second]
+    summary['size'] = args.size
+    summary['condition'] = args.condition
+    print(json.dumps({key: value for key, value in summary.items() if key != 'lengths'}, indent=2))
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump(summary, file, indent=2)
@@ -0,0 +1,3 @@
+from .analyzer import AnalysisStats, analyze, analyze_batch, analyze_game, make_engine
+from .simulator import SimulationStats, make_player, parse_player, play_batch, play_game, simulate
+from .tournament import SPRT, MatchStats, parse_board, play_pairs, schedule, standings, tournament
@@ -0,0 +1,368 @@
+import json
+import logging
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from ai_classes.solved_database import DRAW, WIN, open_database
+from ai_classes.threat_solver import ThreatSolver
+from game_classes.game import Game
+from game_classes.player import Player
+from game_classes.record import GameRecord, read_records
+
+ENGINES = ('auto', 'database', 'vcf', 'vct', 'none')
+MISSED_WIN, LOSING = 'missed_win', 'losing'
+
+_engines: Dict[Tuple, object] = dict()  # engines of a worker process, created once
+
+
+class DatabaseEngine:
+    """
+    Exact values of positions from the solved position database
+        :param size: size of the board
+        :param condition: win condition of the board
+        :param directory: folder with databases
+
+    :prop exact: True, every value is known
+
+    :method value: returns the value of the position for the side to move
+    """
+
+    exact = True
+
+    def __init__(self, size: int, condition: int, directory: str = 'solved') -> None:
+        self.database = open_database(size, condition, directory)
+        if self.database is None:
+            logging.error(' '.join(['No solved position database for board', str(size), 'x', str(size),
+                                    'with condition', str(condition), 'in', directory]))
+            raise ValueError('Database engine needs a solved position database of the board')
+
+    def value(self, game: Game) -> Optional[int]:
+        """
+        Returns the value of the position for the side to move
+        :param game: game, that is not over
+        :return: 1 for a win, 0 for a draw, -1 for a loss, None for unknown position
+        """
+        found = self.database.lookup(game.board)
+        if found is None:
+            return None
+        return 1 if found[0] == WIN else 0 if found[0] == DRAW else -1
+
+
+class ThreatEngine:
+    """
+    Values of positions, proven by threat sequences: a win of the side to move or
+        a forced loss by opponent's threats. Other positions are unknown
+        :param mode: 'vcf' or 'vct' for ThreatSolver
+        :param max_nodes: max number of searched positions for one solve
+
+    :prop exact: False, values can be unknown
+
+    :method value: returns the value of the position for the side to move
+    """
+
+    exact = False
+
+    def __init__(self, mode: str = 'vcf', max_nodes: int = 20000) -> None:
+        # a solver per attacker, so transposition tables survive alternating solves
+        self.solvers = {'x': ThreatSolver(mode, max_nodes), 'o': ThreatSolver(mode, max_nodes)}
+
+    def value(self, game: Game) -> Optional[int]:
+        """
+        Returns the value of the position for the side to move
+        :param game: game, that is not over
+        :return: 1 for a proven win, -1 for a proven loss, None if unknown
+        """
+        mark = game.players[game.curr_turn].mark
+        other = game.players[1 - game.curr_turn].mark
+        if self.solvers[mark].solve(game.board, mark, other) is not None:
+            return 1
+        if self.solvers[other].solve(game.board, other, mark, attacker_to_move=False) is not None:
+            return -1
+        return None
+
+
+def make_engine(kind: str, size: int, condition: int, directory: str = 'solved', max_nodes: int = 20000):
+    """
+    Returns the engine for the board, engines are created once per process.
+        'auto' uses the database if the board has one, else VCF threats
+    :param kind: one of ENGINES
+    :param size: size of the board
+    :param condition: win condition of the board
+    :param directory: folder with databases
+    :param max_nodes: max number of searched positions for one solve of threat engines
+    :return: DatabaseEngine, ThreatEngine, or None for 'none'
+    """
+    if kind not in ENGINES:
+        logging.error(' '.join(['Attempt to analyze games with', str(kind), 'engine']))
+        raise ValueError('Engine must be one of ' + ', '.join(ENGINES))
+    key = (kind, size, condition, directory, max_nodes)
+    if key not in _engines:
+        if kind == 'auto':
+            kind = 'database' if open_database(size, condition, directory) is not None else 'vcf'
+        if kind == 'database':
+            _engines[key] = DatabaseEngine(size, condition, directory)
+        elif kind in ('vcf', 'vct'):
+            _engines[key] = ThreatEngine(kind, max_nodes)
+        else:
+            _engines[key] = None
+    return _engines[key]
+
+
+def _position_value(game: Game, engine) -> Optional[int]:
+    """
+    Returns the value of the current position for the side to move
+    :param game: game with the position
+    :param engine: engine of make_engine
+    :return: 1, 0, -1 or None for unknown
+    """
+    if game.state == 1:
+        return 0 if game.winner == '-' else -1
+    if engine is None:
+        return None
+    return engine.value(game)
+
+
+def analyze_game(game: Game, record: GameRecord, engine) -> Dict[str, object]:
+    """
+    Replays the record move by move and evaluates every position on the way.
+        A move is a blunder, if the mover had a proven win and the position after
+        the move isn't a proven win any more (MISSED_WIN), or if the mover wasn't
+        lost and the position after the move is a proven loss (LOSING). Blunders are
+        looked for only, if values before and after the move are both known, so
+        budgets of inexact engines don't count as mistakes of players. The result
+        is decided at the first position, from which all known values are the final result
+    :param game: game with two players, its board is replaced
+    :param record: record of the game
+    :param engine: engine of make_engine
+    :return: dictionary, that can be saved as JSON. Values are for 'x',
+        decided_at is the number of moves made before the decision
+    """
+    game.load_record(GameRecord(record.size, record.condition, record.first_player), 'bitboard')
+    values = []  # for the side to move, before every move and after the last one
+    error = None
+    for cell_name in record.moves:
+        values.append(_position_value(game, engine))
+        if not game.make_move(cell_name):
+            error = 'Move {cell} can not be made'.format(cell=cell_name)
+            break
+    else:
+        values.append(_position_value(game, engine))
+
+    blunders = []
+    for ply in range(len(values) - 1):
+        before = values[ply]
+        after = None if values[ply + 1] is None else -values[ply + 1]
+        if before is None or after is None:
+            continue
+        kind = None
+        if before == 1 and after != 1:
+            kind = MISSED_WIN
+        elif after == -1 and before != -1:
+            kind = LOSING
+        if kind is not None:
+            blunders.append({'ply': ply, 'cell': list(record.moves[ply]), 'mark': 'x' if ply % 2 == 0 else 'o',
+                             'kind': kind})
+
+    # 'x' moves first, so the side to move is 'x' before even moves
+    x_values = [None if value is None else value if ply % 2 == 0 else -value for ply, value in enumerate(values)]
+    decided_at = None
+    if game.state == 1 and error is None:
+        final = 0 if game.winner == '-' else 1 if game.winner == 'x' else -1
+        for ply in range(len(x_values) - 1, -1, -1):
+            if x_values[ply] is None:
+                continue
+            if x_values[ply] != final:
+                break
+            decided_at = ply
+    result = {'size': record.size, 'condition': record.condition, 'first_player': record.first_player,
+              'length': len(record.moves), 'winner': game.winner if error is None else None,
+              'decided_at': decided_at, 'blunders': blunders, 'values': x_values}
+    if error is not None:
+        result['error'] = error
+    return result
+
+
+def analyze_batch(batch: List[Tuple[int, GameRecord]], engine: str = 'auto', directory: str = 'solved',
+                  max_nodes: int = 20000) -> List[Dict[str, object]]:
+    """
+    Analyzes a batch of records in one process, the game is created once for the batch
+    :param batch: (index of the record in the file, record) pairs
+    :param engine: one of ENGINES
+    :param directory: folder with databases
+    :param max_nodes: max number of searched positions for one solve of threat engines
+    :return: results of analyze_game with the index of the record as 'game'
+    """
+    game = Game([Player('Player 1'), Player('Player 2')])
+    results = []
+    for index, record in batch:
+        result = analyze_game(game, record, make_engine(engine, record.size, record.condition, directory, max_nodes))
+        result['game'] = index
+        results.append(result)
+    return results
+
+
+class AnalysisStats:
+    """
+    Aggregate results of analyzed games
+
+    :prop games: number of analyzed games
+    :prop results: {'x', 'o', '-' or 'unfinished': number of games}
+    :prop lengths: {number of moves: number of games}
+    :prop blunders: {kind of blunder: number of blunders}
+    :prop games_with_blunders: number of games with at least one blunder
+    :prop decided: {number of moves before the decision: number of games}
+    :prop errors: number of records with moves, that can't be made
+    :prop seconds: time of the analysis
+
+    :method add: counts the result of one game
+    :method summary: returns rates and distributions of the results
+    """
+
+    def __init__(self) -> None:
+        self.games = 0
+        self.results: Dict[str, int] = dict()
+        self.lengths: Dict[int, int] = dict()
+        self.blunders = {MISSED_WIN: 0, LOSING: 0}
+        self.games_with_blunders = 0
+        self.decided: Dict[int, int] = dict()
+        self.errors = 0
+        self.seconds = 0.0
+
+    def add(self, result: Dict[str, object]) -> None:
+        """
+        Counts the result of one game
+        :param result: result of analyze_game
+        :return: None
+        """
+        self.games += 1
+        if 'error' in result:
+            self.errors += 1
+        winner = result['winner'] if result['winner'] is not None else 'unfinished'
+        self.results[winner] = self.results.get(winner, 0) + 1
+        self.lengths[result['length']] = self.lengths.get(result['length'], 0) + 1
+        for blunder in result['blunders']:
+            self.blunders[blunder['kind']] += 1
+        if result['blunders']:
+            self.games_with_blunders += 1
+        if result['decided_at'] is not None:
+            self.decided[result['decided_at']] = self.decided.get(result['decided_at'], 0) + 1
+
+    def summary(self) -> Dict[str, object]:
+        """
+        Returns rates and distributions of the results
+        :return: dictionary, that can be saved as JSON
+        """
+        games = max(self.games, 1)
+        decided = max(sum(self.decided.values()), 1)
+        return {'games': self.games,
+                'results': dict(self.results),
+                'errors': self.errors,
+                'mean_length': sum(length * count for length, count in self.lengths.items()) / games,
+                'lengths': {str(length): self.lengths[length] for length in sorted(self.lengths)},
+                'blunders': dict(self.blunders),
+                'blunder_rate': self.games_with_blunders / games,
+                'mean_decided_at': sum(ply * count for ply, count in self.decided.items()) / decided,
+                'decided_at': {str(ply): self.decided[ply] for ply in sorted(self.decided)},
+                'games_per_second': self.games / self.seconds if self.seconds > 0 else 0.0}
+
+
+def _batches(records: str, batch_size: int, skip: Set[int]) -> Iterator[List[Tuple[int, GameRecord]]]:
+    """
+    Reads the record file lazily and yields batches of records, that are not analyzed yet
+    :param records: path of the record file
+    :param batch_size: max number of records in a batch
+    :param skip: indexes of records to skip
+    :return: generator of lists of (index, record) pairs
+    """
+    batch = []
+    for index, record in enumerate(read_records(records)):
+        if index in skip:
+            continue
+        batch.append((index, record))
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _load_results(output: str, stats: AnalysisStats) -> Set[int]:
+    """
+    Reads results of an interrupted analysis. A line, that was cut by the
+        interruption, is removed from the file
+    :param output: path of the results file
+    :param stats: stats to count the read results
+    :return: indexes of analyzed records
+    """
+    done = set()
+    if not os.path.exists(output):
+        return done
+    with open(output, 'rb+') as file:
+        data = file.read()
+        complete = data.rfind(b'\n') + 1
+        if complete < len(data):
+            file.truncate(complete)
+    for line in data[:complete].splitlines():
+        result = json.loads(line)
+        done.add(result['game'])
+        stats.add(result)
+    return done
+
+
+def analyze(records: str, output: str, engine: str = 'auto', workers: Optional[int] = None,
+            batch_size: int = 64, resume: bool = False, directory: str = 'solved', max_nodes: int = 20000,
+            on_batch: Optional[Callable[[AnalysisStats], None]] = None) -> AnalysisStats:
+    """
+    Analyzes all games of the record file over a process pool. Records are read
+        lazily and at most two batches per worker are in flight, so memory doesn't
+        grow with the file. Results are written as JSON lines in order of finished
+        batches and flushed after every batch, so an interrupted analysis keeps all
+        finished games and can be resumed
+    :param records: path of the record file
+    :param output: path of the results file
+    :param engine: one of ENGINES
+    :param workers: number of processes, all CPUs by default, 1 analyzes in this process
+    :param batch_size: number of games in one task of a worker
+    :param resume: skip games, that are already in the results file, and append the others
+    :param directory: folder with databases
+    :param max_nodes: max number of searched positions for one solve of threat engines
+    :param on_batch: called with the total stats after every finished batch
+    :return: stats of all games in the results file
+    """
+    if engine not in ENGINES:
+        logging.error(' '.join(['Attempt to analyze games with', str(engine), 'engine']))
+        raise ValueError('Engine must be one of ' + ', '.join(ENGINES))
+    workers = workers or os.cpu_count() or 1
+    stats = AnalysisStats()
+    done = _load_results(output, stats) if resume else set()
+    start = time.perf_counter()
+
+    with open(output, 'a' if resume else 'w') as file:
+
+        def collect(results: List[Dict[str, object]]) -> None:
+            for result in results:
+                file.write(json.dumps(result) + '\n')
+                stats.add(result)
+            file.flush()
+            if on_batch is not None:
+                on_batch(stats)
+
+        batches = _batches(records, batch_size, done)
+        if workers == 1:
+            for batch in batches:
+                collect(analyze_batch(batch, engine, directory, max_nodes))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                pending = set()
+                for batch in batches:
+                    if len(pending) >= 2 * workers:
+                        finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in finished:
+                            collect(future.result())
+                    pending.add(executor.submit(analyze_batch, batch, engine, directory, max_nodes))
+                for future in wait(pending)[0]:
+                    collect(future.result())
+    stats.seconds = time.perf_counter() - start
+    return stats
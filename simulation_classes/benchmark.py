@@ -0,0 +1,312 @@
+import logging
+import os
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from game_classes.game import BOARD_BACKENDS, Game
+from game_classes.player import Player
+
+SIZES = (3, 10, 50, 200)
+CONDITIONS = (3, 5)
+MAX_MOVES = 200  # moves of a single_turn and check_win_combo batch
+IMPORTS = ('game_classes', 'game_classes.game', 'ai_classes.gomoku_player')  # modules, imported by tools
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # new processes import packages from here
+FIRST_FRAME = ('from interface_classes.interface import Interface; '
+               'window = Interface("Benchmark"); window.on_draw(); window.flip()')
+
+
+def measure(batch: Callable[[], Tuple[int, float]], min_time: float = 0.2, repeat: int = 3) -> float:
+    """
+    Runs batches of operations until min_time passes, repeat times, and takes the best run
+    :param batch: function, that makes some operations and returns (number of operations,
+        seconds spent on them), so preparation of a batch isn't counted
+    :param min_time: min seconds of one run
+    :param repeat: number of runs
+    :return: operations per second of the best run
+    """
+    best = 0.0
+    for _ in range(repeat):
+        count, seconds = 0, 0.0
+        while seconds < min_time:
+            batch_count, batch_seconds = batch()
+            count += batch_count
+            seconds += batch_seconds
+        best = max(best, count / seconds)
+    return best
+
+
+def board_memory(board_class: type, size: int, condition: int) -> int:
+    """
+    Returns memory, taken by a new empty board
+    :param board_class: Board or its subclass
+    :param size: size of the board
+    :param condition: win condition of the board
+    :return: bytes, allocated by the constructor and still in use
+    """
+    started = tracemalloc.is_tracing()
+    if not started:
+        tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    board = board_class(size, condition)
+    memory = tracemalloc.get_traced_memory()[0] - before
+    if not started:
+        tracemalloc.stop()
+    del board
+    return memory
+
+
+def _cells(size: int, seed: int = 0) -> List[Tuple[int, int]]:
+    """
+    Returns up to MAX_MOVES distinct cells of the board in random order
+    :param size: size of the board
+    :param seed: seed of the order
+    :return: list of cell names
+    """
+    indexes = random.Random(seed).sample(range(size ** 2), min(MAX_MOVES, size ** 2))
+    return [divmod(index, size) for index in indexes]
+
+
+def bench_board_init(backend: str, size: int, condition: int, min_time: float) -> float:
+    """
+    Measures creation of empty boards
+    :param backend: key of BOARD_BACKENDS
+    :param size: size of the board
+    :param condition: win condition of the board
+    :param min_time: min seconds of one run
+    :return: boards per second
+    """
+    board_class = BOARD_BACKENDS[backend]
+
+    def batch() -> Tuple[int, float]:
+        start = time.perf_counter()
+        board_class(size, condition)
+        return 1, time.perf_counter() - start
+
+    return measure(batch, min_time)
+
+
+def bench_start_game(backend: str, size: int, condition: int, min_time: float) -> float:
+    """
+    Measures Game.start_game after a played game, as in batch simulation
+    :param backend: key of BOARD_BACKENDS
+    :param size: size of the board
+    :param condition: win condition of the board
+    :param min_time: min seconds of one run
+    :return: games started per second
+    """
+    game = Game([Player('Player 1'), Player('Player 2')])
+    cells = _cells(size)[:size]
+
+    def batch() -> Tuple[int, float]:
+        for cell_name in cells:
+            game.board.put_mark(cell_name, 'x')
+        start = time.perf_counter()
+        game.start_game(size, condition, backend)
+        return 1, time.perf_counter() - start
+
+    game.start_game(size, condition, backend)
+    return measure(batch, min_time)
+
+
+def bench_single_turn(backend: str, size: int, condition: int, min_time: float) -> float:
+    """
+    Measures Game.single_turn on an empty board filled by up to MAX_MOVES marks
+    :param backend: key of BOARD_BACKENDS
+    :param size: size of the board
+    :param condition: win condition of the board
+    :param min_time: min seconds of one run
+    :return: moves per second
+    """
+    game = Game([Player('Player 1'), Player('Player 2')])
+    game.start_game(size, condition, backend)
+    players = game.players
+    cells = _cells(size)
+
+    def batch() -> Tuple[int, float]:
+        game.board.reset()
+        start = time.perf_counter()
+        for index, cell_name in enumerate(cells):
+            game.single_turn(players[index % 2], cell_name)
+        return len(cells), time.perf_counter() - start
+
+    return measure(batch, min_time)
+
+
+def bench_check_win_combo(backend: str, size: int, condition: int, min_time: float) -> float:
+    """
+    Measures Board.check_win_combo for every marked cell of a position with up to MAX_MOVES marks
+    :param backend: key of BOARD_BACKENDS
+    :param size: size of the board
+    :param condition: win condition of the board
+    :param min_time: min seconds of one run
+    :return: checks per second
+    """
+    board = BOARD_BACKENDS[backend](size, condition)
+    cells = _cells(size)
+    for index, cell_name in enumerate(cells):
+        board.put_mark(cell_name, 'xo'[index % 2])
+    views = [board.cells[cell_name] for cell_name in cells]
+
+    def batch() -> Tuple[int, float]:
+        start = time.perf_counter()
+        for cell in views:
+            board.check_win_combo(cell)
+        return len(views), time.perf_counter() - start
+
+    return measure(batch, min_time)
+
+
+OPERATIONS = {'board_init': bench_board_init, 'start_game': bench_start_game,
+              'single_turn': bench_single_turn, 'check_win_combo': bench_check_win_combo}
+
+
+def _interface():
+    """
+    Creates the game window for draw_new_board timing
+    :return: Interface, or None if arcade or a display is not available
+    """
+    try:
+        from interface_classes.interface import Interface
+        return Interface('Benchmark')
+    except Exception as error:  # ImportError without arcade, other errors without a display
+        logging.warning(' '.join(['Interface timing is skipped:', repr(error)]))
+        return None
+
+
+def bench_startup(code: str, min_time: float, strict: bool = False) -> Optional[float]:
+    """
+    Measures code, that runs at start, in new processes, so nothing is imported
+        or cached yet. Start of the interpreter itself isn't counted. The processes
+        run in the root of the repository, wherever the benchmark is started from
+    :param code: python statements
+    :param min_time: min seconds of one run
+    :param strict: raise ValueError if the code fails, instead of skipping the timing
+    :return: runs per second, or None if the code fails, e.g. without arcade or a display
+    """
+    script = '; '.join(['import time', 'start = time.perf_counter()', code,
+                        'print(time.perf_counter() - start)'])
+
+    def batch() -> Tuple[int, float]:
+        process = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, cwd=ROOT)
+        if process.returncode:
+            raise RuntimeError(process.stderr.strip().splitlines()[-1] if process.stderr.strip() else code)
+        return 1, float(process.stdout.split()[-1])
+
+    try:
+        return measure(batch, min_time)
+    except (RuntimeError, ValueError, IndexError) as error:
+        if strict:
+            logging.error(' '.join(['Startup timing of', repr(code), 'failed:', repr(error)]))
+            raise ValueError('Startup code must run in a new process')
+        logging.warning(' '.join(['Startup timing is skipped:', repr(error)]))
+        return None
+
+
+def bench_draw_new_board(interface, size: int, min_time: float) -> float:
+    """
+    Measures Interface.draw_new_board
+    :param interface: game window
+    :param size: size of the board
+    :param min_time: min seconds of one run
+    :return: boards drawn per second
+    """
+    interface.grid_size = size
+
+    def batch() -> Tuple[int, float]:
+        start = time.perf_counter()
+        interface.draw_new_board()
+        return 1, time.perf_counter() - start
+
+    return measure(batch, min_time)
+
+
+def run(sizes: Sequence[int] = SIZES, conditions: Sequence[int] = CONDITIONS,
+        backends: Optional[Sequence[str]] = None, operations: Optional[Sequence[str]] = None,
+        interface: bool = True, min_time: float = 0.2, startup: bool = True, strict: bool = False,
+        on_result: Optional[Callable[[Dict[str, object]], None]] = None) -> List[Dict[str, object]]:
+    """
+    Runs benchmarks of all operations for all boards. Conditions bigger than
+        the size are limited to the size, like Game.create_board does
+    :param sizes: sizes of boards
+    :param conditions: win conditions of boards
+    :param backends: keys of BOARD_BACKENDS, all by default
+    :param operations: keys of OPERATIONS, all by default
+    :param interface: also measure Interface.draw_new_board, if arcade can open a window
+    :param min_time: min seconds of one run of a benchmark
+    :param startup: also measure import of IMPORTS modules, and the first frame of the window,
+        if arcade can open it, in new processes
+    :param strict: raise ValueError if startup code fails, so no timing is missing
+        from a comparison with a baseline
+    :param on_result: called with every result
+    :return: list of results: {'name', 'operation', 'backend', 'size', 'condition',
+        'ops_per_sec', 'memory_bytes'}. Startup results have no size and condition
+    """
+    backends = list(BOARD_BACKENDS) if backends is None else backends
+    operations = list(OPERATIONS) if operations is None else operations
+    results = []
+
+    def add(operation: str, backend: str, size: Optional[int], condition: Optional[int], ops: float,
+            memory: Optional[int]) -> None:
+        if size is None:
+            name = '/'.join([operation, backend])
+        else:
+            name = '{}/{}/{}x{}:{}'.format(operation, backend, size, size, condition)
+        result = {'name': name, 'operation': operation, 'backend': backend, 'size': size, 'condition': condition,
+                  'ops_per_sec': ops, 'memory_bytes': memory}
+        results.append(result)
+        if on_result is not None:
+            on_result(result)
+
+    for size in sizes:
+        for condition in sorted({min(condition, size) for condition in conditions}):
+            for backend in backends:
+                memory = board_memory(BOARD_BACKENDS[backend], size, condition)
+                for operation in operations:
+                    ops = OPERATIONS[operation](backend, size, condition, min_time)
+                    add(operation, backend, size, condition, ops, memory if operation == 'board_init' else None)
+    if startup:
+        for module in IMPORTS:
+            ops = bench_startup('import ' + module, min_time, strict)
+            if ops is not None:
+                add('import', module, None, None, ops, None)
+        if interface:
+            ops = bench_startup(FIRST_FRAME, min_time, strict)
+            if ops is not None:
+                add('first_frame', 'arcade', None, None, ops, None)
+    window = _interface() if interface else None
+    if window is not None:
+        for size in sizes:
+            add('draw_new_board', 'arcade', size, size, bench_draw_new_board(window, size, min_time), None)
+        window.close()
+    return results
+
+
+def compare(results: Sequence[Dict[str, object]], baseline: Sequence[Dict[str, object]],
+            tolerance: float = 0.2) -> List[Dict[str, object]]:
+    """
+    Compares results with the baseline by names of benchmarks
+    :param results: results of run
+    :param baseline: results of an earlier run
+    :param tolerance: allowed relative slowdown, or memory growth, before it's a regression
+    :return: list of {'name', 'ops_per_sec', 'baseline_ops_per_sec', 'ratio', 'regression'} for
+        benchmarks, that are in both lists. Ratio above 1 is a speedup
+    """
+    earlier = {result['name']: result for result in baseline}
+    changes = []
+    for result in results:
+        base = earlier.get(result['name'])
+        if base is None or not base['ops_per_sec']:
+            continue
+        ratio = result['ops_per_sec'] / base['ops_per_sec']
+        regression = ratio < 1 - tolerance
+        if result['memory_bytes'] is not None and base.get('memory_bytes'):
+            regression = regression or result['memory_bytes'] > base['memory_bytes'] * (1 + tolerance)
+        changes.append({'name': result['name'], 'ops_per_sec': result['ops_per_sec'],
+                        'baseline_ops_per_sec': base['ops_per_sec'], 'ratio': ratio,
+                        'memory_bytes': result['memory_bytes'], 'baseline_memory_bytes': base.get('memory_bytes'),
+                        'regression': regression})
+    return changes
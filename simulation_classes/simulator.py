@@ -0,0 +1,263 @@
+import inspect
+import logging
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, Optional, Tuple
+
+from ai_classes.computer_player import ComputerPlayer
+from ai_classes.database_player import DatabasePlayer
+from ai_classes.gomoku_player import GomokuPlayer
+from ai_classes.mcts_player import MCTSPlayer
+from ai_classes.minimax_player import MinimaxPlayer
+from ai_classes.random_player import RandomPlayer
+from game_classes.game import Game
+from game_classes.record import RecordWriter
+
+PLAYER_TYPES = {'random': RandomPlayer, 'minimax': MinimaxPlayer, 'database': DatabasePlayer,
+                'gomoku': GomokuPlayer, 'mcts': MCTSPlayer}
+
+
+def parse_player(spec: str) -> Tuple[str, Dict[str, object]]:
+    """
+    Parses a player description like 'mcts:playouts=200,radius=1'. Values are
+        converted to int, float or None, if they look like one
+    :param spec: key of PLAYER_TYPES, optionally followed by ':' and key=value pairs
+    :return: (player type, keyword arguments)
+    """
+    kind, _, params = spec.partition(':')
+    if kind not in PLAYER_TYPES:
+        raise ValueError('Player type must be one of ' + ', '.join(PLAYER_TYPES))
+    kwargs = dict()
+    for pair in filter(None, params.split(',')):
+        key, _, value = pair.partition('=')
+        kwargs[key] = _parse_value(value)
+    return kind, kwargs
+
+
+def _parse_value(value: str) -> object:
+    """
+    Converts a value of a player description
+    :param value: text of the value
+    :return: int, float, None or the text itself
+    """
+    if value == 'None':
+        return None
+    for kind in (int, float):
+        try:
+            return kind(value)
+        except ValueError:
+            pass
+    return value
+
+
+def make_player(spec: str, name: str, seed: Optional[int] = None) -> ComputerPlayer:
+    """
+    Creates a player by its description. Players with random choices get the seed,
+        if the description doesn't set one
+    :param spec: player description for parse_player
+    :param name: name for the player
+    :param seed: seed for random choices of the player
+    :return: new player
+    """
+    kind, kwargs = parse_player(spec)
+    player_class = PLAYER_TYPES[kind]
+    if seed is not None and 'seed' not in kwargs and 'seed' in inspect.signature(player_class).parameters:
+        kwargs['seed'] = seed
+    return player_class(name, **kwargs)
+
+
+class SimulationStats:
+    """
+    Aggregate results of batch games between two players. Stats of separate
+        batches are merged, so workers send only these small objects back
+
+    :prop games: number of finished games
+    :prop wins: numbers of wins of the first and the second player of the batch
+    :prop draws: number of drawn games
+    :prop first_wins: number of games, won by the player, who made the first move
+    :prop starts: numbers of games, started by the first and the second player of the batch
+    :prop lengths: {number of moves: number of games}
+    :prop seconds: time of the games: of the process for a batch, of the whole run for simulate
+
+    :method add_game: counts result of one game
+    :method merge: adds results of other stats
+    :method summary: returns rates and means of the results
+    """
+
+    def __init__(self) -> None:
+        self.games = 0
+        self.wins = [0, 0]
+        self.draws = 0
+        self.first_wins = 0
+        self.starts = [0, 0]
+        self.lengths: Dict[int, int] = dict()
+        self.seconds = 0.0
+
+    def add_game(self, first_player: int, winner: Optional[int], length: int) -> None:
+        """
+        Counts result of one game
+        :param first_player: index of the player, who made the first move
+        :param winner: index of the winner, None for drawn game
+        :param length: number of moves in the game
+        :return: None
+        """
+        self.games += 1
+        self.starts[first_player] += 1
+        if winner is None:
+            self.draws += 1
+        else:
+            self.wins[winner] += 1
+            if winner == first_player:
+                self.first_wins += 1
+        self.lengths[length] = self.lengths.get(length, 0) + 1
+
+    def merge(self, other: 'SimulationStats') -> None:
+        """
+        Adds results of other stats to these ones
+        :param other: stats of another batch
+        :return: None
+        """
+        self.games += other.games
+        self.draws += other.draws
+        self.first_wins += other.first_wins
+        self.seconds += other.seconds
+        for index in range(2):
+            self.wins[index] += other.wins[index]
+            self.starts[index] += other.starts[index]
+        for length, count in other.lengths.items():
+            self.lengths[length] = self.lengths.get(length, 0) + count
+
+    def summary(self) -> Dict[str, object]:
+        """
+        Returns rates and means of the results. First move advantage is the score
+            of the player, who moved first (a draw is a half of a win), with its
+            95% confidence interval
+        :return: dictionary, that can be saved as JSON
+        """
+        games = max(self.games, 1)
+        first_score = (self.first_wins + self.draws / 2) / games
+        margin = 1.96 * math.sqrt(first_score * (1 - first_score) / games)
+        return {'games': self.games,
+                'wins': list(self.wins),
+                'draws': self.draws,
+                'win_rates': [wins / games for wins in self.wins],
+                'draw_rate': self.draws / games,
+                'starts': list(self.starts),
+                'first_wins': self.first_wins,
+                'first_move_score': first_score,
+                'first_move_score_interval': [max(0.0, first_score - margin), min(1.0, first_score + margin)],
+                'mean_length': sum(length * count for length, count in self.lengths.items()) / games,
+                'lengths': {str(length): self.lengths[length] for length in sorted(self.lengths)},
+                'games_per_second': self.games / self.seconds if self.seconds > 0 else 0.0}
+
+
+def play_game(game: Game, size: int, condition: int, backend: str = 'bitboard',
+              first_player: Optional[int] = None) -> Tuple[int, Optional[int], int]:
+    """
+    Plays one game between computer players of the game. If a player chooses a move,
+        that can't be made, raises ValueError
+    :param game: game with two computer players
+    :param size: size of the board
+    :param condition: win condition of the board
+    :param backend: key of BOARD_BACKENDS for the board
+    :param first_player: index of the player, who moves first, random if None
+    :return: (index of the first player, index of the winner or None for a draw, number of moves)
+    """
+    first_player = game.start_game(size, condition, backend, first_player)
+    players = game.players
+    while game.state == 0:
+        player = players[game.curr_turn]
+        cell_name = player.choose_move(game)
+        if not game.make_move(cell_name):
+            logging.error(' '.join([player.name, 'chose illegal move', str(cell_name)]))
+            raise ValueError('Computer player must choose an empty cell of the board')
+    winner = None
+    if game.winner != '-':
+        winner = 0 if players[0].mark == game.winner else 1
+    return first_player, winner, len(game.moves)
+
+
+def play_batch(player_specs: Tuple[str, str], size: int, condition: int, games: int, seed: int,
+               backend: str = 'bitboard', recording: bool = False) -> Tuple[SimulationStats, bytes]:
+    """
+    Plays a batch of games in one process. Players and the game are created once
+        for the batch, every game only gets a new board
+    :param player_specs: descriptions of two players for make_player
+    :param size: size of the board
+    :param condition: win condition of the board
+    :param games: number of games
+    :param seed: seed for the first player choice and random choices of players
+    :param backend: key of BOARD_BACKENDS for the boards
+    :param recording: encode records of the games
+    :return: stats of the batch and encoded records of its games
+    """
+    start = time.perf_counter()
+    random.seed(seed)
+    players = [make_player(spec, 'Player ' + str(index + 1), seed * 2 + index)
+               for index, spec in enumerate(player_specs)]
+    game = Game(players, recording)
+    stats = SimulationStats()
+    records = bytearray()
+    for _ in range(games):
+        stats.add_game(*play_game(game, size, condition, backend))
+        if recording:
+            records += game.record.encode()
+    stats.seconds = time.perf_counter() - start
+    return stats, bytes(records)
+
+
+def simulate(player_specs: Tuple[str, str], size: int, condition: int, games: int,
+             workers: Optional[int] = None, batch_size: int = 500, seed: int = 0, backend: str = 'bitboard',
+             on_batch: Optional[Callable[[SimulationStats], None]] = None,
+             records: Optional[str] = None) -> SimulationStats:
+    """
+    Plays games in batches over a process pool and merges batch stats as they come.
+        Records of the games are written in order of finished batches
+    :param player_specs: descriptions of two players for make_player
+    :param size: size of the board
+    :param condition: win condition of the board
+    :param games: number of games
+    :param workers: number of processes, all CPUs by default, 1 plays in this process
+    :param batch_size: number of games in one task of a worker
+    :param seed: base seed, batch i gets seed + i
+    :param backend: key of BOARD_BACKENDS for the boards
+    :param on_batch: called with the total stats after every finished batch
+    :param records: path of a new file for records of the games, None not to record them
+    :return: stats of all games
+    """
+    for spec in player_specs:
+        parse_player(spec)
+    workers = workers or os.cpu_count() or 1
+    sizes = [min(batch_size, games - done) for done in range(0, games, batch_size)]
+    total = SimulationStats()
+    writer = None if records is None else RecordWriter(records)
+    recording = writer is not None
+    start = time.perf_counter()
+
+    def collect(stats: SimulationStats, data: bytes) -> None:
+        total.merge(stats)
+        if writer is not None:
+            writer.write_bytes(data, stats.games)
+        if on_batch is not None:
+            on_batch(total)
+
+    try:
+        if workers == 1:
+            for index, count in enumerate(sizes):
+                collect(*play_batch(player_specs, size, condition, count, seed + index, backend, recording))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(play_batch, player_specs, size, condition, count, seed + index,
+                                           backend, recording)
+                           for index, count in enumerate(sizes)]
+                for future in as_completed(futures):
+                    collect(*future.result())
+    finally:
+        if writer is not None:
+            writer.close()
+    # games per second of the whole run, not of the summed worker time
+    total.seconds = time.perf_counter() - start
+    return total
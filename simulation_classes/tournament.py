@@ -0,0 +1,373 @@
+import logging
+import math
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import config
+from game_classes.game import Game
+from simulation_classes.simulator import make_player, parse_player, play_game
+
+BOARDS = {'small': (config.small_game_size, 3), 'big': (config.big_game_size, 5)}
+MODES = ('round-robin', 'gauntlet')
+ACCEPTED, REJECTED = 'H1', 'H0'  # SPRT results: the stronger or the weaker hypothesis is accepted
+SCORE_EPSILON = 1e-6
+
+
+def parse_board(text: str) -> Tuple[int, int]:
+    """
+    Parses a board description: 'small', 'big', or a custom board like '15:5' or '15x15:5'
+    :param text: board description
+    :return: (size, condition)
+    """
+    if text in BOARDS:
+        return BOARDS[text]
+    size, _, condition = text.partition(':')
+    try:
+        return int(size.split('x')[0]), int(condition)
+    except ValueError:
+        logging.error(' '.join(['Attempt to play on board', text]))
+        raise ValueError("Board must be 'small', 'big' or 'size:condition'")
+
+
+def expected_score(elo: float) -> float:
+    """
+    Returns the expected score of a player, who is elo points stronger
+    :param elo: difference of ratings
+    :return: score from 0 to 1
+    """
+    return 1 / (1 + 10 ** (-elo / 400))
+
+
+def score_to_elo(score: float) -> float:
+    """
+    Returns the difference of ratings, that gives the expected score
+    :param score: score from 0 to 1, it's clamped away from 0 and 1
+    :return: difference of ratings
+    """
+    score = min(max(score, SCORE_EPSILON), 1 - SCORE_EPSILON)
+    return -400 * math.log10(1 / score - 1)
+
+
+class MatchStats:
+    """
+    Results of games between two players on one board, seen by the first player.
+        Stats of separate batches are merged, so workers send only these small objects back
+        :param first: description of the first player
+        :param second: description of the second player
+        :param board: (size, condition) of the board
+
+    :prop wins: number of wins of the first player
+    :prop draws: number of drawn games
+    :prop losses: number of wins of the second player
+    :prop sprt: SPRT result, ACCEPTED, REJECTED or None while the match isn't stopped by SPRT
+    :prop seconds: time of the games in the worker processes
+
+    :method add_game: counts result of one game
+    :method merge: adds results of other stats
+    :method score: returns the score of the first player
+    :method elo: returns Elo difference of the players and its confidence interval
+    :method llr: returns log-likelihood ratio of SPRT hypotheses
+    :method summary: returns results of the match
+    """
+
+    def __init__(self, first: str, second: str, board: Tuple[int, int]) -> None:
+        self.first = first
+        self.second = second
+        self.board = board
+        self.wins = 0
+        self.draws = 0
+        self.losses = 0
+        self.sprt: Optional[str] = None
+        self.seconds = 0.0
+
+    @property
+    def games(self) -> int:
+        """
+        Getter for games property
+        :return: number of played games
+        """
+        return self.wins + self.draws + self.losses
+
+    def add_game(self, winner: Optional[int]) -> None:
+        """
+        Counts result of one game
+        :param winner: 0 if the first player won, 1 if the second one, None for drawn game
+        :return: None
+        """
+        if winner is None:
+            self.draws += 1
+        elif winner == 0:
+            self.wins += 1
+        else:
+            self.losses += 1
+
+    def merge(self, other: 'MatchStats') -> None:
+        """
+        Adds results of other stats to these ones
+        :param other: stats of another batch of the match
+        :return: None
+        """
+        self.wins += other.wins
+        self.draws += other.draws
+        self.losses += other.losses
+        self.seconds += other.seconds
+
+    def score(self) -> float:
+        """
+        Returns the score of the first player: a win is 1, a draw is a half
+        :return: score from 0 to 1, 0.5 before the first game
+        """
+        if self.games == 0:
+            return 0.5
+        return (self.wins + self.draws / 2) / self.games
+
+    def _variance(self, virtual_draws: int = 0) -> float:
+        """
+        Returns the variance of the result of one game
+        :param virtual_draws: number of added draws, each counted as a half of a win and
+            a half of a loss, like the virtual draws of standings
+        :return: variance of the score
+        """
+        score = self.score()
+        games = max(self.games + virtual_draws, 1)
+        return (self.wins * (1 - score) ** 2 + self.draws * (0.5 - score) ** 2 + self.losses * score ** 2
+                + virtual_draws * ((1 - score) ** 2 + score ** 2) / 2) / games
+
+    def elo(self, confidence: float = 1.96) -> Tuple[float, float, float]:
+        """
+        Returns Elo difference of the players with the normal approximation
+            of the confidence interval of the score. If all games have the same result,
+            the variance is taken with one virtual draw, so the interval isn't empty
+        :param confidence: number of standard errors, 1.96 for 95%
+        :return: (difference, lower bound, upper bound) for the first player
+        """
+        score = self.score()
+        variance = self._variance() or self._variance(1)
+        margin = confidence * math.sqrt(variance / max(self.games, 1))
+        return score_to_elo(score), score_to_elo(score - margin), score_to_elo(score + margin)
+
+    def llr(self, elo0: float, elo1: float) -> float:
+        """
+        Returns log-likelihood ratio of hypotheses 'difference is elo1' and 'difference
+            is elo0' with the normal approximation of the score, like fishtest does
+        :param elo0: Elo difference of the weaker hypothesis
+        :param elo1: Elo difference of the stronger hypothesis
+        :return: log-likelihood ratio, 0 while all games have the same result
+        """
+        variance = self._variance()
+        if variance == 0:
+            return 0.0
+        score0, score1 = expected_score(elo0), expected_score(elo1)
+        return self.games * (score1 - score0) * (2 * self.score() - score0 - score1) / (2 * variance)
+
+    def summary(self) -> Dict[str, object]:
+        """
+        Returns results of the match
+        :return: dictionary, that can be saved as JSON
+        """
+        elo, lower, upper = self.elo()
+        return {'first': self.first, 'second': self.second, 'size': self.board[0], 'condition': self.board[1],
+                'games': self.games, 'wins': self.wins, 'draws': self.draws, 'losses': self.losses,
+                'score': self.score(), 'elo': elo, 'elo_interval': [lower, upper], 'sprt': self.sprt}
+
+
+class SPRT:
+    """
+    Sequential probability ratio test of Elo difference of two players. The match
+        stops, when log-likelihood ratio leaves the bounds given by error rates
+        :param elo0: Elo difference of the weaker hypothesis
+        :param elo1: Elo difference of the stronger hypothesis
+        :param alpha: rate of accepting elo1, when elo0 is true
+        :param beta: rate of accepting elo0, when elo1 is true
+
+    :prop lower: bound of accepting elo0
+    :prop upper: bound of accepting elo1
+
+    :method status: returns the result of the test for the match
+    """
+
+    def __init__(self, elo0: float = 0.0, elo1: float = 10.0, alpha: float = 0.05, beta: float = 0.05) -> None:
+        if elo0 >= elo1 or not 0 < alpha < 1 or not 0 < beta < 1:
+            logging.error(' '.join(['Attempt to create SPRT with elo0', str(elo0), 'elo1', str(elo1),
+                                    'alpha', str(alpha), 'beta', str(beta)]))
+            raise ValueError('SPRT needs elo0 < elo1 and error rates between 0 and 1')
+        self.elo0 = elo0
+        self.elo1 = elo1
+        self.lower = math.log(beta / (1 - alpha))
+        self.upper = math.log((1 - beta) / alpha)
+
+    def status(self, stats: MatchStats) -> Optional[str]:
+        """
+        Returns the result of the test for the match
+        :param stats: results of the match
+        :return: ACCEPTED, REJECTED, or None if the match must go on
+        """
+        llr = stats.llr(self.elo0, self.elo1)
+        if llr >= self.upper:
+            return ACCEPTED
+        if llr <= self.lower:
+            return REJECTED
+        return None
+
+
+def play_pairs(first: str, second: str, board: Tuple[int, int], pairs: int, seed: int,
+               backend: str = 'bitboard') -> MatchStats:
+    """
+    Plays pairs of games in one process: in every pair each player starts once
+    :param first: description of the first player for make_player
+    :param second: description of the second player
+    :param board: (size, condition) of the board
+    :param pairs: number of pairs of games
+    :param seed: seed for random choices of players
+    :param backend: key of BOARD_BACKENDS for the boards
+    :return: stats of the games
+    """
+    start = time.perf_counter()
+    players = [make_player(first, 'Player 1', seed * 2), make_player(second, 'Player 2', seed * 2 + 1)]
+    game = Game(players)
+    stats = MatchStats(first, second, board)
+    for _ in range(pairs):
+        for first_player in range(2):
+            stats.add_game(play_game(game, board[0], board[1], backend, first_player)[1])
+    stats.seconds = time.perf_counter() - start
+    return stats
+
+
+def schedule(player_specs: Sequence[str], boards: Sequence[Tuple[int, int]],
+             mode: str = 'round-robin') -> List[Tuple[int, int, Tuple[int, int]]]:
+    """
+    Returns matches of the tournament
+    :param player_specs: descriptions of players
+    :param boards: (size, condition) of boards
+    :param mode: 'round-robin' for all pairs of players, 'gauntlet' for the first
+        player against each other one
+    :return: list of (index of the first player, index of the second player, board)
+    """
+    if mode not in MODES:
+        logging.error(' '.join(['Attempt to schedule tournament in', str(mode), 'mode']))
+        raise ValueError('Tournament mode must be one of ' + ', '.join(MODES))
+    if len(player_specs) < 2:
+        logging.error(' '.join(['Attempt to schedule tournament for', str(len(player_specs)), 'players']))
+        raise ValueError('Tournament needs at least 2 players')
+    if len(set(player_specs)) < len(player_specs):
+        logging.error(' '.join(['Attempt to schedule tournament for players', ', '.join(player_specs)]))
+        raise ValueError('Descriptions of players must be different')
+    count = len(player_specs)
+    pairs = [(0, second) for second in range(1, count)] if mode == 'gauntlet' else \
+        [(first, second) for first in range(count) for second in range(first + 1, count)]
+    return [(first, second, board) for board in boards for first, second in pairs]
+
+
+def tournament(player_specs: Sequence[str], boards: Sequence[Tuple[int, int]], mode: str = 'round-robin',
+               games: int = 200, workers: Optional[int] = None, batch_pairs: int = 10, seed: int = 0,
+               backend: str = 'bitboard', sprt: Optional[SPRT] = None,
+               on_batch: Optional[Callable[[List[MatchStats]], None]] = None) -> List[MatchStats]:
+    """
+    Plays all matches of the tournament over a process pool. Batches of all matches
+        are interleaved, so every match goes on at the same time and at most two
+        batches per worker are in flight. A match stops after the number of games,
+        or earlier, when SPRT accepts one of its hypotheses
+    :param player_specs: descriptions of players for make_player
+    :param boards: (size, condition) of boards
+    :param mode: one of MODES, see schedule
+    :param games: max number of games of a match, rounded up to pairs of games
+    :param workers: number of processes, all CPUs by default, 1 plays in this process
+    :param batch_pairs: number of pairs of games in one task of a worker
+    :param seed: base seed, every batch of the tournament gets its own seed
+    :param backend: key of BOARD_BACKENDS for the boards
+    :param sprt: test for early stopping of matches, None to play all games
+    :param on_batch: called with stats of all matches after every finished batch
+    :return: stats of matches in order of schedule
+    """
+    for spec in player_specs:
+        parse_player(spec)
+    matches = schedule(player_specs, boards, mode)
+    results = [MatchStats(player_specs[first], player_specs[second], board) for first, second, board in matches]
+    sizes = [min(batch_pairs, (games + 1) // 2 - done) for done in range(0, (games + 1) // 2, batch_pairs)]
+    # batches of all matches in turn: first batches of every match, then second ones...
+    tasks = [(match, batch) for batch in range(len(sizes)) for match in range(len(matches))]
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+
+    def collect(match: int, stats: MatchStats) -> None:
+        results[match].merge(stats)
+        if sprt is not None and results[match].sprt is None:
+            results[match].sprt = sprt.status(results[match])
+        if on_batch is not None:
+            on_batch(results)
+
+    def arguments(match: int, batch: int) -> tuple:
+        first, second, board = matches[match]
+        return (player_specs[first], player_specs[second], board, sizes[batch],
+                seed + batch * len(matches) + match, backend)
+
+    if workers == 1:
+        for match, batch in tasks:
+            if results[match].sprt is None:
+                collect(match, play_pairs(*arguments(match, batch)))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = dict()
+            for match, batch in tasks:
+                while len(pending) >= 2 * workers:
+                    finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        collect(pending.pop(future), future.result())
+                if results[match].sprt is None:
+                    pending[executor.submit(play_pairs, *arguments(match, batch))] = match
+            for future in wait(pending)[0]:
+                collect(pending[future], future.result())
+    logging.info(' '.join(['Tournament of', str(len(matches)), 'matches took',
+                           str(round(time.perf_counter() - start, 1)), 'seconds']))
+    return results
+
+
+def standings(results: Sequence[MatchStats]) -> List[Dict[str, object]]:
+    """
+    Returns ratings of players on every board. Ratings are fitted to all results
+        with the Bradley-Terry model by minorization-maximization, a draw is a half
+        of a win, and every pair of players gets one virtual draw, so a player
+        without wins keeps a finite rating. The interval of a rating is given by
+        the confidence interval of the player's score against his opponents
+    :param results: stats of matches
+    :return: list of dictionaries with player, board, games, score, rating and
+        rating_interval, the best player of every board first
+    """
+    table = []
+    for board in sorted({stats.board for stats in results}):
+        matches = [stats for stats in results if stats.board == board]
+        players = sorted({stats.first for stats in matches} | {stats.second for stats in matches})
+        games: Dict[Tuple[str, str], int] = dict()
+        points = {player: 0.0 for player in players}
+        outcomes = {player: [0, 0, 0] for player in players}  # wins, draws, losses
+        for stats in matches:
+            for player, opponent, wins, losses in ((stats.first, stats.second, stats.wins, stats.losses),
+                                                   (stats.second, stats.first, stats.losses, stats.wins)):
+                games[player, opponent] = games.get((player, opponent), 0) + stats.games + 1
+                points[player] += wins + stats.draws / 2 + 0.5
+                outcomes[player][0] += wins
+                outcomes[player][1] += stats.draws
+                outcomes[player][2] += losses
+        strengths = {player: 1.0 for player in players}
+        for _ in range(1000):
+            updated = {player: points[player] / sum(count / (strengths[player] + strengths[opponent])
+                                                    for (one, opponent), count in games.items() if one == player)
+                       for player in players}
+            mean = math.exp(sum(math.log(value) for value in updated.values()) / len(players))
+            updated = {player: value / mean for player, value in updated.items()}
+            change = max(abs(updated[player] - strengths[player]) for player in players)
+            strengths = updated
+            if change < 1e-9:
+                break
+        for player in players:
+            rating = 400 * math.log10(strengths[player])
+            player_stats = MatchStats(player, '', board)
+            player_stats.wins, player_stats.draws, player_stats.losses = outcomes[player]
+            elo, lower, upper = player_stats.elo()
+            table.append({'player': player, 'size': board[0], 'condition': board[1],
+                          'games': player_stats.games, 'score': player_stats.score(), 'rating': rating,
+                          'rating_interval': [rating + lower - elo, rating + upper - elo]})
+    table.sort(key=lambda row: (row['size'], row['condition'], -row['rating']))
+    return table
@@ -0,0 +1,31 @@
+import argparse
+import logging
+import os
+
+from ai_classes.retrograde_solver import write_database
+from ai_classes.solved_database import database_path
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parses command line arguments of the solver
+    :return: namespace with arguments
+    """
+    parser = argparse.ArgumentParser(description='Solves a small board and writes the solved position database')
+    parser.add_argument('size', type=int, help='size of the board, 4 is the biggest practical one')
+    parser.add_argument('condition', type=int, help='win condition of the board')
+    parser.add_argument('-d', '--directory', default='solved', help='folder for the database')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+
+    logging.basicConfig(
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s - %(funcName)s',
+        level=logging.INFO
+    )
+
+    args = parse_args()
+    os.makedirs(args.directory, exist_ok=True)
+    condition = min(args.condition, args.size)
+    write_database(database_path(args.size, condition, args.directory), args.size, condition)
@@ -0,0 +1,131 @@
+import random
+from functools import lru_cache
+from typing import Tuple
+
+import pytest
+
+from ai_classes.minimax_player import MinimaxPlayer
+from game_classes.board import Board
+from game_classes.game import Game
+from game_classes.player import Player
+
+
+def brute_force(size: int, condition: int):
+    """
+    Returns function, that gives exact value of a position by full search without pruning
+    :param size: size of the board
+    :param condition: win condition of the board
+    :return: value(marks, mark, other), marks is a tuple of size ** 2 marks, ' ' for empty
+    """
+    names = [(index_1, index_2) for index_1 in range(size) for index_2 in range(size)]
+
+    @lru_cache(maxsize=None)
+    def value(marks: Tuple[str, ...], mark: str, other: str) -> int:
+        board = Board(size, condition)
+        for name, cell_mark in zip(names, marks):
+            if cell_mark != ' ':
+                board.put_mark(name, cell_mark)
+        best = None
+        for index, name in enumerate(names):
+            if marks[index] != ' ':
+                continue
+            board.put_mark(name, mark)
+            game_over, winner = board.check_win_combo(board.cells[name])
+            if not game_over:
+                child = -value(marks[:index] + (mark,) + marks[index + 1:], other, mark)
+            elif winner == '-':
+                child = 0
+            else:
+                child = size ** 2 - board.filled_cells + 1
+            board.remove_mark(name)
+            best = child if best is None else max(best, child)
+        return best
+
+    return value, names
+
+
+def positions(size: int, condition: int, max_marks: int):
+    """
+    Yields unfinished positions with x to move, reached by legal games of up to max_marks moves
+    :return: generator of marks tuples
+    """
+    names = [(index_1, index_2) for index_1 in range(size) for index_2 in range(size)]
+    seen = set()
+    stack = [(' ',) * size ** 2]
+    while stack:
+        marks = stack.pop()
+        if marks in seen:
+            continue
+        seen.add(marks)
+        filled = size ** 2 - marks.count(' ')
+        if filled % 2 == 0:
+            yield marks
+        if filled >= max_marks:
+            continue
+        mark = 'xo'[filled % 2]
+        for index, name in enumerate(names):
+            if marks[index] != ' ':
+                continue
+            board = Board(size, condition)
+            for other_name, other_mark in zip(names, marks):
+                if other_mark != ' ':
+                    board.put_mark(other_name, other_mark)
+            board.put_mark(name, mark)
+            if not board.check_win_combo(board.cells[name])[0]:
+                stack.append(marks[:index] + (mark,) + marks[index + 1:])
+
+
+def random_positions(size: int, condition: int, count: int, min_marks: int, seed: int = 0):
+    """
+    Yields unfinished positions with x to move and at least min_marks marks, reached by random legal games
+    :return: generator of marks tuples
+    """
+    rng = random.Random(seed)
+    names = [(index_1, index_2) for index_1 in range(size) for index_2 in range(size)]
+    found = set()
+    while len(found) < count:
+        board = Board(size, condition)
+        marks = [' '] * size ** 2
+        order = list(range(size ** 2))
+        rng.shuffle(order)
+        for move, index in enumerate(order[:size ** 2 - 2]):
+            board.put_mark(names[index], 'xo'[move % 2])
+            marks[index] = 'xo'[move % 2]
+            if board.check_win_combo(board.cells[names[index]])[0]:
+                break
+            if move + 1 >= min_marks and move % 2 == 1 and tuple(marks) not in found:
+                found.add(tuple(marks))
+                yield tuple(marks)
+                break
+
+
+@pytest.mark.parametrize('size, condition, generator', [
+    (3, 3, lambda: positions(3, 3, 8)),
+    (4, 3, lambda: random_positions(4, 3, 60, 8)),
+])
+def test_choose_move_is_optimal(size, condition, generator):
+    value, names = brute_force(size, condition)
+    checked = 0
+    for marks in generator():
+        MinimaxPlayer._tables.clear()  # warm tables from other positions hide wrong bounds
+        game = Game([MinimaxPlayer('x'), Player('o')])
+        game.start_game(size, condition, first_player=0)
+        for name, mark in zip(names, marks):
+            if mark != ' ':
+                game.board.put_mark(name, mark)
+        move = game.players[0].choose_move(game)
+        index = names.index(move)
+        assert marks[index] == ' '
+        chosen = marks[:index] + ('x',) + marks[index + 1:]
+        board = Board(size, condition)
+        for name, mark in zip(names, chosen):
+            if mark != ' ':
+                board.put_mark(name, mark)
+        game_over, winner = board.check_win_combo(board.cells[move])
+        if not game_over:
+            move_value = -value(chosen, 'o', 'x')
+        else:
+            move_value = 0 if winner == '-' else size ** 2 - board.filled_cells + 1
+        assert move_value == value(marks, 'x', 'o'), marks
+        checked += 1
+    assert checked
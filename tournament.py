@@ -0,0 +1,76 @@
+import argparse
+import json
+import logging
+import sys
+from typing import List
+
+from game_classes.game import BOARD_BACKENDS
+from simulation_classes.simulator import PLAYER_TYPES
+from simulation_classes.tournament import MODES, SPRT, MatchStats, parse_board, standings, tournament
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parses command line arguments of the tournament
+    :return: namespace with arguments
+    """
+    parser = argparse.ArgumentParser(description='Plays a tournament between computer players and estimates Elo')
+    parser.add_argument('players', nargs='+', help='players: ' + ', '.join(PLAYER_TYPES) +
+                        ", optionally with parameters like 'mcts:playouts=200,radius=1'")
+    parser.add_argument('-m', '--mode', choices=MODES, default='round-robin',
+                        help='all pairs of players, or the first player against each other one')
+    parser.add_argument('-B', '--boards', nargs='+', default=['small'],
+                        help="boards: 'small', 'big' or 'size:condition'")
+    parser.add_argument('-n', '--games', type=int, default=200, help='max number of games of a match')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='number of processes, all CPUs by default')
+    parser.add_argument('-b', '--batch-pairs', type=int, default=10,
+                        help='number of pairs of games in one task of a worker')
+    parser.add_argument('--seed', type=int, default=0, help='base seed of the games')
+    parser.add_argument('--backend', choices=list(BOARD_BACKENDS), default='bitboard', help='board backend')
+    parser.add_argument('--sprt', nargs=2, type=float, metavar=('ELO0', 'ELO1'),
+                        help='stop a match early, when SPRT accepts Elo difference ELO0 or ELO1')
+    parser.add_argument('--alpha', type=float, default=0.05, help='false positive rate of SPRT')
+    parser.add_argument('--beta', type=float, default=0.05, help='false negative rate of SPRT')
+    parser.add_argument('--json', help='file to save matches and standings as JSON')
+    parser.add_argument('-q', '--quiet', action='store_true', help="don't print progress")
+    return parser.parse_args()
+
+
+def print_progress(results: List[MatchStats]) -> None:
+    """
+    Prints the number of games and stopped matches so far in one line
+    :param results: stats of matches
+    :return: None
+    """
+    sys.stderr.write('\r{} games, {} of {} matches stopped by SPRT'.format(
+        sum(stats.games for stats in results), sum(stats.sprt is not None for stats in results), len(results)))
+    sys.stderr.flush()
+
+
+if __name__ == '__main__':
+
+    logging.basicConfig(
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s - %(funcName)s',
+        level=logging.WARNING
+    )
+
+    args = parse_args()
+    sprt = None if args.sprt is None else SPRT(args.sprt[0], args.sprt[1], args.alpha, args.beta)
+    results = tournament(args.players, [parse_board(board) for board in args.boards], args.mode, args.games,
+                         args.workers, args.batch_pairs, args.seed, args.backend, sprt,
+                         None if args.quiet else print_progress)
+    if not args.quiet:
+        sys.stderr.write('\n')
+    for stats in results:
+        elo, lower, upper = stats.elo()
+        print('{}x{}:{}  {} vs {}: +{} ={} -{}  Elo {:+.1f} [{:+.1f}, {:+.1f}]{}'.format(
+            stats.board[0], stats.board[0], stats.board[1], stats.first, stats.second, stats.wins, stats.draws,
+            stats.losses, elo, lower, upper, '' if stats.sprt is None else '  SPRT ' + stats.sprt))
+    table = standings(results)
+    for row in table:
+        print('{}x{}:{}  {:<30} {:>6} games  rating {:+.1f} [{:+.1f}, {:+.1f}]'.format(
+            row['size'], row['size'], row['condition'], row['player'], row['games'], row['rating'],
+            *row['rating_interval']))
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump({'matches': [stats.summary() for stats in results], 'standings': table}, file, indent=2)